@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from actuator import Actuator, FakeBackend
+
+
+# Simulates a fast slider drag against a slow DDC/CI-like device
+EVENTS = 200
+EVENT_INTERVAL = 0.005
+DEVICE_LATENCY = 0.03
+
+
+def drag(set_value):
+    blocked = 0.0
+    for i in range(EVENTS):
+        value = i * 100 // EVENTS
+        start = time.perf_counter()
+        set_value(value)
+        blocked += time.perf_counter() - start
+        time.sleep(EVENT_INTERVAL)
+    return blocked
+
+
+def bench_direct():
+    backend = FakeBackend(latency=DEVICE_LATENCY)
+    blocked = drag(backend.write)
+    return {"ui_blocked_s": blocked, "device_writes": len(backend.writes), "final": backend.value}
+
+
+def bench_actuator(max_rate):
+    backend = FakeBackend(latency=DEVICE_LATENCY)
+    actuator = Actuator(backend, max_rate=max_rate)
+    blocked = drag(actuator.request)
+    actuator.flush(5)
+    actuator.close()
+    result = {"ui_blocked_s": blocked, "device_writes": len(backend.writes), "final": backend.value}
+    result.update(actuator.stats())
+    return result
+
+
+def bench():
+    report = {"direct": bench_direct()}
+    for rate in (10, 20, 60):
+        report[f"actuator_{rate}hz"] = bench_actuator(rate)
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from actuator import Actuator, VolumeBackend
+from audio_session import AudioSession, FakeAudioBackend
+
+
+# One sweep of the volume slider from 0 to 100, one event per step
+STEPS = 100
+ACTIVATE_LATENCY = 0.002
+CALL_LATENCY = 0.0005
+
+
+def counters(backend, elapsed):
+    return {
+        "device_lookups": backend.device_lookups,
+        "activations": backend.activations,
+        "endpoint_calls": backend.calls,
+        "elapsed_s": round(elapsed, 4),
+    }
+
+
+def bench_per_event():
+    # What sample_1.set_volume used to do on every slider event
+    backend = FakeAudioBackend(latency=CALL_LATENCY, activate_latency=ACTIVATE_LATENCY)
+    start = time.perf_counter()
+    backend.activate().GetMasterVolumeLevelScalar()
+    for step in range(STEPS + 1):
+        backend.activate().SetMasterVolumeLevelScalar(step / STEPS, None)
+    return counters(backend, time.perf_counter() - start)
+
+
+def bench_session():
+    backend = FakeAudioBackend(latency=CALL_LATENCY, activate_latency=ACTIVATE_LATENCY)
+    session = AudioSession(backend)
+    start = time.perf_counter()
+    session.get_level()
+    session.get_level()
+    for step in range(STEPS + 1):
+        session.set_level(step / STEPS)
+    result = counters(backend, time.perf_counter() - start)
+    result.update(session.stats())
+    return result
+
+
+def bench_session_actuator():
+    backend = FakeAudioBackend(latency=CALL_LATENCY, activate_latency=ACTIVATE_LATENCY)
+    session = AudioSession(backend)
+    actuator = Actuator(VolumeBackend(session, scale=0.01), max_rate=20, tolerance=0.5)
+    start = time.perf_counter()
+    actuator.seed(session.get_level() * 100)
+    for step in range(STEPS + 1):
+        actuator.request(step)
+        time.sleep(0.005)
+    actuator.flush(5)
+    actuator.close()
+    result = counters(backend, time.perf_counter() - start)
+    result.update(session.stats())
+    return result
+
+
+def bench():
+    return {
+        "per_event_activation": bench_per_event(),
+        "cached_session": bench_session(),
+        "session_actuator": bench_session_actuator(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
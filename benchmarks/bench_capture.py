@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from capture import ScreenshotService, SyntheticSource, encode, encode_options
+from fakes import StubRoot
+
+
+SHOTS = 5
+VARIANTS = [("png", 1, 90), ("png", 6, 90), ("png", 9, 90), ("jpg", 6, 85), ("webp", 6, 80)]
+
+
+def synchronous(source, directory):
+    # What take_screenshot used to do on the Tk thread
+    started = time.perf_counter()
+    for i in range(SHOTS):
+        source.grab().save(os.path.join(directory, f"sync{i}.png"))
+    return (time.perf_counter() - started) / SHOTS * 1000
+
+
+def pipelined(source, directory, ext, level, quality, region=None):
+    root = StubRoot()
+    service = ScreenshotService(root, source=source)
+    results = []
+    started = time.perf_counter()
+    for i in range(SHOTS):
+        service.capture(os.path.join(directory, f"shot{i}.{ext}"), region=region, compress_level=level,
+                        quality=quality, on_done=results.append, on_error=print)
+    ui_ms = (time.perf_counter() - started) / SHOTS * 1000
+    root.run_until(lambda: not service.busy)
+    service.shutdown()
+    return {
+        "ui_thread_ms": round(ui_ms, 3),
+        "capture_ms": round(sum(r["capture_ms"] for r in results) / len(results), 1),
+        "encode_ms": round(sum(r["encode_ms"] for r in results) / len(results), 1),
+        "write_ms": round(sum(r["write_ms"] for r in results) / len(results), 2),
+        "kb": round(sum(r["bytes"] for r in results) / len(results) / 1024, 1),
+    }
+
+
+def bench():
+    source = SyntheticSource()
+    fmt, params = encode_options("PNG")
+    encode(source.grab(), fmt, **params)
+    with tempfile.TemporaryDirectory() as directory:
+        report = {"synchronous_ui_thread_ms": round(synchronous(source, directory), 1)}
+        for ext, level, quality in VARIANTS:
+            report[f"{ext} level={level} quality={quality}"] = pipelined(source, directory, ext, level, quality)
+        report["png region 800x600"] = pipelined(source, directory, "png", 6, 90, region=(100, 100, 800, 600))
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
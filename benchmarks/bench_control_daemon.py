@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from control_daemon import ControlClient, ControlDaemon
+from fakes import control_address, fake_controller
+
+
+COMMANDS = 20000
+BATCH = 3
+SPAWN_SAMPLES = 20
+
+
+def sequential(client, count):
+    # One request at a time, waiting for each reply
+    started = time.perf_counter()
+    for i in range(count):
+        client.call("brightness.set", value=i % 101)
+    return count / (time.perf_counter() - started)
+
+
+def pipelined(client, count):
+    started = time.perf_counter()
+    futures = [client.send("brightness.set", value=i % 101) for i in range(count)]
+    for future in futures:
+        future.result(30)
+    return count / (time.perf_counter() - started)
+
+
+def batched(client, count):
+    # brightness, volume and theme together in each message
+    started = time.perf_counter()
+    futures = [client.batch([("brightness.set", {"value": i % 101}), ("volume.set", {"value": (i % 11) / 10}),
+                             ("theme.set", {"value": ("light", "dark")[i % 2]})])
+               for i in range(count // BATCH)]
+    for future in futures:
+        future.result(30)
+    return count / (time.perf_counter() - started)
+
+
+def process_per_change(address):
+    # What scripting a change costs today: a fresh interpreter per command
+    import subprocess
+    code = ("import sys; sys.path.insert(0, {!r}); from control_daemon import ControlClient; "
+            "ControlClient({!r}).call('brightness.set', value=40)").format(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"), address)
+    started = time.perf_counter()
+    for _ in range(SPAWN_SAMPLES):
+        subprocess.run([sys.executable, "-c", code], check=True)
+    return SPAWN_SAMPLES / (time.perf_counter() - started)
+
+
+def bench():
+    address = control_address()
+    controller = fake_controller(max_rate=0)
+    daemon = ControlDaemon(controller, address).start()
+    client = ControlClient(address)
+    report = {
+        "sequential_per_s": round(sequential(client, COMMANDS // 4)),
+        "pipelined_per_s": round(pipelined(client, COMMANDS)),
+        "batched_per_s": round(batched(client, COMMANDS)),
+        "process_per_change_per_s": round(process_per_change(address), 1),
+    }
+    controller.displays.flush(5)
+    stats = controller.displays.stats()
+    report["brightness_writes_applied"] = sum(stats["writes"].values())
+    report["brightness_requests"] = stats["requested"]
+    client.close()
+    daemon.stop()
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,131 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from actuator import Actuator
+from displays import DisplayManager, FakeDisplays
+
+
+# A laptop panel and three DDC/CI monitors, the last one slow; a slider drag across all of them
+DISPLAYS = [("Built-in", 50, 0.005), ("DDC/CI 1", 40, 0.04), ("DDC/CI 2", 60, 0.08), ("Slow DDC/CI", 30, 0.4)]
+HUNG = ("Hung DDC/CI", 30, 3.0)
+EVENTS = 100
+EVENT_INTERVAL = 0.005
+TIMEOUT = 0.5
+
+
+class SerialBackend:
+    # What a bare sbc.get_brightness() / sbc.set_brightness(value) did: every monitor, one after another
+    def __init__(self, source):
+        self.source = source
+
+    def read(self):
+        return [self.source.read(display) for display in range(len(self.source.names))][0]
+
+    def write(self, value):
+        for display in range(len(self.source.names)):
+            self.source.write(display, value)
+
+
+def drag(set_value):
+    for i in range(EVENTS):
+        set_value(i * 100 // EVENTS)
+        time.sleep(EVENT_INTERVAL)
+    return (EVENTS - 1) * 100 // EVENTS
+
+
+def settle_times(source, final, started, timeout=20):
+    # Milliseconds from started until each display showed the final value
+    settled = {}
+    while len(settled) < len(source.names) and time.perf_counter() - started < timeout:
+        for display, level in enumerate(source.levels):
+            if display not in settled and level == final:
+                settled[display] = round((time.perf_counter() - started) * 1000, 1)
+        time.sleep(0.001)
+    return {source.names[display]: settled.get(display) for display in range(len(source.names))}
+
+
+def bench_serial():
+    source = FakeDisplays(DISPLAYS)
+    started = time.perf_counter()
+    # sample_3 used to read at startup twice, once for the dashboard card and once for the slider
+    backend = SerialBackend(source)
+    backend.read()
+    backend.read()
+    startup = time.perf_counter() - started
+
+    actuator = Actuator(backend, max_rate=20, name="brightness")
+    actuator.seed(backend.read())
+    started = time.perf_counter()
+    actuator.request(70)
+    single = settle_times(source, 70, started)
+
+    before = [len(writes) for writes in source.writes]
+    final = drag(actuator.request)
+    # Updates during the drag are how closely each display follows the slider
+    during = [len(writes) - count for writes, count in zip(source.writes, before)]
+    settled = settle_times(source, final, time.perf_counter())
+    actuator.close()
+    return {"startup_read_ms": round(startup * 1000, 1), "hardware_reads": source.reads, "single_set_ms": single,
+            "drag_updates": during, "after_drag_settle_ms": settled}
+
+
+def bench_manager():
+    source = FakeDisplays(DISPLAYS)
+    started = time.perf_counter()
+    manager = DisplayManager(source, timeout=TIMEOUT).start()
+    manager.ready()
+    manager.level()
+    startup = time.perf_counter() - started
+
+    reads = source.reads
+    started = time.perf_counter()
+    manager.set(70)
+    single = settle_times(source, 70, started)
+
+    before = [len(writes) for writes in source.writes]
+    set_ms = 0.0
+
+    def timed_set(value):
+        nonlocal set_ms
+        call = time.perf_counter()
+        manager.set(value)
+        set_ms += time.perf_counter() - call
+
+    final = drag(timed_set)
+    during = [len(writes) - count for writes, count in zip(source.writes, before)]
+    settled = settle_times(source, final, time.perf_counter())
+    manager.close()
+    return {"startup_read_ms": round(startup * 1000, 1), "hardware_reads": reads, "single_set_ms": single,
+            "drag_updates": during, "after_drag_settle_ms": settled, "set_call_us": round(set_ms / EVENTS * 1e6, 1)}
+
+
+def bench_hung():
+    # One monitor that takes 3 s per write: the rest should not wait for it
+    source = FakeDisplays(DISPLAYS[:3] + [HUNG])
+    manager = DisplayManager(source, timeout=TIMEOUT).start()
+    manager.ready()
+    started = time.perf_counter()
+    manager.set(70)
+    stalled = manager.flush()
+    flush = time.perf_counter() - started
+    result = {"flush_ms": round(flush * 1000, 1), "stalled": [source.names[display] for display in stalled],
+              "fast_displays_applied": all(level == 70 for level in source.levels[:3])}
+
+    serial = FakeDisplays(DISPLAYS[:3] + [HUNG])
+    started = time.perf_counter()
+    SerialBackend(serial).write(70)
+    result["serial_set_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    manager.close()
+    return result
+
+
+def bench():
+    return {"serial": bench_serial(), "manager": bench_manager(), "hung_display": bench_hung()}
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from geo_cache import GeoResolver
+
+
+# Nominatim round trip plus building a TimezoneFinder, as get_weather used to pay per lookup
+GEOCODE_DELAY = 0.05
+TIMEZONE_DELAY = 0.1
+CITIES = ["London", "Paris", "Tokyo", "New York", "Sydney"]
+REPEATS = 10000
+
+
+class SlowGeocoder:
+    def __init__(self):
+        self.calls = 0
+
+    def geocode(self, city):
+        self.calls += 1
+        time.sleep(GEOCODE_DELAY)
+        return 10.0 + len(city), 20.0 - len(city)
+
+
+def slow_timezone(lat, lon):
+    time.sleep(TIMEZONE_DELAY)
+    return "Europe/London"
+
+
+def run(path):
+    geocoder = SlowGeocoder()
+    resolver = GeoResolver(path=path, geocoder=geocoder, timezone_at=slow_timezone, max_entries=4)
+
+    start = time.perf_counter()
+    for city in CITIES:
+        resolver.resolve(city)
+    cold = (time.perf_counter() - start) / len(CITIES)
+
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        resolver.resolve(CITIES[-1 - i % 4])
+    warm = (time.perf_counter() - start) / REPEATS
+
+    # A fresh resolver reading the persisted file needs no network at all
+    reloaded = GeoResolver(path=path, geocoder=geocoder, timezone_at=slow_timezone)
+    calls_before = geocoder.calls
+    start = time.perf_counter()
+    for city in CITIES[1:]:
+        reloaded.resolve(city)
+    reload = (time.perf_counter() - start) / (len(CITIES) - 1)
+
+    return {
+        "miss_ms": round(cold * 1000, 2),
+        "hit_us": round(warm * 1e6, 2),
+        "after_reload_us": round(reload * 1e6, 2),
+        "network_calls_after_reload": geocoder.calls - calls_before,
+        "stats": resolver.stats(),
+    }
+
+
+def bench():
+    with tempfile.TemporaryDirectory() as tmp:
+        return run(os.path.join(tmp, "geo_cache.json"))
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
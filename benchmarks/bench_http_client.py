@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import requests
+
+from fakes import serve
+from http_client import HttpClient
+
+
+SERVER_DELAY = 0.05
+WATCHLIST = ["London", "Paris", "Tokyo", "New York", "Sydney", "Cairo", "Lima", "Oslo", "Delhi", "Seoul"]
+
+
+class FakeWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        FakeWeatherHandler.hits += 1
+        time.sleep(SERVER_DELAY)
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        city = query.get("q", ["?"])[0]
+        payload = json.dumps({"main": {"temp": len(city), "humidity": 50},
+                              "weather": [{"description": f"clear over {city}"}]}).encode()
+        etag = '"%s"' % hashlib.md5(payload).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn, count):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return round((time.perf_counter() - start) / count * 1000, 3)
+
+
+def run(base):
+    url = f"{base}/weather"
+    results = {}
+
+    # Bare requests.get per click, a new connection every time
+    results["bare_get_ms"] = timed(lambda i: requests.get(url, params={"q": "London"}, timeout=10).json(), 20)
+
+    client = HttpClient(ttls={base: 60})
+    client.get_json(url, {"q": "London"})
+    results["cached_hit_ms"] = timed(lambda i: client.get_json(url, {"q": "London"}), 1000)
+
+    revalidating = HttpClient(ttls={base: 0})
+    revalidating.get_json(url, {"q": "London"})
+    results["revalidate_304_ms"] = timed(lambda i: revalidating.get_json(url, {"q": "London"}), 20)
+
+    # 20 concurrent identical requests should collapse into one
+    dedup = HttpClient(ttls={base: 60})
+    before = FakeWeatherHandler.hits
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        list(pool.map(lambda i: dedup.get_json(url, {"q": "Berlin"}), range(20)))
+    results["concurrent_identical_server_hits"] = FakeWeatherHandler.hits - before
+
+    serial = HttpClient(ttls={})
+    start = time.perf_counter()
+    for city in WATCHLIST:
+        serial.get_json(url, {"q": city})
+    results["watchlist_serial_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    batch = HttpClient(ttls={})
+    start = time.perf_counter()
+    batch.get_many([(url, {"q": city}) for city in WATCHLIST])
+    results["watchlist_batch_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    results["stats"] = {"cached": client.stats(), "revalidating": revalidating.stats(), "dedup": dedup.stats()}
+    return results
+
+
+def bench():
+    with serve(FakeWeatherHandler) as base:
+        return run(base)
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
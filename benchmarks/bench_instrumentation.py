@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import instrumentation
+from instrumentation import LagProbe, timed
+
+
+CALLS = 200000
+
+
+class StallingRoot:
+    """Runs after callbacks in order, with a simulated slow backend call on the Tk thread in between."""
+
+    def __init__(self):
+        self.timers = []
+
+    def after(self, ms, callback):
+        self.timers.append((time.perf_counter() + ms / 1000, callback))
+        return len(self.timers)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run(self, fires, stall_every=3):
+        for n in range(fires):
+            due, callback = self.timers.pop(0)
+            if n % stall_every == stall_every - 1:
+                with timed("sbc.set_brightness"):
+                    time.sleep(0.3)
+            time.sleep(max(due - time.perf_counter(), 0))
+            callback()
+
+
+def overhead():
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        pass
+    empty = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        with timed("bench.op"):
+            pass
+    with_timer = time.perf_counter() - started
+    return round((with_timer - empty) / CALLS * 1e9)
+
+
+def stall_attribution():
+    instrumentation.reset()
+    root = StallingRoot()
+    probe = LagProbe(root, interval_ms=20, stall_ms=100)
+    probe.start()
+    root.run(9)
+    return [{"lag_ms": stall["lag_ms"], "culprits": [call["op"] for call in stall["slow_calls"]]}
+            for stall in instrumentation.stalls]
+
+
+def bench():
+    report = {"timer_overhead_ns": overhead()}
+    summary = instrumentation.histogram("bench.op").summary()
+    report["bench_op_p99_us"] = round(summary["p99_ms"] * 1000, 2)
+    report["stalls"] = stall_attribution()
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
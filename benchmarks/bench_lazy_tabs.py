@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import stub_tk
+from lazy_tabs import LazyNotebook
+
+
+# Needs a display, the suite starts Xvfb on headless machines or else runs it on stub_tk.
+NEEDS_DISPLAY = True
+# Pages sized roughly like the panels': a calendar-like grid, a news canvas and a few forms
+PAGES = [("System Info", 20), ("Brightness", 6), ("Volume Control", 6),
+         ("Calendar", 300), ("Weather", 12), ("Screen Control", 8), ("Live News", 400)]
+
+
+def page_builder(widgets):
+    def build(frame):
+        for i in range(widgets):
+            ttk.Label(frame, text=f"item {i}").grid(row=i // 10, column=i % 10)
+    return build
+
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+def first_frame(eager):
+    tracemalloc.start()
+    calls = stub_tk.total_calls()
+    started = time.perf_counter()
+    root = tk.Tk()
+    notebook = LazyNotebook(root)
+    notebook.pack(fill=tk.BOTH, expand=True)
+    for text, widgets in PAGES:
+        notebook.add_page(text, page_builder(widgets))
+    if eager:
+        notebook.build_all()
+    else:
+        notebook.build(notebook.select())
+    root.update()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {"first_frame_ms": round(elapsed * 1000, 1), "python_peak_kb": round(peak / 1024, 1),
+              "widgets": count_widgets(root)}
+    if stub_tk.installed():
+        # Without a display: the Tk commands a real Tk would have had to carry out before the first frame
+        result["tk_calls"] = stub_tk.total_calls() - calls
+
+    # Switching to an unbuilt tab pays for that page alone
+    started = time.perf_counter()
+    notebook.select(3)
+    root.update()
+    result["first_switch_to_calendar_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    root.destroy()
+    return result
+
+
+def bench():
+    return {"eager": first_frame(eager=True), "lazy": first_frame(eager=False)}
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
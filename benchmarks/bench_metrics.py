@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import FakePsutil, StubRoot
+from metrics import MetricsSampler
+
+
+SAMPLES = 500
+
+
+def overhead(ps):
+    sampler = MetricsSampler(StubRoot(), history=24 * 3600, ps=ps)
+    sampler.ps.cpu_percent(interval=None)
+
+    start = time.perf_counter()
+    for _ in range(SAMPLES):
+        now, values = sampler.sample()
+        sampler._record(now, values)
+    per_sample = (time.perf_counter() - start) / SAMPLES
+
+    # What the Tk thread still pays: merging queued changes and calling subscribers
+    published = []
+    sampler.subscribe(published.append)
+    start = time.perf_counter()
+    sampler.publish()
+    drain = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(SAMPLES):
+        sampler.history_of("cpu", 3600)
+    history_read = (time.perf_counter() - start) / SAMPLES
+
+    buffer_bytes = sum(b.data.itemsize * b.capacity for b in sampler.buffers.values())
+    return {
+        "sample_ms": round(per_sample * 1000, 3),
+        "cpu_pct_at_1hz": round(per_sample * 100, 3),
+        "ui_drain_ms": round(drain * 1000, 3),
+        "history_read_1h_ms": round(history_read * 1000, 3),
+        "series": len(sampler.buffers),
+        "buffer_mb_24h": round(buffer_bytes / 2 ** 20, 2),
+    }
+
+
+def bench():
+    # The fake isolates the sampler's own cost, psutil adds what the OS charges for the readings
+    report = {"fake_psutil": overhead(FakePsutil())}
+    try:
+        import psutil
+    except ImportError:
+        report["psutil"] = "not installed"
+    else:
+        report["psutil"] = overhead(psutil)
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
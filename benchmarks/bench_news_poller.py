@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import JsonHandler, StubRoot, serve
+from http_client import HttpClient
+from news_feed import NewsPoller
+
+
+# Each fixture request returns a 100 article page that has moved on by NEW_PER_REFRESH articles
+PAGE_SIZE = 100
+NEW_PER_REFRESH = 5
+REFRESHES = 40
+MAX_ARTICLES = 200
+
+
+class FixtureHandler(JsonHandler):
+    page = 0
+
+    def respond(self, path, query):
+        FixtureHandler.page += 1
+        newest = 10000 + FixtureHandler.page * NEW_PER_REFRESH
+        articles = [{"title": f"Headline {n}", "description": f"Story number {n} " * 8,
+                     "url": f"https://example.com/{n}"} for n in range(newest, newest - PAGE_SIZE, -1)]
+        return {"status": "ok", "articles": articles}
+
+
+class RecordingFeed:
+    """Mirrors the feed the UI would hold and counts the cards a diff touches."""
+
+    def __init__(self):
+        self.articles = []
+
+    def apply_diff(self, inserted, removed):
+        removed = set(removed)
+        self.articles = list(inserted) + [a for a in self.articles if a["url"] not in removed]
+        return len(inserted) + len(removed)
+
+
+def make_list():
+    # Real Tk list when a display is available, recording feed otherwise
+    if not os.environ.get("DISPLAY"):
+        return None, RecordingFeed()
+    import tkinter as tk
+    from tkinter import ttk
+    from news_view import VirtualNewsList
+    tk_root = tk.Tk()
+    tk_root.geometry("1000x700")
+    canvas = tk.Canvas(tk_root)
+    scrollbar = ttk.Scrollbar(tk_root, orient="vertical")
+    canvas.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+    tk_root.update()
+    return tk_root, VirtualNewsList(canvas, scrollbar, on_open=lambda url: None)
+
+
+def run(base):
+    tk_root, feed = make_list()
+    root = tk_root or StubRoot()
+    client = HttpClient(ttls={})
+
+    def on_diff(inserted, removed):
+        if tk_root is None:
+            return feed.apply_diff(inserted, removed)
+        touched = feed.rows_bound + feed.rows_released
+        feed.apply_diff(inserted, removed)
+        tk_root.update_idletasks()
+        return feed.rows_bound + feed.rows_released - touched
+
+    poller = NewsPoller(root, lambda: client.get_json(f"{base}/news")["articles"], on_diff,
+                        interval=0.02, max_articles=MAX_ARTICLES, poll_ms=5)
+    poller.start()
+    done = lambda: len(poller.history) >= REFRESHES
+    if tk_root is None:
+        root.run_until(done)
+    else:
+        while not done():
+            tk_root.update()
+            time.sleep(0.001)
+    poller.stop()
+
+    history = list(poller.history)[:REFRESHES]
+    steady = history[1:]
+    result = {
+        "ui": "tk" if tk_root else "recording",
+        "first_refresh": history[0],
+        "steady_avg_worker_cpu_ms": round(sum(r["worker_cpu_ms"] for r in steady) / len(steady), 3),
+        "steady_avg_ui_cpu_ms": round(sum(r["ui_cpu_ms"] for r in steady) / len(steady), 3),
+        "steady_avg_widgets_touched": sum(r["widgets_touched"] for r in steady) / len(steady),
+        "retained_articles": len(feed.articles),
+    }
+    if tk_root is not None:
+        result["card_widgets"] = feed.widget_count
+        tk_root.destroy()
+    return result
+
+
+def bench():
+    with serve(FixtureHandler) as base:
+        return run(base)
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
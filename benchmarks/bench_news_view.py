@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import stub_tk
+from fakes import synthetic_articles
+from news_view import VirtualNewsList
+
+
+# Needs a display, the suite starts Xvfb on headless machines or else runs it on stub_tk
+NEEDS_DISPLAY = True
+COUNTS = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+SCROLL_STEPS = 200
+
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+def make_window():
+    root = tk.Tk()
+    root.geometry("1000x700")
+    frame = ttk.Frame(root)
+    frame.pack(fill="both", expand=True)
+    canvas = tk.Canvas(frame)
+    scrollbar = ttk.Scrollbar(frame, orient="vertical")
+    canvas.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+    root.update()
+    return root, canvas, scrollbar
+
+
+def tk_calls(result, key, since, per=1):
+    # On stub_tk, the Tk commands behind a step: what a real Tk would carry out besides the timed Python side
+    if stub_tk.installed():
+        calls = stub_tk.total_calls() - since
+        result[key] = calls if per == 1 else round(calls / per, 1)
+
+
+def scroll(root, yview):
+    calls = stub_tk.total_calls()
+    start = time.perf_counter()
+    for step in range(SCROLL_STEPS):
+        yview("scroll", 3 if step < SCROLL_STEPS // 2 else -3, "units")
+        root.update_idletasks()
+    result = {"scroll_frame_ms": round((time.perf_counter() - start) / SCROLL_STEPS * 1000, 3)}
+    tk_calls(result, "scroll_tk_calls_per_frame", calls, SCROLL_STEPS)
+    return result
+
+
+def bench_eager(articles):
+    # The original create_news_card layout: one frame, two labels and a button per article
+    root, canvas, scrollbar = make_window()
+    calls = stub_tk.total_calls()
+    start = time.perf_counter()
+    scrollable_frame = ttk.Frame(canvas)
+    scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+    canvas.configure(yscrollcommand=scrollbar.set)
+    scrollbar.configure(command=canvas.yview)
+    for idx, article in enumerate(articles):
+        card = ttk.Frame(scrollable_frame)
+        card.grid(row=idx, column=0, sticky='ew', padx=10, pady=5)
+        ttk.Label(card, text=article['title'], font=('Segoe UI', 12, 'bold'), wraplength=800).pack(anchor='w')
+        ttk.Label(card, text=article['description'], wraplength=800).pack(anchor='w')
+        ttk.Button(card, text="Read More").pack(anchor='e')
+    root.update()
+    build = time.perf_counter() - start
+    result = {"build_ms": round(build * 1000, 1)}
+    tk_calls(result, "build_tk_calls", calls)
+    result.update(scroll(root, canvas.yview), widgets=count_widgets(root))
+    root.destroy()
+    return result
+
+
+def bench_virtual(articles):
+    root, canvas, scrollbar = make_window()
+    calls = stub_tk.total_calls()
+    start = time.perf_counter()
+    news_list = VirtualNewsList(canvas, scrollbar, on_open=lambda url: None)
+    news_list.set_articles(articles)
+    root.update()
+    build = time.perf_counter() - start
+    result = {"build_ms": round(build * 1000, 1)}
+    tk_calls(result, "build_tk_calls", calls)
+    result.update(scroll(root, news_list.yview), widgets=count_widgets(root), row_pool=news_list.widget_count)
+    root.destroy()
+    return result
+
+
+def bench():
+    report = {}
+    for count in COUNTS:
+        articles = synthetic_articles(count)
+        report[f"{count}_articles"] = {"eager": bench_eager(articles), "virtual": bench_virtual(articles)}
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,247 @@
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tkinter as tk
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import instrumentation
+from fakes import FakePsutil, control_address, fake_controller, synthetic_articles
+from news_view import article_key
+from processes import ProcessSampler
+from sample_3 import SNAPSHOT_SAMPLES, SNAPSHOT_SERIES
+
+
+# Needs a display, the suite starts Xvfb on headless machines or else runs it on stub_tk.
+# Both panels built on fake backends, measuring the paths a user feels.
+NEEDS_DISPLAY = True
+DEVICE_LATENCY = 0.03
+# A laptop panel and two DDC/CI monitors, one of them slow
+DISPLAYS = [("Built-in", 50, 0.005), ("DDC/CI left", 40, 0.05), ("DDC/CI right", 60, 0.2)]
+DRAG_EVENTS = 200
+NEWS_COUNTS = [20, 200, 1000]
+THEME_SWITCHES = 20
+SAMPLER_SECONDS = 3
+PROCESSES = 3000
+PROCESS_SAMPLES = 30
+# What building the controller costs before the first command, audio endpoint activation and the like
+STARTUP_DELAY = 0.5
+SNAPSHOT_ARTICLES = 200
+
+
+def pump(root, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        root.update()
+        time.sleep(0.002)
+
+
+def open_panel(module, cls, startup_delay=0.0, **kwargs):
+    # Returns the panel, the list its controller lands in and how long the first frame took
+    panel_class = getattr(importlib.import_module(module), cls)
+    controllers = []
+
+    def factory():
+        if startup_delay:
+            time.sleep(startup_delay)
+        controllers.append(fake_controller(latency=DEVICE_LATENCY, displays=DISPLAYS))
+        return controllers[-1]
+
+    started = time.perf_counter()
+    root = tk.Tk()
+    app = panel_class(root, controller_factory=factory, control_address=control_address(), ps=FakePsutil(),
+                      **kwargs)
+    root.update()
+    return app, controllers, (time.perf_counter() - started) * 1000
+
+
+def connected(app, controllers, timeout=10):
+    # sample_3 connects to its daemon in the background
+    deadline = time.perf_counter() + timeout
+    while app.control.client is None and time.perf_counter() < deadline:
+        app.root.update()
+        time.sleep(0.002)
+    return controllers[0]
+
+
+def close_panel(app):
+    app.metrics.stop()
+    app.processes.stop()
+    app.lag_probe.stop()
+    if hasattr(app, "news_poller"):
+        app.news_poller.stop()
+    app.control.close()
+    app.root.destroy()
+
+
+def select(app, page):
+    app.notebook.select(page)
+    app.root.update()
+
+
+def slider_drag(app, controller):
+    # Every event goes slider -> daemon -> display manager -> each fake display in parallel
+    select(app, 1)
+    source = controller.displays.source
+    writes_before = sum(len(writes) for writes in source.writes)
+    ui = 0.0
+    started = time.perf_counter()
+    for i in range(DRAG_EVENTS):
+        value = i * 100 // DRAG_EVENTS
+        event = time.perf_counter()
+        app.bright_slider.set(value)
+        app.root.update()
+        ui += time.perf_counter() - event
+    final = (DRAG_EVENTS - 1) * 100 // DRAG_EVENTS
+    while any(level != final for level in source.levels) and time.perf_counter() - started < 10:
+        app.root.update()
+        time.sleep(0.001)
+    return {
+        "events_per_s": round(DRAG_EVENTS / ui),
+        "ui_ms_per_event": round(ui / DRAG_EVENTS * 1000, 3),
+        "settle_ms": round((time.perf_counter() - started) * 1000 - ui * 1000, 1),
+        "device_writes": sum(len(writes) for writes in source.writes) - writes_before,
+        "final_applied": all(level == final for level in source.levels),
+    }
+
+
+def news_render(app):
+    select(app, app.news_page)
+    report = {}
+    start = 0
+    for count in NEWS_COUNTS:
+        # Replace the whole feed, then a typical refresh of five new and five dropped stories
+        removed = [article_key(article) for article in app.news_articles]
+        articles = synthetic_articles(count, start=start)
+        started = time.perf_counter()
+        app.apply_news_diff(articles, removed)
+        app.root.update()
+        full = time.perf_counter() - started
+
+        fresh = synthetic_articles(5, start=start + count)
+        started = time.perf_counter()
+        app.apply_news_diff(fresh, [article_key(article) for article in articles[-5:]])
+        app.root.update()
+        report[f"{count}_articles"] = {"full_ms": round(full * 1000, 2),
+                                       "refresh_ms": round((time.perf_counter() - started) * 1000, 2)}
+        start += count + 5
+    return report
+
+
+def theme_switch(app):
+    # With the dashboard and a full news feed built
+    select(app, app.dashboard_page)
+    names = ["dark", "light"]
+    started = time.perf_counter()
+    for i in range(THEME_SWITCHES):
+        app.change_theme(names[i % 2])
+        app.root.update_idletasks()
+    return {"switch_ms": round((time.perf_counter() - started) / THEME_SWITCHES * 1000, 2)}
+
+
+def process_table(app):
+    # Successive samples of a busy host, applied to the dashboard's table in place
+    select(app, app.dashboard_page)
+    sampler = ProcessSampler(app.root, None, count=app.processes.count, ps=FakePsutil(processes=PROCESSES))
+    samples = [sampler.sample() for _ in range(PROCESS_SAMPLES)]
+    panel = app.process_panel
+    touched_before = panel.touched
+    started = time.perf_counter()
+    for rows in samples:
+        panel.show(rows)
+        app.root.update_idletasks()
+    elapsed = time.perf_counter() - started
+    return {
+        "refresh_ms": round(elapsed / PROCESS_SAMPLES * 1000, 3),
+        "rows_touched_per_refresh": round((panel.touched - touched_before) / PROCESS_SAMPLES, 1),
+        "rows": sampler.count,
+    }
+
+
+def sampler_overhead(app):
+    select(app, app.dashboard_page)
+    samples_before, seconds_before = app.metrics.samples, app.metrics.sample_seconds
+    instrumentation.reset()
+    pump(app.root, SAMPLER_SECONDS)
+    samples = app.metrics.samples - samples_before
+    publish = instrumentation.histogram("task.metrics").summary()
+    return {
+        "samples": samples,
+        "worker_ms_per_sample": round((app.metrics.sample_seconds - seconds_before) / max(samples, 1) * 1000, 3),
+        "ui_publish_ms": round(publish["mean_ms"], 3),
+        "ui_publish_max_ms": round(publish["max_ms"], 3),
+    }
+
+
+def launch(snapshot_path):
+    # First frame, and from there until the brightness card shows every display's live level
+    app, controllers, first_frame = open_panel("sample_3", "AdvancedScreenController", startup_delay=STARTUP_DELAY,
+                                               news_fetch=lambda: [], snapshot_path=snapshot_path)
+    report = {
+        "first_frame_ms": round(first_frame, 1),
+        "brightness_at_first_frame": app.brightness_card.cget("text"),
+        "theme_at_first_frame": app.theme_mode.get(),
+        "articles_at_first_frame": len(app.news_articles),
+        "history_at_first_frame": sum(1 for value in app.metrics.history_of("cpu") if value == value),
+    }
+    live = " / ".join(f"{level}%" for _, level, _ in DISPLAYS)
+    started = time.perf_counter()
+    while app.brightness_card.cget("text") != live and time.perf_counter() - started < 10:
+        app.root.update()
+        time.sleep(0.002)
+    report["reconciled_ms"] = round(first_frame + (time.perf_counter() - started) * 1000, 1)
+    connected(app, controllers)
+    return app, report
+
+
+def warm_start():
+    # The same launch with no snapshot, then with the one the first session saved
+    path = os.path.join(tempfile.mkdtemp(), "snapshot.bin")
+    app, cold = launch(path)
+
+    # What a session leaves behind: a theme, levels the hardware no longer has, a feed and an hour of charts
+    app.change_theme("dark")
+    app.show_brightness(70)
+    app.apply_news_diff(synthetic_articles(SNAPSHOT_ARTICLES), [])
+    rng = random.Random(42)
+    app.metrics.restore({name: array('d', [rng.uniform(0, 100) for _ in range(SNAPSHOT_SAMPLES)])
+                         for name in SNAPSHOT_SERIES})
+    started = time.perf_counter()
+    size = app.save_snapshot()
+    save = time.perf_counter() - started
+    close_panel(app)
+
+    app, warm = launch(path)
+    close_panel(app)
+    return {"cold": cold, "warm": warm, "snapshot_kb": round(size / 1024, 1), "save_ms": round(save * 1000, 2)}
+
+
+def bench():
+    report = {}
+    app, controllers, first_frame = open_panel("sample_2", "ScreenController")
+    report["sample_2"] = {"first_frame_ms": round(first_frame, 1)}
+    close_panel(app)
+
+    app, controllers, first_frame = open_panel("sample_3", "AdvancedScreenController", news_fetch=lambda: [],
+                                               snapshot_path=None)
+    controller = connected(app, controllers)
+    report["sample_3"] = {
+        "first_frame_ms": round(first_frame, 1),
+        "slider_drag": slider_drag(app, controller),
+        "news_render": news_render(app),
+        "theme_switch": theme_switch(app),
+        "process_table": process_table(app),
+        "sampler": sampler_overhead(app),
+    }
+    close_panel(app)
+    report["warm_start"] = warm_start()
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
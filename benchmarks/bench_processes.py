@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import FakePsutil, StubRoot
+from processes import KEYS, ProcessSampler
+
+
+# Enough idle children to look like a busy desktop, on top of whatever the host runs
+SPAWN = 2000
+# Two walks and four candidate re-reads for the sampler
+SAMPLES = 6
+COUNT = 25
+INTERVAL = 2.0
+ALL_ATTRS = ["pid", "name", "cpu_percent", "memory_info", "io_counters"]
+
+
+def naive(ps, key):
+    # Every attribute of every process, then a full sort
+    def score(info):
+        value = info[KEYS[key]]
+        if value is None:
+            return 0
+        if key == "cpu":
+            return value
+        if key == "memory":
+            return value.rss
+        return value.read_bytes + value.write_bytes
+    infos = [proc.as_dict(ALL_ATTRS, ad_value=None) for proc in ps.process_iter()]
+    return sorted(infos, key=score, reverse=True)[:COUNT]
+
+
+def measure(take):
+    take()
+    wall = cpu = 0.0
+    for _ in range(SAMPLES):
+        started, thread = time.perf_counter(), time.thread_time()
+        take()
+        wall += time.perf_counter() - started
+        cpu += time.thread_time() - thread
+    return {"sample_ms": round(wall / SAMPLES * 1000, 2), "cpu_pct_at_2s": round(cpu / SAMPLES / INTERVAL * 100, 2)}
+
+
+def compare(ps):
+    report = {"processes": sum(1 for _ in ps.process_iter())}
+    for key in KEYS:
+        sampler = ProcessSampler(StubRoot(), lambda rows: None, count=COUNT, key=key, ps=ps)
+        report[key] = {"naive": measure(lambda: naive(ps, key)), "sampler": measure(sampler.sample)}
+    return report
+
+
+def bench():
+    report = {"fake_psutil_5000": compare(FakePsutil(processes=5000))}
+    try:
+        import psutil
+    except ImportError:
+        report["psutil"] = "not installed"
+        return report
+
+    children = []
+    try:
+        for _ in range(SPAWN):
+            try:
+                children.append(subprocess.Popen(["sleep", "600"], stdout=subprocess.DEVNULL))
+            except OSError:
+                break
+        report["psutil"] = compare(psutil)
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import StubRoot
+from runner import CommandRunner
+
+
+# Stand-ins for calc, netsh and shutdown: a chatty command, a slow one and one that hangs
+CHATTY = [sys.executable, "-c", "import sys, time\nfor i in range(5):\n    print('line', i, flush=True)\n"
+                                "    time.sleep(0.02)\nsys.stderr.write('done\\n')"]
+SLOW = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+HANGS = [sys.executable, "-c", "import time; time.sleep(60)"]
+FAILS = [sys.executable, "-c", "import sys; sys.exit(3)"]
+COMMANDS = 16
+CAP = 4
+
+
+def bench():
+    root = StubRoot()
+    runner = CommandRunner(root, max_concurrent=CAP, default_timeout=5)
+    lines, exits = [], []
+
+    started = time.perf_counter()
+    launch = time.perf_counter()
+    for _ in range(COMMANDS):
+        runner.run(SLOW, on_exit=exits.append)
+    runner.run(CHATTY, on_output=lambda stream, line: lines.append((stream, line)), on_exit=exits.append)
+    runner.run(HANGS, timeout=0.5, on_exit=exits.append)
+    runner.run(FAILS, on_exit=exits.append)
+    ui_ms = (time.perf_counter() - launch) / (COMMANDS + 3) * 1000
+    root.run_until(lambda: len(exits) == COMMANDS + 3)
+    wall = time.perf_counter() - started
+
+    by_name = {tuple(r["args"]): r for r in exits}
+    hung = by_name[tuple(HANGS)]
+    runner.shutdown()
+    return {
+        "ui_thread_ms_per_launch": round(ui_ms, 3),
+        "wall_s": round(wall, 2),
+        "serial_estimate_s": round(COMMANDS * 0.3 + 0.5, 1),
+        "slow_latency_ms": round(sum(r["latency_ms"] for r in exits if r["args"] == SLOW) / COMMANDS, 1),
+        "max_queued_ms": round(max(r["queued_ms"] for r in exits), 1),
+        "streamed_lines": len(lines),
+        "hung_timed_out": hung["timed_out"],
+        "hung_latency_ms": round(hung["latency_ms"], 1),
+        "failing_returncode": by_name[tuple(FAILS)]["returncode"],
+        "stats": runner.stats(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import StubNotebook, StubRoot
+from scheduler import TickScheduler
+
+
+SECONDS = 4
+# What the panels used to run as separate root.after loops: clock, system info, news queue poll
+LOOPS = [("clock", 1.0), ("system_info", 2.0), ("news", 0.25)]
+
+
+def separate_loops():
+    root = StubRoot()
+    for name, period in LOOPS:
+        def loop(period=period):
+            root.after(int(period * 1000), loop)
+        root.after(int(period * 1000), loop)
+    root.run_for(SECONDS)
+    return {"wakeups_per_s": round(root.wakeups / SECONDS, 2)}
+
+
+def scheduled(tab="system", iconic=False):
+    root = StubRoot()
+    notebook = StubNotebook("system")
+    scheduler = TickScheduler(root, notebook)
+    for name, period in LOOPS:
+        scheduler.add(name, lambda: None, max(period, 1.0), page="system")
+    notebook.select(tab)
+    if iconic:
+        root.iconic = True
+        root.fire("<Unmap>")
+    root.run_for(SECONDS)
+    stats = scheduler.stats()
+    return {"wakeups_per_s": round(root.wakeups / SECONDS, 2),
+            "lag_avg_ms": round(stats["lag_avg_ms"], 2), "lag_max_ms": round(stats["lag_max_ms"], 2)}
+
+
+def bench():
+    return {
+        "separate_loops": separate_loops(),
+        "scheduler_visible": scheduled(),
+        "scheduler_other_tab": scheduled(tab="weather"),
+        "scheduler_iconified": scheduled(iconic=True),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
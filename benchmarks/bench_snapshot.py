@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from control_daemon import ControlBridge, connect
+from fakes import FakePsutil, StubRoot, control_address, fake_controller, synthetic_articles
+from metrics import MetricsSampler
+from snapshot import Snapshot
+
+
+# What sample_3 saves: levels and theme, an hour of the charted series, three displays and a full feed
+SERIES = ("cpu", "memory", "net_recv", "net_sent")
+SAMPLES = 3600
+ARTICLES = 200
+ROUNDS = 50
+# What building the controller costs before the first command, as in bench_panels
+STARTUP_DELAY = 0.5
+
+
+def session_snapshot():
+    rng = random.Random(42)
+    return Snapshot(
+        values={"theme": "dark", "volume": 0.35, "metric.cpu": 23.5, "metric.memory": 61.2, "metric.battery": 80.0},
+        series={name: array('d', [rng.uniform(0, 100) for _ in range(SAMPLES)]) for name in SERIES},
+        records={
+            "displays": [{"id": i, "name": name, "level": level}
+                         for i, (name, level) in enumerate([("Built-in", 70), ("DDC/CI left", 40), ("DDC/CI right", 60)])],
+            "articles": synthetic_articles(ARTICLES),
+        },
+    )
+
+
+def timed_rounds(call):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = call()
+    return (time.perf_counter() - started) / ROUNDS * 1000, result
+
+
+def startup_path(path):
+    """The work sample_3 does on the Tk thread before its first frame, other than building widgets.
+
+    Before the snapshot the panel connected to (or started) the daemon
+    inline; now it loads the snapshot, fills its history buffers and
+    connects in the background. Widget construction is the same either
+    way and needs a display, so it is left out.
+    """
+    def factory():
+        time.sleep(STARTUP_DELAY)
+        return fake_controller()
+
+    started = time.perf_counter()
+    client, daemon = connect(factory, control_address())
+    inline_ms = (time.perf_counter() - started) * 1000
+    client.close()
+    daemon.stop()
+
+    # The panel builds its sampler with or without a snapshot
+    root = StubRoot()
+    sampler = MetricsSampler(root, history=24 * 3600, ps=FakePsutil())
+    started = time.perf_counter()
+    snapshot = Snapshot.load(path)
+    sampler.restore(snapshot.series, gap=60)
+    bridge = ControlBridge(root)
+    bridge.connect(factory, control_address())
+    warm_ms = (time.perf_counter() - started) * 1000
+    root.run_until(lambda: bridge.client is not None, timeout=10)
+    live_ms = (time.perf_counter() - started) * 1000
+    bridge.close()
+    return {"inline_connect_ms": round(inline_ms, 1), "snapshot_and_background_connect_ms": round(warm_ms, 1),
+            "live_connection_ms": round(live_ms, 1)}
+
+
+def bench():
+    snapshot = session_snapshot()
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "snapshot.bin")
+    save_ms, size = timed_rounds(lambda: snapshot.save(path))
+    load_ms, loaded = timed_rounds(lambda: Snapshot.load(path))
+
+    # The same state as JSON, the obvious alternative
+    json_path = os.path.join(directory, "snapshot.json")
+    state = {"values": snapshot.values, "series": {name: list(values) for name, values in snapshot.series.items()},
+             "records": snapshot.records}
+
+    def json_save():
+        with open(json_path, "w") as f:
+            json.dump(state, f)
+
+    def json_load():
+        with open(json_path) as f:
+            return json.load(f)
+
+    json_save_ms, _ = timed_rounds(json_save)
+    json_load_ms, _ = timed_rounds(json_load)
+
+    # Filling sample_3's day of history buffers, a minute after the save
+    sampler = MetricsSampler(StubRoot(), history=24 * 3600, ps=FakePsutil())
+    restore_ms, _ = timed_rounds(lambda: sampler.restore(loaded.series, gap=60))
+    return {
+        "binary": {"kb": round(size / 1024, 1), "save_ms": round(save_ms, 3), "load_ms": round(load_ms, 3)},
+        "json": {"kb": round(os.path.getsize(json_path) / 1024, 1), "save_ms": round(json_save_ms, 3),
+                 "load_ms": round(json_load_ms, 3)},
+        "metrics_restore_ms": round(restore_ms, 3),
+        "articles_loaded": len(loaded.records["articles"]),
+        "startup_before_first_frame": startup_path(path),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
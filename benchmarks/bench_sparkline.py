@@ -0,0 +1,78 @@
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import sparkline
+from metrics import RingBuffer
+
+
+# 24 h of 1 s samples drawn into a 300 px wide chart
+SAMPLES = 24 * 3600
+WIDTH = 300
+FRAMES = 100
+
+
+def synthetic_history():
+    rng = random.Random(7)
+    buffer = RingBuffer(SAMPLES)
+    for i in range(SAMPLES):
+        value = 30 + 20 * math.sin(i / 900) + rng.random() * 10
+        if i % 5000 == 0:
+            value = 100.0
+        buffer.append(value)
+    return buffer
+
+
+def time_downsample(buffer):
+    sparkline.downsample(buffer.values(), WIDTH)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        _, points = sparkline.downsample(buffer.values(), WIDTH)
+    return round((time.perf_counter() - start) / FRAMES * 1000, 3), max(points)
+
+
+def time_draw(buffer):
+    # Real canvas redraws, only when a display is available
+    if not os.environ.get("DISPLAY"):
+        return None
+    import tkinter as tk
+    root = tk.Tk()
+    chart = sparkline.Sparkline(root, [("cpu", "#3498db")], title="CPU", max_value=100, width=WIDTH)
+    chart.canvas.pack()
+    root.update()
+    items = len(chart.canvas.find_all())
+    total = 0.0
+    for _ in range(FRAMES):
+        buffer.append(random.random() * 100)
+        chart.draw({"cpu": buffer.values()})
+        start = time.perf_counter()
+        root.update_idletasks()
+        total += chart.last_draw_ms + (time.perf_counter() - start) * 1000
+    result = {"frame_ms": round(total / FRAMES, 3), "canvas_items_before": items,
+              "canvas_items_after": len(chart.canvas.find_all())}
+    root.destroy()
+    return result
+
+
+def bench():
+    buffer = synthetic_history()
+    numpy_ms, numpy_peak = time_downsample(buffer)
+    numpy_module, sparkline.np = sparkline.np, None
+    python_ms, python_peak = time_downsample(buffer)
+    sparkline.np = numpy_module
+    return {
+        "samples": SAMPLES,
+        "downsample_numpy_ms": numpy_ms if numpy_module is not None else "numpy not installed",
+        "downsample_python_ms": python_ms,
+        "spikes_kept": numpy_peak == 100.0 and python_peak == 100.0,
+        "tk_draw": time_draw(buffer) or "no display",
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+CONTROL_SCREEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen")
+
+# What the entry points used to import at module top
+HEAVY_MODULES = ["pyautogui", "geopy.geocoders", "timezonefinder", "comtypes", "pycaw.pycaw", "tkcalendar",
+                 "PIL.Image", "pytz", "requests", "screen_brightness_control", "psutil", "numpy"]
+ENTRY_POINTS = {"sample_2": "ScreenController", "sample_3": "AdvancedScreenController"}
+
+FIRST_FRAME = """
+import time
+started = time.perf_counter()
+{preload}
+import tkinter as tk
+import {module}
+root = tk.Tk()
+app = {module}.{cls}(root)
+root.update()
+print(time.perf_counter() - started)
+root.destroy()
+"""
+
+
+def python(code, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(args, cwd=CONTROL_SCREEN, capture_output=True, text=True, timeout=120)
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package"
+    costs = {}
+    for line in stderr.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        try:
+            costs[parts[2].strip()] = int(parts[1])
+        except ValueError:
+            continue
+    return costs
+
+
+def module_costs():
+    results = {}
+    for name in HEAVY_MODULES:
+        proc = python(f"import {name}", importtime=True)
+        if proc.returncode != 0:
+            results[name] = "unavailable: " + (proc.stderr.strip().splitlines() or ["?"])[-1]
+        else:
+            results[name] = round(parse_importtime(proc.stderr).get(name, 0) / 1000, 1)
+    return results
+
+
+def entry_imports(module):
+    # Which heavy modules importing the entry point still pulls in
+    proc = python(f"import {module}", importtime=True)
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+    costs = parse_importtime(proc.stderr)
+    return {
+        "import_ms": round(costs.get(module, 0) / 1000, 1),
+        "heavy_loaded": sorted(name for name in HEAVY_MODULES if name in costs),
+    }
+
+
+def first_frame(module, cls, eager):
+    # eager=True pays for every installed heavy module up front, as the old imports did
+    preload = "\n".join(f"try:\n    import {name}\nexcept ImportError:\n    pass"
+                        for name in HEAVY_MODULES) if eager else ""
+    proc = python(FIRST_FRAME.format(preload=preload, module=module, cls=cls))
+    if proc.returncode != 0:
+        return "unavailable: " + (proc.stderr.strip().splitlines() or ["?"])[-1]
+    return round(float(proc.stdout.strip().splitlines()[-1]) * 1000, 1)
+
+
+def bench():
+    report = {"module_import_ms": module_costs(), "entry_points": {}}
+    for module, cls in ENTRY_POINTS.items():
+        report["entry_points"][module] = {
+            "imports": entry_imports(module),
+            "first_frame_ms": first_frame(module, cls, eager=False),
+            "first_frame_eager_imports_ms": first_frame(module, cls, eager=True),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import stub_tk
+from theme_engine import ThemeEngine
+
+
+# switch_latency needs a display, the suite starts Xvfb on headless machines or else runs it on stub_tk
+NEEDS_DISPLAY = True
+CARDS = 1000
+SWITCHES = 20
+THEMES = {
+    "light": {"bg": "#ffffff", "fg": "#2c3e50", "accent": "#3498db"},
+    "dark": {"bg": "#2c3e50", "fg": "#ecf0f1", "accent": "#3498db"},
+}
+
+
+def stylesheet(theme):
+    # The same sheet AdvancedScreenController uses
+    return {
+        "configure": {
+            '.': {'font': ('Segoe UI', 12), 'background': theme['bg']},
+            'TNotebook': {'background': theme['bg']},
+            'TNotebook.Tab': {'font': ('Segoe UI', 12, 'bold'), 'padding': [20, 5]},
+            'TFrame': {'background': theme['bg']},
+            'TLabel': {'background': theme['bg'], 'foreground': theme['fg']},
+            'TButton': {'background': theme['accent'], 'foreground': 'white',
+                        'borderwidth': 0, 'font': ('Segoe UI', 12, 'bold')},
+        },
+        "map": {'TButton': {'background': [('active', theme['accent'])]}},
+    }
+
+
+def configure_styles(style, theme):
+    # The old change_theme: theme_use plus every style, every time
+    style.theme_use('clam')
+    for kind, styles in stylesheet(theme).items():
+        for name, options in styles.items():
+            getattr(style, kind)(name, **options)
+
+
+def update_all_widgets(widget):
+    for child in widget.winfo_children():
+        if isinstance(child, ttk.Frame):
+            child.configure(style='TFrame')
+        update_all_widgets(child)
+
+
+class RecordingStyle:
+    def __init__(self):
+        self.calls = 0
+
+    def theme_use(self, name):
+        self.calls += 1
+
+    def configure(self, style, **options):
+        self.calls += 1
+
+    def map(self, style, **options):
+        self.calls += 1
+
+
+def style_calls():
+    # Headless: Tcl style calls per switch
+    old = RecordingStyle()
+    configure_styles(old, THEMES["dark"])
+    engine = ThemeEngine(RecordingStyle(), THEMES, stylesheet)
+    engine.apply("light")
+    engine.style.calls = 0
+    engine.apply("dark")
+    return {"old_calls_per_switch": old.calls, "engine_calls_per_switch": engine.style.calls}
+
+
+def switch_latency():
+    root = tk.Tk()
+    style = ttk.Style(root)
+    canvas = tk.Canvas(root)
+    canvas.pack(fill=tk.BOTH, expand=True)
+    feed = ttk.Frame(canvas)
+    canvas.create_window(0, 0, window=feed, anchor='nw')
+    for i in range(CARDS):
+        card = ttk.Frame(feed)
+        ttk.Label(card, text=f"Headline {i}").pack(anchor='w')
+        ttk.Label(card, text="Story text " * 10).pack(anchor='w')
+        ttk.Button(card, text="Read More").pack(anchor='e')
+        card.pack(fill=tk.X)
+    root.update()
+
+    names = list(THEMES)
+    calls = stub_tk.total_calls()
+    started = time.perf_counter()
+    for i in range(SWITCHES):
+        configure_styles(style, THEMES[names[i % 2]])
+        canvas.configure(bg=THEMES[names[i % 2]]["bg"])
+        update_all_widgets(root)
+        root.update_idletasks()
+    old = (time.perf_counter() - started) / SWITCHES
+    old_calls = (stub_tk.total_calls() - calls) / SWITCHES
+
+    engine = ThemeEngine(style, THEMES, stylesheet)
+    engine.register(canvas, bg="bg")
+    engine.apply("light")
+    root.update_idletasks()
+    calls = stub_tk.total_calls()
+    started = time.perf_counter()
+    for i in range(SWITCHES):
+        engine.apply(names[(i + 1) % 2])
+        root.update_idletasks()
+    new = (time.perf_counter() - started) / SWITCHES
+    new_calls = (stub_tk.total_calls() - calls) / SWITCHES
+    root.destroy()
+    result = {"old_switch_ms": round(old * 1000, 3), "engine_switch_ms": round(new * 1000, 3)}
+    if stub_tk.installed():
+        # Every Tk command of a switch, the widget walk and update included, not only the style calls
+        result.update(old_switch_tk_calls=old_calls, engine_switch_tk_calls=new_calls)
+    return result
+
+
+def bench():
+    report = style_calls()
+    try:
+        report.update(switch_latency())
+    except tk.TclError as e:
+        report["switch_latency"] = f"unavailable: {e}"
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+import numpy as np
+from PIL import Image
+
+from capture import SyntheticSource, encode
+from timelapse import TimelapseReader, TimelapseWriter
+
+
+FRAMES = 200
+FRAMES_PER_DAY = 24 * 3600 // 5
+
+
+def mostly_static_frames(count):
+    # A 1080p desktop where a clock ticks, a cursor wanders and now and then a window redraws
+    base = np.asarray(SyntheticSource().grab())
+    rng = np.random.default_rng(1)
+    frame = base.copy()
+    for n in range(count):
+        frame[1040:1070, 1780:1900] = (n * 37) % 256
+        x, y = rng.integers(0, 1900), rng.integers(0, 1060)
+        frame[y:y + 20, x:x + 20] = 255
+        if n % 20 == 0:
+            top, left = rng.integers(0, 700), rng.integers(0, 1400)
+            frame[top:top + 300, left:left + 500] = rng.integers(0, 256, 3)
+        yield frame.copy()
+
+
+def bench():
+    frames = list(mostly_static_frames(FRAMES))
+    png_bytes = len(encode(Image.fromarray(frames[0]), "PNG", compress_level=6))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.timelapse")
+        writer = TimelapseWriter(path, 1920, 1080, tile=64, keyframe_every=720)
+        tiles = 0
+        started = time.process_time()
+        for frame in frames:
+            tiles += writer.append(frame)[0]
+        store_cpu = (time.process_time() - started) / FRAMES
+        writer.close()
+        size = os.path.getsize(path)
+
+        with TimelapseReader(path) as reader:
+            started = time.perf_counter()
+            for n, frame in reader.frames():
+                pass
+            playback = (time.perf_counter() - started) / len(reader)
+            exact = all((reader.frame(n) == frames[n]).all() for n in (0, FRAMES // 2, FRAMES - 1))
+
+    return {
+        "store_cpu_ms_per_frame": round(store_cpu * 1000, 2),
+        "tiles_per_frame": round(tiles / FRAMES, 1),
+        "kb_per_frame": round(size / FRAMES / 1024, 1),
+        "full_png_kb_per_frame": round(png_bytes / 1024, 1),
+        "projected_mb_per_day_at_5s": round(size / FRAMES * FRAMES_PER_DAY / 2 ** 20, 1),
+        "projected_png_mb_per_day_at_5s": round(png_bytes * FRAMES_PER_DAY / 2 ** 20, 1),
+        "cpu_percent_at_5s": round(store_cpu / 5 * 100, 3),
+        "playback_ms_per_frame": round(playback * 1000, 2),
+        "lossless": exact,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen"))
+
+from fakes import JsonHandler, StubRoot, serve
+from geo_cache import GeoResolver
+from http_client import HttpClient
+from weather_service import WeatherService
+
+
+# Stand-in for Nominatim and OpenWeatherMap with a slow network
+NETWORK_DELAY = 0.3
+TIMEZONE_DELAY = 0.2
+LOOKUPS = 5
+
+
+class StandInHandler(JsonHandler):
+    delay = NETWORK_DELAY
+
+    def respond(self, path, query):
+        if path == "/geocode":
+            return {"lat": 51.5, "lon": -0.12}
+        return {"main": {"temp": 14.2, "humidity": 71}, "weather": [{"description": query["q"][0]}]}
+
+
+class UrllibTransport:
+    def get_json(self, url, params=None):
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return json.loads(response.read())
+
+
+class StandInGeocoder:
+    def __init__(self, base):
+        self.base = base
+        self.transport = UrllibTransport()
+
+    def geocode(self, city):
+        data = self.transport.get_json(f"{self.base}/geocode", {"q": city})
+        return data["lat"], data["lon"]
+
+
+def slow_timezone(lat, lon):
+    # Stands in for building a TimezoneFinder and querying it
+    time.sleep(TIMEZONE_DELAY)
+    return "UTC"
+
+
+def utc_time(timezone_str):
+    return datetime.now(timezone.utc).strftime("%H:%M:%S")
+
+
+def bench_blocking(base):
+    # The old get_weather: every stage inline in the button callback
+    transport = UrllibTransport()
+    geocoder = StandInGeocoder(base)
+    blocked = 0.0
+    for _ in range(LOOKUPS):
+        start = time.perf_counter()
+        lat, lon = geocoder.geocode("London")
+        slow_timezone(lat, lon)
+        transport.get_json(f"{base}/weather", {"q": "London", "units": "metric"})
+        blocked += time.perf_counter() - start
+    return {"ui_blocked_s": round(blocked, 4), "ui_blocked_per_lookup_ms": round(blocked / LOOKUPS * 1000, 2)}
+
+
+def bench_service(base):
+    root = StubRoot()
+    resolver = GeoResolver(path=None, geocoder=StandInGeocoder(base), timezone_at=slow_timezone)
+    service = WeatherService(root, api_key="bench", transport=HttpClient(ttls={}), resolver=resolver,
+                             local_time=utc_time, url=f"{base}/weather")
+    results = []
+    errors = []
+    submit = 0.0
+    wall = time.perf_counter()
+    for _ in range(LOOKUPS):
+        start = time.perf_counter()
+        service.request("London", on_result=results.append, on_error=errors.append)
+        submit += time.perf_counter() - start
+        root.run_until(lambda: not service.busy)
+    wall = time.perf_counter() - wall
+
+    # A burst of cities where only the last one should be delivered
+    superseded = []
+    for city in ("Paris", "Berlin", "Madrid", "Rome"):
+        service.request(city, on_result=superseded.append)
+    root.run_until(lambda: not service.busy)
+    service.shutdown()
+
+    blocked = submit + root.busy
+    return {
+        "ui_blocked_s": round(blocked, 4),
+        "ui_blocked_per_lookup_ms": round(blocked / LOOKUPS * 1000, 2),
+        "wall_s": round(wall, 4),
+        "delivered": len(results),
+        "errors": len(errors),
+        "burst_delivered": [r["description"] for r in superseded],
+        "geo_cache": resolver.stats(),
+    }
+
+
+def bench():
+    with serve(StandInHandler) as base:
+        return {"blocking_callback": bench_blocking(base), "weather_service": bench_service(base)}
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench(), indent=2))
@@ -0,0 +1,327 @@
+import atexit
+import heapq
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stand-ins shared by the benchmarks, so they run on Linux without Windows backends or a display
+CONTROL_SCREEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "control_screen")
+sys.path.insert(0, CONTROL_SCREEN)
+
+from actuator import VolumeBackend
+from audio_session import AudioSession, FakeAudioBackend
+from capture import SyntheticSource
+from controller import THEMES, Controller, FakeSystem
+from displays import DisplayManager, FakeDisplays
+
+
+# Tk stand-ins
+class Event:
+    def __init__(self, widget):
+        self.widget = widget
+
+
+class StubRoot:
+    """Just enough of Tk's timer and binding API to drive the panels' background services.
+
+    Counts wakeups and the time spent in callbacks, which is what the Tk
+    thread would have paid.
+    """
+
+    def __init__(self):
+        self.timers = []
+        self.seq = 0
+        self.wakeups = 0
+        self.busy = 0.0
+        self.bindings = {}
+        self.iconic = False
+
+    def after(self, ms, callback):
+        self.seq += 1
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self.seq, callback))
+        return self.seq
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, after_id):
+        self.timers = [t for t in self.timers if t[1] != after_id]
+        heapq.heapify(self.timers)
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings.setdefault(sequence, []).append(callback)
+
+    def state(self):
+        return "iconic" if self.iconic else "normal"
+
+    def fire(self, sequence):
+        for callback in self.bindings.get(sequence, []):
+            callback(Event(self))
+
+    def step(self):
+        if self.timers and self.timers[0][0] <= time.perf_counter():
+            callback = heapq.heappop(self.timers)[2]
+            started = time.perf_counter()
+            callback()
+            self.busy += time.perf_counter() - started
+            self.wakeups += 1
+            return True
+        return False
+
+    def run_for(self, seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if not self.step():
+                time.sleep(0.001)
+
+    def run_until(self, done, timeout=60):
+        deadline = time.perf_counter() + timeout
+        while not done() and time.perf_counter() < deadline:
+            if not self.step():
+                time.sleep(0.001)
+
+
+class StubNotebook(StubRoot):
+    def __init__(self, selected):
+        super().__init__()
+        self.selected = selected
+
+    def select(self, tab=None):
+        if tab is None:
+            return self.selected
+        self.selected = tab
+        self.fire("<<NotebookTabChanged>>")
+
+
+def ensure_display():
+    """True if Tk can open a window, starting a private Xvfb when there is no display."""
+    if os.environ.get("DISPLAY"):
+        return True
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return False
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.perf_counter() + 5
+        while time.perf_counter() < deadline and process.poll() is None:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                atexit.register(process.terminate)
+                return True
+            time.sleep(0.05)
+        process.kill()
+    return False
+
+
+# Backends
+Memory = namedtuple("Memory", "percent")
+Battery = namedtuple("Battery", "percent power_plugged")
+DiskIO = namedtuple("DiskIO", "read_bytes write_bytes")
+NetIO = namedtuple("NetIO", "bytes_sent bytes_recv")
+ProcessMemory = namedtuple("ProcessMemory", "rss vms")
+ProcessIO = namedtuple("ProcessIO", "read_bytes write_bytes")
+
+
+class NoSuchProcess(Exception):
+    pass
+
+
+class FakeProcess:
+    """A process whose CPU, memory and I/O random-walk every time it is sampled."""
+
+    def __init__(self, pid, rng):
+        self.pid = pid
+        self.alive = True
+        self.info = {}
+        self._rng = rng
+        self._name = f"{rng.choice(WORDS)}{pid % 100}.exe"
+        # Most processes idle, a few are busy
+        self._cpu = rng.expovariate(1.0) if rng.random() < 0.9 else rng.uniform(10, 80)
+        self._rss = int(rng.lognormvariate(17, 1.2))
+        self._io = [0, 0]
+
+    def _step(self):
+        rng = self._rng
+        self._cpu = max(self._cpu + rng.uniform(-1, 1) * max(self._cpu, 0.5) * 0.3, 0.0)
+        self._rss = max(self._rss + int(rng.uniform(-0.02, 0.02) * self._rss), 4096)
+        self._io[0] += int(rng.expovariate(1 / 4096))
+        self._io[1] += int(rng.expovariate(1 / 1024))
+
+    def _check(self):
+        if not self.alive:
+            raise NoSuchProcess(self.pid)
+
+    def name(self):
+        self._check()
+        return self._name
+
+    def cpu_percent(self, interval=None):
+        self._check()
+        return round(self._cpu, 1)
+
+    def memory_info(self):
+        self._check()
+        return ProcessMemory(self._rss, self._rss * 2)
+
+    def io_counters(self):
+        self._check()
+        return ProcessIO(*self._io)
+
+    def as_dict(self, attrs, ad_value=None):
+        return {attr: self.pid if attr == "pid" else getattr(self, attr)() for attr in attrs}
+
+
+class FakePsutil:
+    """The parts of psutil MetricsSampler reads, random-walking from a fixed seed.
+
+    latency is added to every call, like a slow sensor or a busy host.
+    process_iter walks a population of fake processes, replacing a churn
+    fraction of them with new pids on every walk.
+    """
+
+    NoSuchProcess = NoSuchProcess
+
+    def __init__(self, cores=8, battery=True, latency=0.0, seed=42, processes=200, churn=0.01):
+        self.cores = cores
+        self.battery = battery
+        self.latency = latency
+        self.churn = churn
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._cpu = [20.0] * cores
+        self._io = [0, 0, 0, 0]
+        self._next_pid = 100
+        self._processes = [self._spawn() for _ in range(processes)]
+
+    def _spawn(self):
+        self._next_pid += self._rng.randint(1, 8)
+        return FakeProcess(self._next_pid, self._rng)
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _walk(self, value, spread=5.0):
+        return min(max(value + self._rng.uniform(-spread, spread), 0.0), 100.0)
+
+    def cpu_count(self):
+        return self.cores
+
+    def cpu_percent(self, interval=None, percpu=False):
+        self._call()
+        self._cpu = [self._walk(value) for value in self._cpu]
+        return list(self._cpu) if percpu else sum(self._cpu) / self.cores
+
+    def virtual_memory(self):
+        self._call()
+        return Memory(self._walk(55.0, 2.0))
+
+    def swap_memory(self):
+        self._call()
+        return Memory(self._walk(10.0, 1.0))
+
+    def sensors_battery(self):
+        self._call()
+        return Battery(self._walk(80.0, 1.0), True) if self.battery else None
+
+    def disk_io_counters(self):
+        self._call()
+        self._io[0] += self._rng.randint(0, 2 ** 20)
+        self._io[1] += self._rng.randint(0, 2 ** 20)
+        return DiskIO(self._io[0], self._io[1])
+
+    def net_io_counters(self):
+        self._call()
+        self._io[2] += self._rng.randint(0, 2 ** 16)
+        self._io[3] += self._rng.randint(0, 2 ** 18)
+        return NetIO(self._io[2], self._io[3])
+
+    def process_iter(self, attrs=None, ad_value=None):
+        self._call()
+        for i in range(int(len(self._processes) * self.churn)):
+            index = self._rng.randrange(len(self._processes))
+            self._processes[index].alive = False
+            self._processes[index] = self._spawn()
+        for process in list(self._processes):
+            process._step()
+            if attrs is not None:
+                process.info = process.as_dict(attrs, ad_value)
+            yield process
+
+
+def fake_controller(latency=0.002, displays=None, themes=THEMES, max_rate=20):
+    """A Controller on fake display, audio, system and screenshot backends.
+
+    displays is a list of (name, level, latency), one display at latency by default.
+    """
+    displays = DisplayManager(FakeDisplays(displays or [("Built-in", 50, latency)]), max_rate=max_rate)
+    return Controller(displays=displays,
+                      volume=VolumeBackend(AudioSession(FakeAudioBackend(0.5, latency=latency))),
+                      system=FakeSystem(), source=SyntheticSource(), themes=themes, max_rate=max_rate)
+
+
+def control_address():
+    # A fresh socket per run so a panel never attaches to a real daemon
+    return os.path.join(tempfile.mkdtemp(), "bench.sock")
+
+
+WORDS = "market storm election launch team record study city court energy report health".split()
+
+
+def synthetic_articles(count, start=0, seed=42):
+    rng = random.Random(seed)
+    return [{
+        "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))).capitalize(),
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 80))),
+        "url": f"https://example.com/news/{i}",
+    } for i in range(start, start + count)]
+
+
+# Fixture HTTP server
+class JsonHandler(BaseHTTPRequestHandler):
+    """Answers GETs with respond(path, query) as JSON, after an optional delay."""
+
+    delay = 0.0
+
+    def respond(self, path, query):
+        raise NotImplementedError
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        parsed = urllib.parse.urlparse(self.path)
+        payload = json.dumps(self.respond(parsed.path, urllib.parse.parse_qs(parsed.query))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve(handler):
+    """Run a handler class on a loopback port for the duration of the block, yielding its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,1003 @@
+import math
+import re
+import runpy
+import sys
+import tkinter
+from collections import Counter
+
+# Tk's commands as Python commands in a plain Tcl interpreter, for running the display benchmarks where there
+# is no X server and no Xvfb. tkinter, ttk, variables, after and update are the real ones; only what Tk does
+# underneath (creating, laying out and drawing windows) is replaced by bookkeeping, with sizes estimated from
+# fonts, text and the pack/grid options. Timings taken on it are the Python and Tcl side of the work, not
+# rendering, and calls counts every Tk command the code under test made.
+
+calls = Counter()
+
+DEFAULT_FONT = ("sans-serif", 10, "normal")
+ROOT_SIZE = (200, 200)
+TAB_HEIGHT = 26
+CANVAS_SIZE = (378, 265)
+# Options that change a widget's requested size, configuring anything else needs no new layout
+GEOMETRY_OPTIONS = {"-text", "-textvariable", "-font", "-width", "-height", "-wraplength", "-padding", "-image",
+                    "-style", "-columns", "-orient", "-compound"}
+# Event type numbers as Tk reports them in %T
+CONFIGURE, DESTROY, VIRTUAL = "22", "17", "35"
+
+
+def install():
+    """Make tkinter.Tk create a StubTk."""
+    tkinter.Tk = StubTk
+
+
+def installed():
+    return tkinter.Tk is StubTk
+
+
+def total_calls():
+    return sum(calls.values())
+
+
+def _number(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _pad(tk, value):
+    # "10" or "10 20" -> the sum of both sides
+    parts = tk.splitlist(value) if value not in (None, "") else ()
+    if not parts:
+        return 0
+    if len(parts) == 1:
+        return 2 * int(_number(parts[0]))
+    return int(_number(parts[0]) + _number(parts[1]))
+
+
+class _Widget:
+    def __init__(self, stub, kind, path, options):
+        self.stub = stub
+        self.kind = kind
+        self.path = path
+        self.options = options
+        self.children = []
+        self.manager = None
+        self.layout = {}
+        self.size = (1, 1)
+        parent = path.rsplit(".", 1)[0] or "."
+        self.parent = stub.widgets.get(parent) if path != "." else None
+        if self.parent is not None:
+            self.parent.children.append(self)
+
+    @property
+    def widget_class(self):
+        name = self.kind.split("::")[-1].capitalize()
+        return "T" + name if self.kind.startswith("ttk::") and name != "Treeview" else name
+
+    def command(self, sub, *args):
+        handler = getattr(self, "do_" + sub, None)
+        if handler is None:
+            return ""
+        return handler(*args)
+
+    def do_configure(self, *args):
+        if not args:
+            return ()
+        if len(args) == 1:
+            value = self.options.get(args[0], "")
+            return (args[0], args[0][1:], args[0][1:].capitalize(), "", value)
+        self.options.update(zip(args[::2], args[1::2]))
+        if not GEOMETRY_OPTIONS.isdisjoint(args[::2]):
+            self.stub.dirty()
+        return ""
+
+    do_config = do_configure
+
+    def do_cget(self, option):
+        return self.options.get(option, "")
+
+    def do_state(self, *args):
+        return ""
+
+    def do_instate(self, *args):
+        return 0
+
+    def font(self):
+        return self.stub.font_of(self.options.get("-font"))
+
+    def text(self):
+        variable = self.options.get("-textvariable")
+        if variable:
+            try:
+                return str(self.stub.tk.globalgetvar(variable))
+            except tkinter.TclError:
+                return ""
+        return str(self.options.get("-text", ""))
+
+    def requested(self):
+        if self.kind in ("frame", "ttk::frame", "toplevel", "labelframe", "ttk::labelframe"):
+            width, height = self.stub.arranged(self)
+            return (max(width, int(_number(self.options.get("-width")))),
+                    max(height, int(_number(self.options.get("-height")))))
+        if self.kind in ("label", "ttk::label", "button", "ttk::button", "ttk::checkbutton", "checkbutton",
+                         "ttk::radiobutton", "radiobutton"):
+            return self.text_size()
+        if self.kind in ("entry", "ttk::entry", "ttk::combobox"):
+            char, line = self.font()
+            return int(_number(self.options.get("-width"), 20) * char) + 6, line + 6
+        if self.kind in ("scale", "ttk::scale", "ttk::progressbar"):
+            return (100, 15) if self.options.get("-orient", "horizontal") == "horizontal" else (15, 100)
+        if self.kind in ("scrollbar", "ttk::scrollbar"):
+            return (12, 12)
+        return (1, 1)
+
+    def text_size(self):
+        char, line = self.font()
+        text = self.text()
+        wrap = _number(self.options.get("-wraplength"))
+        chars = _number(self.options.get("-width"))
+        width = lines = 0
+        for part in text.split("\n") or [""]:
+            pixels = len(part) * char
+            if wrap > 0 and pixels > wrap:
+                lines += math.ceil(pixels / wrap)
+                pixels = wrap
+            else:
+                lines += 1
+            width = max(width, pixels)
+        if chars > 0:
+            width = chars * char
+        border = 8 if "button" in self.kind else 2
+        return int(width) + 2 * border, max(lines, 1) * line + 2 * border
+
+
+class _Canvas(_Widget):
+    def __init__(self, stub, kind, path, options):
+        super().__init__(stub, kind, path, options)
+        self.items = {}
+        self.ids = 0
+        self.top = 0.0
+
+    def requested(self):
+        return (int(_number(self.options.get("-width"), CANVAS_SIZE[0])),
+                int(_number(self.options.get("-height"), CANVAS_SIZE[1])))
+
+    def find(self, tag):
+        if tag == "all":
+            return list(self.items)
+        try:
+            number = int(tag)
+        except ValueError:
+            return [item for item, data in self.items.items() if tag in data["tags"]]
+        return [number] if number in self.items else []
+
+    def do_create(self, kind, *args):
+        coords, index = [], 0
+        while index < len(args):
+            try:
+                coords.extend(float(value) for value in self.stub.tk.splitlist(args[index]))
+            except ValueError:
+                break
+            index += 1
+        options = dict(zip(args[index::2], args[index + 1::2]))
+        self.ids += 1
+        tags = set(self.stub.tk.splitlist(options.get("-tags", "")))
+        self.items[self.ids] = {"type": kind, "coords": coords, "options": options, "tags": tags}
+        if kind == "window":
+            self.stub.dirty()
+        return self.ids
+
+    def do_coords(self, tag, *args):
+        items = self.find(tag)
+        if not args:
+            return tuple(self.items[items[0]]["coords"]) if items else ()
+        coords = [float(value) for arg in args for value in self.stub.tk.splitlist(arg)]
+        for item in items:
+            self.items[item]["coords"] = coords
+        return ""
+
+    def do_itemconfigure(self, tag, *args):
+        items = self.find(tag)
+        if not args:
+            return ()
+        for item in items:
+            self.items[item]["options"].update(zip(args[::2], args[1::2]))
+            if self.items[item]["type"] == "window":
+                self.stub.dirty()
+        return ""
+
+    do_itemconfig = do_itemconfigure
+
+    def do_itemcget(self, tag, option):
+        items = self.find(tag)
+        return self.items[items[0]]["options"].get(option, "") if items else ""
+
+    def do_delete(self, *tags):
+        for tag in tags:
+            for item in self.find(tag):
+                del self.items[item]
+        return ""
+
+    def do_find(self, how, *args):
+        if how == "withtag":
+            return tuple(self.find(args[0]))
+        return tuple(self.items)
+
+    def do_type(self, tag):
+        items = self.find(tag)
+        return self.items[items[0]]["type"] if items else ""
+
+    def do_move(self, tag, dx, dy):
+        for item in self.find(tag):
+            coords = self.items[item]["coords"]
+            self.items[item]["coords"] = [value + (float(dx) if i % 2 == 0 else float(dy))
+                                          for i, value in enumerate(coords)]
+        return ""
+
+    def do_bbox(self, *tags):
+        boxes = [self.item_box(item) for tag in tags for item in self.find(tag)
+                 if self.items[item]["options"].get("-state") != "hidden"]
+        boxes = [box for box in boxes if box is not None]
+        if not boxes:
+            return ""
+        return (int(min(box[0] for box in boxes)), int(min(box[1] for box in boxes)),
+                int(max(box[2] for box in boxes)), int(max(box[3] for box in boxes)))
+
+    def item_box(self, item):
+        data = self.items[item]
+        coords = data["coords"]
+        if len(coords) < 2:
+            return None
+        if data["type"] == "window":
+            width, height = self.window_size(data)
+            return coords[0], coords[1], coords[0] + width, coords[1] + height
+        if data["type"] == "text":
+            char, line = self.stub.font_of(data["options"].get("-font"))
+            text = str(data["options"].get("-text", ""))
+            return coords[0], coords[1], coords[0] + len(text) * char, coords[1] + line
+        xs, ys = coords[::2], coords[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def window_size(self, data):
+        window = self.stub.widgets.get(data["options"].get("-window"))
+        if window is None:
+            return 0, 0
+        width, height = self.stub.requested(window)
+        return (int(_number(data["options"].get("-width"), width)),
+                int(_number(data["options"].get("-height"), height)))
+
+    def region(self):
+        region = self.stub.tk.splitlist(self.options.get("-scrollregion", ""))
+        if len(region) == 4:
+            return [float(value) for value in region]
+        return [0.0, 0.0, float(self.size[0]), float(self.size[1])]
+
+    def view(self):
+        _, y1, _, y2 = self.region()
+        total = max(y2 - y1, 1.0)
+        return (max(0.0, (self.top - y1) / total), min(1.0, (self.top + self.size[1] - y1) / total))
+
+    def scroll_to(self, top):
+        _, y1, _, y2 = self.region()
+        self.top = max(y1, min(top, y2 - self.size[1]))
+        command = self.options.get("-yscrollcommand")
+        if command:
+            first, last = self.view()
+            self.stub.tk.eval(f"{command} {first} {last}")
+
+    def do_yview(self, *args):
+        if not args:
+            return self.view()
+        _, y1, _, y2 = self.region()
+        if args[0] == "moveto":
+            self.scroll_to(y1 + float(args[1]) * (y2 - y1))
+        elif args[0] == "scroll":
+            step = _number(self.options.get("-yscrollincrement")) or self.size[1] / 10
+            if args[2].startswith("page"):
+                step = self.size[1] * 0.9
+            self.scroll_to(self.top + int(args[1]) * step)
+        return ""
+
+    def do_xview(self, *args):
+        return (0.0, 1.0) if not args else ""
+
+    def do_canvasy(self, y, *args):
+        return self.top + float(y)
+
+    def do_canvasx(self, x, *args):
+        return float(x)
+
+    def do_configure(self, *args):
+        result = super().do_configure(*args)
+        if "-scrollregion" in args[::2]:
+            self.scroll_to(self.top)
+        return result
+
+    do_config = do_configure
+
+
+class _Notebook(_Widget):
+    def __init__(self, stub, kind, path, options):
+        super().__init__(stub, kind, path, options)
+        self.tabs = []
+        self.current = ""
+
+    def requested(self):
+        sizes = [self.stub.requested(self.stub.widgets[tab]) for tab in self.tabs]
+        return (max((width for width, _ in sizes), default=0),
+                max((height for _, height in sizes), default=0) + TAB_HEIGHT)
+
+    def tab(self, tab_id):
+        if tab_id in ("current", ""):
+            return self.current
+        if tab_id == "end":
+            return len(self.tabs)
+        try:
+            return self.tabs[int(tab_id)]
+        except ValueError:
+            return tab_id
+
+    def do_add(self, child, *options):
+        if child not in self.tabs:
+            self.tabs.append(child)
+            widget = self.stub.widgets[child]
+            self.stub.forget(widget)
+            widget.manager = "notebook"
+        if not self.current:
+            self.do_select(child)
+        return ""
+
+    def do_tabs(self):
+        return tuple(self.tabs)
+
+    def do_select(self, *args):
+        if not args:
+            return self.current
+        tab = self.tab(args[0])
+        if tab != self.current:
+            self.current = tab
+            self.stub.dirty()
+            self.stub.queue(self.path, "<<NotebookTabChanged>>")
+        return ""
+
+    def do_index(self, tab_id):
+        if tab_id == "end":
+            return len(self.tabs)
+        tab = self.tab(tab_id)
+        return self.tabs.index(tab) if tab in self.tabs else -1
+
+    def do_tab(self, tab_id, *args):
+        return "" if len(args) != 1 else ""
+
+    def do_forget(self, tab_id):
+        tab = self.tab(tab_id)
+        if tab in self.tabs:
+            self.tabs.remove(tab)
+            self.stub.widgets[tab].manager = None
+            if self.current == tab:
+                self.current = self.tabs[0] if self.tabs else ""
+        return ""
+
+
+class _Treeview(_Widget):
+    def __init__(self, stub, kind, path, options):
+        super().__init__(stub, kind, path, options)
+        self.items = {"": {"children": [], "options": {}, "parent": None}}
+        self.ids = 0
+        self.columns = {}
+
+    def requested(self):
+        columns = self.stub.tk.splitlist(self.options.get("-columns", ""))
+        width = sum(int(_number(self.columns.get(column, {}).get("-width"), 200)) for column in columns)
+        return width or 200, int(_number(self.options.get("-height"), 10)) * 20 + 24
+
+    def do_insert(self, parent, index, *args):
+        options = dict(zip(args[::2], args[1::2]))
+        iid = options.pop("-id", None)
+        if iid is None:
+            self.ids += 1
+            iid = f"I{self.ids:03X}"
+        self.items[iid] = {"children": [], "options": options, "parent": parent}
+        siblings = self.items[parent]["children"]
+        siblings.insert(len(siblings) if index == "end" else int(index), iid)
+        return iid
+
+    def do_item(self, iid, *args):
+        options = self.items[iid]["options"]
+        if not args:
+            return tuple(value for pair in options.items() for value in pair)
+        if len(args) == 1:
+            return options.get(args[0], "")
+        options.update(zip(args[::2], args[1::2]))
+        return ""
+
+    def do_move(self, iid, parent, index):
+        self.items[self.items[iid]["parent"]]["children"].remove(iid)
+        self.items[iid]["parent"] = parent
+        siblings = self.items[parent]["children"]
+        siblings.insert(len(siblings) if index == "end" else int(index), iid)
+        return ""
+
+    def do_delete(self, *args):
+        for iid in [iid for arg in args for iid in self.stub.tk.splitlist(arg)]:
+            if iid in self.items:
+                self.remove(iid)
+        return ""
+
+    def remove(self, iid):
+        item = self.items.pop(iid)
+        for child in item["children"]:
+            self.remove(child)
+        parent = self.items.get(item["parent"])
+        if parent is not None and iid in parent["children"]:
+            parent["children"].remove(iid)
+
+    def do_children(self, iid, *args):
+        return tuple(self.items[iid]["children"])
+
+    def do_exists(self, iid):
+        return int(iid in self.items)
+
+    def do_heading(self, column, *args):
+        return ""
+
+    def do_column(self, column, *args):
+        options = self.columns.setdefault(column, {})
+        if len(args) == 1:
+            return options.get(args[0], "")
+        options.update(zip(args[::2], args[1::2]))
+        return ""
+
+    def do_selection(self, *args):
+        return ()
+
+
+class _Scale(_Widget):
+    def value(self):
+        variable = self.options.get("-variable")
+        if variable:
+            try:
+                return float(self.stub.tk.globalgetvar(variable))
+            except (tkinter.TclError, ValueError):
+                return 0.0
+        return float(self.options.get("-value", 0.0))
+
+    def do_get(self, *args):
+        return self.value()
+
+    def do_set(self, value):
+        low, high = float(self.options.get("-from", 0)), float(self.options.get("-to", 100))
+        value = min(max(float(value), min(low, high)), max(low, high))
+        self.options["-value"] = value
+        variable = self.options.get("-variable")
+        if variable:
+            self.stub.tk.globalsetvar(variable, value)
+        command = self.options.get("-command")
+        if command:
+            self.stub.tk.eval(f"{command} {value}")
+        return ""
+
+
+class _Entry(_Widget):
+    def text_value(self):
+        variable = self.options.get("-textvariable")
+        if variable:
+            return str(self.stub.tk.globalgetvar(variable))
+        return self.options.get("text", "")
+
+    def do_get(self):
+        return self.text_value()
+
+    def do_insert(self, index, text):
+        current = self.text_value()
+        at = len(current) if index == "end" else int(index)
+        self.set_text(current[:at] + text + current[at:])
+        return ""
+
+    def do_delete(self, first, last=None):
+        current = self.text_value()
+        start = len(current) if first == "end" else int(first)
+        end = start + 1 if last is None else (len(current) if last == "end" else int(last))
+        self.set_text(current[:start] + current[end:])
+        return ""
+
+    def do_set(self, text):
+        self.set_text(text)
+        return ""
+
+    def set_text(self, text):
+        variable = self.options.get("-textvariable")
+        if variable:
+            self.stub.tk.globalsetvar(variable, text)
+        else:
+            self.options["text"] = text
+
+
+class _Scrollbar(_Widget):
+    def do_set(self, first, last):
+        self.options["view"] = (float(first), float(last))
+        return ""
+
+    def do_get(self):
+        return self.options.get("view", (0.0, 1.0))
+
+
+KINDS = {
+    "canvas": _Canvas, "ttk::notebook": _Notebook, "ttk::treeview": _Treeview, "ttk::scale": _Scale,
+    "scale": _Scale, "entry": _Entry, "ttk::entry": _Entry, "ttk::combobox": _Entry,
+    "scrollbar": _Scrollbar, "ttk::scrollbar": _Scrollbar,
+}
+WIDGETS = ["frame", "toplevel", "label", "labelframe", "button", "checkbutton", "radiobutton", "menu", "text",
+           "listbox", "message", "spinbox", "panedwindow"] + [
+    "ttk::" + name for name in ("frame", "labelframe", "label", "button", "checkbutton", "radiobutton",
+                                "progressbar", "separator", "sizegrip", "spinbox", "panedwindow", "menubutton")
+] + list(KINDS)
+
+
+class _Stub:
+    """The Tk commands of one interpreter."""
+
+    def __init__(self, tk):
+        self.tk = tk
+        self.widgets = {}
+        self.bindings = {}
+        self.fonts = {"TkDefaultFont": DEFAULT_FONT, "TkTextFont": DEFAULT_FONT, "TkHeadingFont": DEFAULT_FONT,
+                      "TkFixedFont": ("monospace", 10, "normal"), "TkMenuFont": DEFAULT_FONT}
+        self.styles = {}
+        self.geometry = ROOT_SIZE
+        self.events = []
+        self.protocols = {}
+        self._dirty = True
+        self._requested = {}
+        self._sizes = {}
+        self._parcels = {}
+
+        tk.eval("namespace eval ttk { variable currentTheme default }; namespace eval ttk::notebook {}")
+        tk.eval("rename update _tcl_update")
+        for kind in WIDGETS:
+            self.register(kind, lambda path, *args, kind=kind: self.create(kind, path, *args))
+        for name in ("pack", "grid", "place", "winfo", "wm", "bind", "bindtags", "event", "destroy", "focus",
+                     "font", "tk", "update", "grab", "option", "image", "raise", "lower", "tk_popup", "clipboard",
+                     "ttk::style", "ttk::setTheme", "ttk::notebook::enableTraversal"):
+            handler = getattr(self, "cmd_" + name.replace("ttk::", "ttk_").replace("::", "_"), None)
+            self.register(name, handler or (lambda *args: ""))
+        self.widgets["."] = root = _Widget(self, "toplevel", ".", {})
+        root.manager = "wm"
+        self.tk.createcommand(".", lambda sub, *args: self.widget_command(root, sub, *args))
+
+    def register(self, name, handler):
+        def run(*args):
+            calls[name] += 1
+            return handler(*args)
+        self.tk.createcommand(name, run)
+
+    # Widgets
+    def create(self, kind, path, *args):
+        widget = KINDS.get(kind, _Widget)(self, kind, path, dict(zip(args[::2], args[1::2])))
+        self.widgets[path] = widget
+        self.tk.createcommand(path, lambda sub, *args: self.widget_command(widget, sub, *args))
+        self.dirty()
+        return path
+
+    def widget_command(self, widget, sub, *args):
+        calls[f"{widget.kind} {sub}"] += 1
+        return widget.command(sub, *args)
+
+    def cmd_destroy(self, *paths):
+        for path in paths:
+            widget = self.widgets.get(path)
+            if widget is not None:
+                self.destroy(widget)
+        return ""
+
+    def destroy(self, widget):
+        for child in list(widget.children):
+            self.destroy(child)
+        self.fire(widget.path, "<Destroy>", type=DESTROY)
+        self.forget(widget)
+        if widget.parent is not None and widget in widget.parent.children:
+            widget.parent.children.remove(widget)
+        self.bindings.pop(widget.path, None)
+        if widget.path != ".":
+            del self.widgets[widget.path]
+            try:
+                self.tk.deletecommand(widget.path)
+            except tkinter.TclError:
+                pass
+        else:
+            # The app is gone, its timers would only fire into deleted commands from the next root's update
+            self.tk.eval("foreach id [after info] { after cancel $id }")
+        self.dirty()
+
+    # Geometry
+    def dirty(self):
+        self._dirty = True
+        self._requested = {}
+
+    def forget(self, widget):
+        if widget.manager == "notebook" and widget.parent is not None:
+            if widget.path in widget.parent.tabs:
+                widget.parent.tabs.remove(widget.path)
+        widget.manager = None
+        widget.layout = {}
+
+    def manage(self, manager, args):
+        if args and args[0] in ("configure", "forget", "remove", "info", "slaves", "propagate", "rowconfigure",
+                                "columnconfigure", "size", "bbox", "location", "anchor"):
+            sub, args = args[0], args[1:]
+        else:
+            sub = "configure"
+        if sub == "configure":
+            paths = [arg for arg in args if arg.startswith(".")]
+            options = dict(zip(args[len(paths)::2], args[len(paths) + 1::2]))
+            for path in paths:
+                widget = self.widgets[path]
+                if widget.manager != manager:
+                    self.forget(widget)
+                    widget.manager = manager
+                    widget.layout = {}
+                    # Packing order is the order widgets were (re)packed in
+                    if widget.parent is not None:
+                        widget.parent.children.remove(widget)
+                        widget.parent.children.append(widget)
+                widget.layout.update(options)
+            self.dirty()
+        elif sub in ("forget", "remove"):
+            for path in args:
+                self.forget(self.widgets[path])
+            self.dirty()
+        elif sub == "info":
+            widget = self.widgets[args[0]]
+            return tuple(value for pair in widget.layout.items() for value in pair)
+        elif sub == "slaves":
+            return tuple(child.path for child in self.widgets[args[0]].children if child.manager == manager)
+        return ""
+
+    def cmd_pack(self, *args):
+        return self.manage("pack", args)
+
+    def cmd_grid(self, *args):
+        return self.manage("grid", args)
+
+    def cmd_place(self, *args):
+        return self.manage("place", args)
+
+    def requested(self, widget):
+        size = self._requested.get(widget.path)
+        if size is None:
+            size = self._requested[widget.path] = widget.requested()
+        return size
+
+    def arranged(self, widget):
+        # What the packer or gridder asks for to hold widget's children
+        packed = [child for child in widget.children if child.manager == "pack"]
+        gridded = [child for child in widget.children if child.manager == "grid"]
+        width = height = across = down = 0
+        for child in packed:
+            child_width, child_height = self.requested(child)
+            child_width += _pad(self.tk, child.layout.get("-padx")) + _pad(self.tk, child.layout.get("-ipadx"))
+            child_height += _pad(self.tk, child.layout.get("-pady")) + _pad(self.tk, child.layout.get("-ipady"))
+            if child.layout.get("-side", "top") in ("top", "bottom"):
+                width = max(width, child_width + across)
+                down += child_height
+            else:
+                height = max(height, child_height + down)
+                across += child_width
+        width, height = max(width, across), max(height, down)
+        if gridded:
+            rows, columns = {}, {}
+            for child in gridded:
+                child_width, child_height = self.requested(child)
+                row, column = int(child.layout.get("-row", 0)), int(child.layout.get("-column", 0))
+                columns[column] = max(columns.get(column, 0),
+                                      child_width + _pad(self.tk, child.layout.get("-padx")))
+                rows[row] = max(rows.get(row, 0), child_height + _pad(self.tk, child.layout.get("-pady")))
+            width, height = max(width, sum(columns.values())), max(height, sum(rows.values()))
+        return width, height
+
+    def actual(self, widget):
+        # The size widget gets from its manager, None while it is not shown
+        size = self._sizes.get(widget.path)
+        if size is not None or widget.path in self._sizes:
+            return size
+        self._sizes[widget.path] = None
+        parent = widget.parent
+        if widget.path == ".":
+            size = self.geometry
+        elif widget.manager is None or parent is None or self.actual(parent) is None:
+            size = None
+        elif widget.manager == "notebook":
+            width, height = self.actual(parent)
+            size = (width, max(height - TAB_HEIGHT, 1)) if parent.current == widget.path else None
+        else:
+            width, height = self.requested(widget)
+            parent_width, parent_height = self.actual(parent)
+            layout = widget.layout
+            if widget.manager == "pack":
+                parcel_width, parcel_height = self.parcels(parent)[widget.path]
+                fill = layout.get("-fill", "none")
+                padx, pady = _pad(self.tk, layout.get("-padx")), _pad(self.tk, layout.get("-pady"))
+                width = parcel_width - padx if fill in ("x", "both") else min(width, parcel_width - padx)
+                height = parcel_height - pady if fill in ("y", "both") else min(height, parcel_height - pady)
+            elif widget.manager == "place":
+                width = int(_number(layout.get("-width"), width) + _number(layout.get("-relwidth")) * parent_width)
+                height = int(_number(layout.get("-height"), height) +
+                             _number(layout.get("-relheight")) * parent_height)
+            size = (max(int(width), 1), max(int(height), 1))
+        self._sizes[widget.path] = size
+        return size
+
+    def parcels(self, parent):
+        # Tk's packer: in packing order each child takes a strip off one side of the space that is left,
+        # as deep as it asks for plus a share of the slack if it expands, as long as the space left
+        parcels = self._parcels.get(parent.path)
+        if parcels is not None:
+            return parcels
+        parcels = self._parcels[parent.path] = {}
+        packed = [child for child in parent.children if child.manager == "pack"]
+        left_width, left_height = self.actual(parent)
+        for index, child in enumerate(packed):
+            vertical = child.layout.get("-side", "top") in ("top", "bottom")
+            rest = [other for other in packed[index:] if
+                    (other.layout.get("-side", "top") in ("top", "bottom")) == vertical]
+            want = self.packed_depth(child, vertical)
+            if child.layout.get("-expand", "0") in ("1", "true", "yes"):
+                expanding = [other for other in rest if other.layout.get("-expand", "0") in ("1", "true", "yes")]
+                slack = (left_height if vertical else left_width) - sum(self.packed_depth(other, vertical)
+                                                                       for other in rest)
+                want += max(slack, 0) // len(expanding)
+            if vertical:
+                depth = max(min(want, left_height), 0)
+                parcels[child.path] = (left_width, depth)
+                left_height -= depth
+            else:
+                depth = max(min(want, left_width), 0)
+                parcels[child.path] = (depth, left_height)
+                left_width -= depth
+        return parcels
+
+    def packed_depth(self, child, vertical):
+        width, height = self.requested(child)
+        if vertical:
+            return height + _pad(self.tk, child.layout.get("-pady")) + _pad(self.tk, child.layout.get("-ipady"))
+        return width + _pad(self.tk, child.layout.get("-padx")) + _pad(self.tk, child.layout.get("-ipadx"))
+
+    def layout_pass(self):
+        # Tk's idle-time geometry pass: new sizes, then <Configure> to whoever binds it and changed size
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._sizes = {}
+        self._parcels = {}
+        for widget in list(self.widgets.values()):
+            size = self.actual(widget)
+            if size is not None and size != widget.size:
+                widget.size = size
+                if "<Configure>" in self.bindings.get(widget.path, {}):
+                    self.fire(widget.path, "<Configure>", type=CONFIGURE, w=size[0], h=size[1])
+        for widget in self.widgets.values():
+            for item in getattr(widget, "items", {}).values():
+                # Windows on a canvas take the size of their item
+                if isinstance(item, dict) and item.get("type") == "window":
+                    window = self.widgets.get(item["options"].get("-window"))
+                    if window is not None:
+                        size = widget.window_size(item)
+                        if size != window.size:
+                            window.size = size
+                            if "<Configure>" in self.bindings.get(window.path, {}):
+                                self.fire(window.path, "<Configure>", type=CONFIGURE, w=size[0], h=size[1])
+
+    def cmd_update(self, *args):
+        self.deliver()
+        self.layout_pass()
+        self.tk.call("_tcl_update", *args)
+        self.deliver()
+        self.layout_pass()
+        return ""
+
+    def cmd_winfo(self, sub, *args):
+        if sub in ("screenwidth", "screenheight"):
+            return 1920 if sub == "screenwidth" else 1080
+        if sub in ("pointerx", "pointery"):
+            return 0
+        widget = self.widgets.get(args[0]) if args else None
+        if sub == "exists":
+            return int(widget is not None)
+        if widget is None:
+            raise tkinter.TclError(f'bad window path name "{args[0] if args else ""}"')
+        if sub == "children":
+            return tuple(child.path for child in widget.children)
+        if sub in ("width", "height"):
+            return widget.size[0 if sub == "width" else 1]
+        if sub in ("reqwidth", "reqheight"):
+            return self.requested(widget)[0 if sub == "reqwidth" else 1]
+        if sub in ("ismapped", "viewable"):
+            self.layout_pass()
+            return int(self.actual(widget) is not None) if not self._dirty else 0
+        if sub == "class":
+            return widget.widget_class
+        if sub == "parent":
+            return widget.parent.path if widget.parent is not None else ""
+        if sub == "toplevel":
+            return "."
+        if sub == "name":
+            return widget.path.rsplit(".", 1)[-1]
+        if sub == "manager":
+            return widget.manager or ""
+        if sub in ("x", "y", "rootx", "rooty", "id"):
+            return 0
+        return ""
+
+    def cmd_wm(self, sub, window=".", *args):
+        if sub == "geometry":
+            if not args:
+                return f"{self.geometry[0]}x{self.geometry[1]}+0+0"
+            match = re.match(r"(\d+)x(\d+)", args[0])
+            if match:
+                self.geometry = (int(match.group(1)), int(match.group(2)))
+                self.dirty()
+        elif sub == "protocol":
+            if len(args) == 2:
+                self.protocols[args[0]] = args[1]
+            elif args:
+                return self.protocols.get(args[0], "")
+        elif sub == "state":
+            return "normal"
+        return ""
+
+    # Events
+    def cmd_bind(self, tag, sequence=None, script=None):
+        bound = self.bindings.setdefault(tag, {})
+        if sequence is None:
+            return tuple(bound)
+        if script is None:
+            return bound.get(sequence, "")
+        if script.startswith("+"):
+            bound[sequence] = bound.get(sequence, "") + "\n" + script[1:]
+        elif script:
+            bound[sequence] = script
+        else:
+            bound.pop(sequence, None)
+        return ""
+
+    def cmd_event(self, sub, *args):
+        if sub == "generate":
+            path, sequence = args[0], args[1]
+            options = dict(zip(args[2::2], args[3::2]))
+            if options.get("-when") in ("tail", "head", "mark"):
+                self.queue(path, sequence)
+            else:
+                self.fire(path, sequence, type=VIRTUAL)
+        return ""
+
+    def queue(self, path, sequence):
+        self.events.append((path, sequence))
+
+    def deliver(self):
+        while self.events:
+            path, sequence = self.events.pop(0)
+            if path in self.widgets:
+                self.fire(path, sequence, type=VIRTUAL)
+
+    def fire(self, path, sequence, **fields):
+        values = {"#": "0", "b": "0", "f": "0", "h": "0", "k": "0", "s": "0", "t": "0", "w": "0", "x": "0",
+                  "y": "0", "A": "??", "E": "0", "K": "??", "N": "0", "W": path, "T": "0", "X": "0", "Y": "0",
+                  "D": "0", "d": "??", "%": "%"}
+        values.update({{"type": "T", "w": "w", "h": "h"}[key]: str(value) for key, value in fields.items()})
+        for tag in dict.fromkeys((path, ".", "all")):
+            script = self.bindings.get(tag, {}).get(sequence)
+            if not script:
+                continue
+            script = re.sub(r"%(.)", lambda match: values.get(match.group(1), "??"), script)
+            # Tcl's own code for break is 3, which stops the remaining tags like Tk does
+            if self.tk.eval("catch {" + script + "}") == "3":
+                break
+
+    # Fonts and styles
+    def parse_font(self, spec):
+        if not spec:
+            return DEFAULT_FONT
+        if spec in self.fonts:
+            return self.fonts[spec]
+        parts = self.tk.splitlist(spec)
+        if parts and parts[0].startswith("-"):
+            options = dict(zip(parts[::2], parts[1::2]))
+            return (options.get("-family", DEFAULT_FONT[0]), int(_number(options.get("-size"), DEFAULT_FONT[1])),
+                    options.get("-weight", "normal"))
+        family = parts[0] if parts else DEFAULT_FONT[0]
+        size = int(_number(parts[1], DEFAULT_FONT[1])) if len(parts) > 1 else DEFAULT_FONT[1]
+        return family, size, "bold" if "bold" in parts[2:] else "normal"
+
+    def font_of(self, spec):
+        # Average character width and line height in pixels
+        _, size, weight = self.parse_font(spec)
+        pixels = -size if size < 0 else size * 4 / 3
+        return pixels * (0.55 if weight == "bold" else 0.5), int(round(pixels * 1.3))
+
+    def cmd_font(self, sub, *args):
+        if sub == "actual":
+            family, size, weight = self.parse_font(args[0])
+            return ("-family", family, "-size", size, "-weight", weight, "-slant", "roman", "-underline", 0,
+                    "-overstrike", 0)
+        if sub in ("create", "configure"):
+            name, options = args[0], dict(zip(args[1::2], args[2::2]))
+            family, size, weight = self.fonts.get(name, DEFAULT_FONT)
+            self.fonts[name] = (options.get("-family", family), int(_number(options.get("-size"), size)),
+                                options.get("-weight", weight))
+            return name
+        if sub == "delete":
+            for name in args:
+                self.fonts.pop(name, None)
+            return ""
+        if sub == "names":
+            return tuple(self.fonts)
+        if sub == "families":
+            return (DEFAULT_FONT[0],)
+        if sub == "measure":
+            text = args[-1]
+            char, _ = self.font_of(args[0])
+            return int(round(len(text) * char))
+        if sub == "metrics":
+            _, line = self.font_of(args[0])
+            metrics = {"-ascent": int(line * 0.8), "-descent": line - int(line * 0.8), "-linespace": line,
+                       "-fixed": 0}
+            options = [arg for arg in args[1:] if arg.startswith("-") and arg in metrics]
+            if len(options) == 1:
+                return metrics[options[0]]
+            return tuple(value for pair in metrics.items() for value in pair)
+        return ""
+
+    def cmd_ttk_style(self, sub, *args):
+        if sub in ("configure", "map"):
+            options = self.styles.setdefault((sub, args[0]), {})
+            if len(args) == 1:
+                return tuple(value for pair in options.items() for value in pair)
+            if len(args) == 2:
+                return options.get(args[1], "")
+            options.update(zip(args[1::2], args[2::2]))
+            return ""
+        if sub == "lookup":
+            return self.styles.get(("configure", args[0]), {}).get(args[1], "")
+        if sub == "theme":
+            if args and args[0] == "names":
+                return ("default", "clam", "alt", "classic")
+            if args and args[0] == "use" and len(args) > 1:
+                self.tk.eval(f"set ttk::currentTheme {args[1]}")
+            return ""
+        return ""
+
+    def cmd_ttk_setTheme(self, name):
+        self.tk.eval(f"set ttk::currentTheme {name}")
+        return ""
+
+    def cmd_tk(self, sub, *args):
+        if sub == "windowingsystem":
+            return "x11"
+        if sub == "scaling":
+            return 1.3333
+        return ""
+
+
+class StubTk(tkinter.Tk):
+    """A tkinter.Tk on a Tcl interpreter without Tk, see the top of this module."""
+
+    def __init__(self, screenName=None, baseName=None, className="Tk", useTk=True, sync=False, use=None):
+        super().__init__(screenName, baseName, className, useTk=False, sync=sync, use=use)
+        self.stub = _Stub(self.tk)
+        # What Tk.__init__ does once Tk is loaded
+        if tkinter._support_default_root and tkinter._default_root is None:
+            tkinter._default_root = self
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+
+def main():
+    # python stub_tk.py bench_news_view 5000: run a benchmark as a script on the stub
+    sys.modules.setdefault("stub_tk", sys.modules[__name__])
+    install()
+    name = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    runpy.run_module(name, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from fakes import ensure_display
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(HERE, "results")
+
+# Which way is better for a metric, by its leaf name or else the nearest parent that matches;
+# the first pattern that matches wins, anything else is informational
+DIRECTIONS = [
+    ("*wakeups*", "lower"),
+    ("*_per_s", "higher"),
+    ("*_ms", "lower"), ("*_ms_*", "lower"), ("*_us", "lower"), ("*_ns", "lower"), ("*_s", "lower"),
+    ("*kb*", "lower"), ("*_mb*", "lower"), ("*bytes*", "lower"), ("*cpu_pct*", "lower"),
+    ("*calls*", "lower"), ("*widgets*", "lower"), ("*writes*", "lower"),
+]
+
+CHILD = """
+import json, sys
+sys.path.insert(0, {here!r})
+import stub_tk
+if {stub!r}:
+    stub_tk.install()
+import {name} as module
+results = module.bench()
+if stub_tk.installed():
+    results["tk_calls"] = stub_tk.total_calls()
+with open({out!r}, "w") as f:
+    json.dump(results, f)
+"""
+
+
+def direction(metric):
+    for part in reversed(metric.split(".")):
+        for pattern, better in DIRECTIONS:
+            if fnmatch.fnmatch(part, pattern):
+                return better
+    return None
+
+
+def flatten(value, prefix=""):
+    # {"a": {"b_ms": 1}} -> {"a.b_ms": 1}, keeping only numbers
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+
+def best(runs):
+    # Per metric, the best value across repeats, which filters out most scheduling noise
+    merged = {}
+    for flat in runs:
+        for metric, value in flat.items():
+            if metric not in merged:
+                merged[metric] = value
+            elif direction(metric) == "higher":
+                merged[metric] = max(merged[metric], value)
+            elif direction(metric) == "lower":
+                merged[metric] = min(merged[metric], value)
+    return merged
+
+
+def discover():
+    return sorted(os.path.basename(path)[:-3] for path in glob.glob(os.path.join(HERE, "bench_*.py")))
+
+
+def needs_display(name):
+    with open(os.path.join(HERE, name + ".py")) as f:
+        return "NEEDS_DISPLAY = True" in f.read()
+
+
+def run_one(name, timeout, stub=False):
+    # Each benchmark in its own interpreter, so module state and Tk roots never leak between them;
+    # stub runs it on stub_tk, which times the Python and Tcl side of the UI work without drawing it
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "result.json")
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", CHILD.format(here=HERE, name=name, out=out, stub=stub)],
+                              cwd=HERE, capture_output=True, text=True, timeout=timeout)
+        elapsed = time.perf_counter() - started
+        if proc.returncode != 0 or not os.path.exists(out):
+            lines = proc.stderr.strip().splitlines() or ["no output"]
+            return {"error": lines[-1]}, elapsed
+        with open(out) as f:
+            return json.load(f), elapsed
+
+
+def git_commit():
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def run(names, repeat=1, timeout=600):
+    display = ensure_display()
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "display": os.environ.get("DISPLAY") if display else None,
+            "stub_tk": [],
+            "repeat": repeat,
+        },
+        "benchmarks": {},
+        "metrics": {},
+    }
+    for name in names:
+        stub = needs_display(name) and not display
+        if stub:
+            report["meta"]["stub_tk"].append(name)
+        runs, results, elapsed = [], None, 0.0
+        for _ in range(repeat):
+            try:
+                results, seconds = run_one(name, timeout, stub)
+            except subprocess.TimeoutExpired:
+                results, seconds = {"error": f"timed out after {timeout} s"}, timeout
+            elapsed += seconds
+            if "error" in results:
+                break
+            runs.append(flatten(results))
+        report["benchmarks"][name] = results
+        for metric, value in best(runs).items():
+            report["metrics"][f"{name}.{metric}"] = value
+        status = results["error"] if "error" in results else f"{len(runs)} run(s)"
+        if stub:
+            status += " on stub_tk"
+        print(f"{name:<24} {elapsed:7.1f} s  {status}")
+    return report
+
+
+def compare(current, baseline, threshold):
+    """Metrics that got worse by more than threshold (a fraction), and those that got better.
+
+    A benchmark that ran on a display in one report and on stub_tk in the
+    other measured different things and is left out.
+    """
+    regressions, improvements = [], []
+    mixed = set(current["meta"].get("stub_tk", [])) ^ set(baseline["meta"].get("stub_tk", []))
+    for metric, value in sorted(current["metrics"].items()):
+        better = direction(metric)
+        old = baseline["metrics"].get(metric)
+        if better is None or old is None or old == 0 or metric.split(".")[0] in mixed:
+            continue
+        change = (value - old) / abs(old)
+        worse = change > threshold if better == "lower" else change < -threshold
+        gained = change < -threshold if better == "lower" else change > threshold
+        if worse:
+            regressions.append((metric, old, value, change))
+        elif gained:
+            improvements.append((metric, old, value, change))
+    return regressions, improvements
+
+
+def print_changes(title, changes):
+    if changes:
+        print(f"\n{title}:")
+        for metric, old, value, change in changes:
+            print(f"  {metric:<70} {old:>12g} -> {value:<12g} {change:+.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmarks and compare them with a baseline.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run, e.g. bench_metrics (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per benchmark, the best value is kept")
+    parser.add_argument("--out", help="where to write the results (default: results/<commit>-<time>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change that counts as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    names = [name if name.startswith("bench_") else f"bench_{name}" for name in args.names] or discover()
+    report = run(names, repeat=args.repeat)
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        out = os.path.join(RESULTS, f"{report['meta']['commit'] or 'local'}-{stamp}.json")
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, improvements = compare(report, baseline, args.threshold)
+        print(f"Compared with {args.compare} (commit {baseline['meta'].get('commit')})")
+        print_changes("Improvements", improvements)
+        print_changes("Regressions", regressions)
+        if regressions:
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
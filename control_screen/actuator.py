@@ -0,0 +1,170 @@
+import threading
+import time
+
+
+# Backends
+class VolumeBackend:
+    def __init__(self, session, scale=1.0):
+        # session is an AudioSession, scale maps slider units to 0..1
+        self.session = session
+        self.scale = scale
+
+    def read(self):
+        return self.session.get_level() / self.scale
+
+    def write(self, value):
+        self.session.set_level(float(value) * self.scale)
+
+
+class CallbackBackend:
+    def __init__(self, write, read=None):
+        self._write = write
+        self._read = read
+
+    def read(self):
+        return self._read() if self._read else None
+
+    def write(self, value):
+        self._write(value)
+
+
+class FakeBackend:
+    def __init__(self, value=0, latency=0.0):
+        self.value = value
+        self.latency = latency
+        self.writes = []
+
+    def read(self):
+        return self.value
+
+    def write(self, value):
+        if self.latency:
+            time.sleep(self.latency)
+        self.value = value
+        self.writes.append(value)
+
+
+# Actuator
+class Actuator:
+    """Applies the latest requested value to a backend from a worker thread.
+
+    Requests that arrive while a write is in flight are coalesced so only the
+    newest one is applied, at no more than max_rate writes per second.
+    """
+
+    def __init__(self, backend, max_rate=20.0, tolerance=0, name="actuator", on_error=None):
+        self.backend = backend
+        self.max_rate = max_rate
+        self.tolerance = tolerance
+        self.name = name
+        self.on_error = on_error
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._pending = None
+        self._last_value = None
+        self._last_apply = 0.0
+        self._closed = False
+        self._thread = None
+
+        self.requested = 0
+        self.applied = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def request(self, value):
+        with self._lock:
+            if self._closed:
+                return
+            self.requested += 1
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = value
+            self._idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def seed(self, value):
+        # Record a value already on the device so an identical request is skipped
+        with self._lock:
+            self._last_value = value
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._pending if self._pending is not None else self._last_value
+
+    def flush(self, timeout=None):
+        return self._idle.wait(timeout)
+
+    def close(self, timeout=1.0):
+        with self._lock:
+            self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "applied": self.applied,
+                "dropped": self.dropped,
+                "skipped": self.skipped,
+                "errors": self.errors,
+            }
+
+    def _is_noop(self, value):
+        if self._last_value is None:
+            return False
+        try:
+            return abs(value - self._last_value) <= self.tolerance
+        except TypeError:
+            return value == self._last_value
+
+    def _run(self):
+        interval = 1.0 / self.max_rate if self.max_rate else 0.0
+        while True:
+            self._wakeup.wait()
+            # Rate limit, letting newer requests replace the pending one meanwhile
+            delay = self._last_apply + interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._lock:
+                self._wakeup.clear()
+                if self._closed:
+                    self._idle.set()
+                    return
+                value = self._pending
+                self._pending = None
+                if value is None:
+                    self._idle.set()
+                    continue
+                if self._is_noop(value):
+                    self.skipped += 1
+                    if self._pending is None:
+                        self._idle.set()
+                    continue
+
+            try:
+                self.backend.write(value)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                if self.on_error:
+                    self.on_error(e)
+            else:
+                with self._lock:
+                    self.applied += 1
+                    self._last_value = value
+            self._last_apply = time.perf_counter()
+
+            with self._lock:
+                if self._pending is None:
+                    self._idle.set()
@@ -0,0 +1,219 @@
+import threading
+import time
+from ctypes import cast, POINTER
+
+from instrumentation import timed
+from lazy_imports import lazy
+
+
+# Backends
+class PycawBackend:
+    def __init__(self):
+        # comtypes and pycaw are only imported once the endpoint is first used
+        self.comtypes = lazy("comtypes")
+        self.pycaw = lazy("pycaw.pycaw")
+
+    def init_thread(self):
+        # COM must be initialized on every thread that touches the endpoint, the main one included: comtypes
+        # only does it there on import, and that import may have run elsewhere
+        self.comtypes.CoInitialize()
+
+    def device_id(self):
+        return self.pycaw.AudioUtilities.GetSpeakers().GetId()
+
+    def activate(self):
+        devices = self.pycaw.AudioUtilities.GetSpeakers()
+        endpoint = self.pycaw.IAudioEndpointVolume
+        interface = devices.Activate(endpoint._iid_, self.comtypes.CLSCTX_ALL, None)
+        return cast(interface, POINTER(endpoint))
+
+
+class FakeEndpoint:
+    def __init__(self, device):
+        self.device = device
+
+    def GetMasterVolumeLevelScalar(self):
+        return self.device.call("get_level")
+
+    def SetMasterVolumeLevelScalar(self, value, context):
+        self.device.call("set_level", value)
+
+    def GetMute(self):
+        return self.device.call("get_mute")
+
+    def SetMute(self, muted, context):
+        self.device.call("set_mute", muted)
+
+
+class FakeAudioBackend:
+    def __init__(self, level=0.5, muted=False, latency=0.0, activate_latency=0.0):
+        self.level = level
+        self.muted = muted
+        self.latency = latency
+        self.activate_latency = activate_latency
+        self.current_device = "speakers"
+        self.fail_next = 0
+        self.activations = 0
+        self.device_lookups = 0
+        self.calls = 0
+
+    def init_thread(self):
+        pass
+
+    def device_id(self):
+        self.device_lookups += 1
+        return self.current_device
+
+    def activate(self):
+        self.device_lookups += 1
+        self.activations += 1
+        if self.activate_latency:
+            time.sleep(self.activate_latency)
+        return FakeEndpoint(self)
+
+    def call(self, op, *args):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_next:
+            self.fail_next -= 1
+            raise OSError("endpoint went away")
+        if op == "get_level":
+            return self.level
+        if op == "set_level":
+            self.level = args[0]
+        elif op == "get_mute":
+            return self.muted
+        elif op == "set_mute":
+            self.muted = bool(args[0])
+
+
+# Session
+class AudioSession:
+    """Keeps one IAudioEndpointVolume per thread and caches level and mute state.
+
+    The endpoint is rebuilt only when the default device changes (checked at
+    most every device_check_interval seconds) or a call on it fails.
+    """
+
+    def __init__(self, backend, device_check_interval=2.0):
+        self.backend = backend
+        self.device_check_interval = device_check_interval
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._device_id = None
+        self._last_check = None
+        self._level = None
+        self._muted = None
+
+        self.calls = 0
+        self.cache_hits = 0
+        self.activations = 0
+        self.failures = 0
+
+    def get_level(self, refresh=False):
+        with self._lock:
+            if self._level is not None and not refresh:
+                self.cache_hits += 1
+                return self._level
+        level = self._call("GetMasterVolumeLevelScalar", lambda volume: volume.GetMasterVolumeLevelScalar())
+        with self._lock:
+            self._level = level
+        return level
+
+    def set_level(self, level):
+        level = min(max(float(level), 0.0), 1.0)
+        self._call("SetMasterVolumeLevelScalar", lambda volume: volume.SetMasterVolumeLevelScalar(level, None))
+        with self._lock:
+            self._level = level
+
+    def get_mute(self, refresh=False):
+        with self._lock:
+            if self._muted is not None and not refresh:
+                self.cache_hits += 1
+                return self._muted
+        muted = bool(self._call("GetMute", lambda volume: volume.GetMute()))
+        with self._lock:
+            self._muted = muted
+        return muted
+
+    def set_mute(self, muted):
+        muted = bool(muted)
+        self._call("SetMute", lambda volume: volume.SetMute(muted, None))
+        with self._lock:
+            self._muted = muted
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._level = None
+            self._muted = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "cache_hits": self.cache_hits,
+                "activations": self.activations,
+                "failures": self.failures,
+            }
+
+    def _check_device(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._last_check is not None and now - self._last_check < self.device_check_interval:
+                return
+            self._last_check = now
+        device_id = self.backend.device_id()
+        with self._lock:
+            changed = self._device_id is not None and device_id != self._device_id
+            self._device_id = device_id
+        if changed:
+            self.invalidate()
+
+    def _init_thread(self):
+        # Before any call into the backend from this thread, the device lookup included
+        local = self._local
+        if not getattr(local, "initialized", False):
+            self.backend.init_thread()
+            local.initialized = True
+
+    def _interface(self):
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            with timed("pycaw.Activate"):
+                local.interface = self.backend.activate()
+            local.generation = self._generation
+            with self._lock:
+                self.activations += 1
+        return local.interface
+
+    def _call(self, name, op):
+        self._init_thread()
+        self._check_device()
+        with self._lock:
+            self.calls += 1
+        try:
+            with timed("pycaw." + name):
+                return op(self._interface())
+        except Exception:
+            # The endpoint may have been torn down, rebuild it and retry once
+            with self._lock:
+                self.failures += 1
+            self.invalidate()
+            with timed("pycaw." + name):
+                return op(self._interface())
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_session(backend=None):
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = AudioSession(backend or PycawBackend())
+        return _shared_session
@@ -0,0 +1,179 @@
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dispatch import dispatcher_for
+from instrumentation import timed
+from lazy_imports import lazy
+
+
+pyautogui = lazy("pyautogui")
+
+# Save-dialog file types, and the PIL format for each extension
+FILETYPES = [("PNG files", "*.png"), ("JPEG files", "*.jpg *.jpeg"), ("WebP files", "*.webp")]
+FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+
+
+def format_for(path):
+    return FORMATS.get(os.path.splitext(path)[1].lower(), "PNG")
+
+
+def encode_options(fmt, compress_level=6, quality=90):
+    # compress_level 0-9 only applies to PNG, quality 1-100 to JPEG and WebP
+    fmt = fmt.upper()
+    if fmt == "PNG":
+        return fmt, {"compress_level": compress_level}
+    if fmt == "JPEG":
+        return fmt, {"quality": quality, "optimize": False}
+    if fmt == "WEBP":
+        return fmt, {"quality": quality, "method": 4}
+    raise ValueError(f"Unsupported screenshot format: {fmt}")
+
+
+def encode(image, fmt="PNG", **params):
+    if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **params)
+    return buffer.getbuffer()
+
+
+def encode_to_file(image, path, options, capture_s=0.0):
+    # Encodes then writes, timing each step, and returns the result the services report
+    fmt, params = options
+    started = time.perf_counter()
+    data = encode(image, fmt, **params)
+    encoded = time.perf_counter()
+    with open(path, "wb") as f:
+        f.write(data)
+    written = time.perf_counter()
+    return {
+        "path": path,
+        "format": fmt,
+        "size": image.size,
+        "bytes": len(data),
+        "capture_ms": capture_s * 1000,
+        "encode_ms": (encoded - started) * 1000,
+        "write_ms": (written - encoded) * 1000,
+    }
+
+
+def save_screenshot(source, path, region=None, fmt=None, compress_level=6, quality=90):
+    # Synchronous capture for callers already off the Tk thread
+    options = encode_options(fmt or format_for(path), compress_level, quality)
+    started = time.perf_counter()
+    image = source.grab(region)
+    return encode_to_file(image, path, options, time.perf_counter() - started)
+
+
+# Frame sources
+class PyAutoGuiSource:
+    def grab(self, region=None):
+        # region is (left, top, width, height)
+        with timed("pyautogui.screenshot"):
+            return pyautogui.screenshot(region=region)
+
+
+class SyntheticSource:
+    """Draws desktop-like frames with PIL, for running the pipeline without a screen."""
+
+    def __init__(self, size=(1920, 1080), latency=0.0):
+        self.size = size
+        self.latency = latency
+        self.frames = 0
+
+    def grab(self, region=None):
+        from PIL import Image, ImageDraw
+
+        if self.latency:
+            time.sleep(self.latency)
+        self.frames += 1
+        width, height = self.size
+        image = Image.merge("RGB", [Image.linear_gradient("L").resize(self.size)] * 2 +
+                            [Image.new("L", self.size, 200)])
+        draw = ImageDraw.Draw(image)
+        # A few windows and some text so the encoders have real work to do
+        for i in range(6):
+            left = (i * 283 + self.frames * 7) % max(width - 400, 1)
+            top = (i * 157) % max(height - 300, 1)
+            draw.rectangle([left, top, left + 400, top + 300], fill=(240, 240, 240), outline=(60, 60, 60))
+            for line in range(12):
+                draw.text((left + 10, top + 10 + line * 22), f"frame {self.frames} window {i} line {line}",
+                          fill=(20, 20, 20))
+        if region is not None:
+            left, top, w, h = region
+            image = image.crop((left, top, left + w, top + h))
+        return image
+
+
+# Service
+class ScreenshotService:
+    """Captures screenshots on a worker thread and encodes them on a small pool.
+
+    The Tk thread only submits requests; results (with capture, encode and
+    write timings reported separately) come back to on_done on the Tk thread
+    through the root's TkDispatcher.
+    """
+
+    def __init__(self, root, source=None, encoders=2):
+        self.root = root
+        self.source = source or PyAutoGuiSource()
+
+        self._capture_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._encode_pool = ThreadPoolExecutor(max_workers=encoders, thread_name_prefix="encode")
+        self._dispatcher = dispatcher_for(root)
+        self._pending = 0
+
+        self.history = deque(maxlen=50)
+
+    def capture(self, path, region=None, fmt=None, compress_level=6, quality=90, delay=0.0,
+                on_done=None, on_error=None):
+        # delay gives a just-closed dialog time to leave the screen
+        options = encode_options(fmt or format_for(path), compress_level, quality)
+        self._pending += 1
+        self._capture_pool.submit(self._grab, path, region, options, delay, on_done, on_error)
+        self._dispatcher.watch(self)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def shutdown(self):
+        self._capture_pool.shutdown(wait=False, cancel_futures=True)
+        self._encode_pool.shutdown(wait=False, cancel_futures=True)
+
+    # Worker side
+    def _grab(self, path, region, options, delay, on_done, on_error):
+        if delay:
+            time.sleep(delay)
+        started = time.perf_counter()
+        try:
+            image = self.source.grab(region)
+        except Exception as e:
+            self._dispatcher.post(self._finish, on_error, e, None)
+            return
+        capture_s = time.perf_counter() - started
+        self._encode_pool.submit(self._encode, image, path, options, capture_s, on_done, on_error)
+
+    def _encode(self, image, path, options, capture_s, on_done, on_error):
+        try:
+            result = encode_to_file(image, path, options, capture_s)
+        except Exception as e:
+            self._dispatcher.post(self._finish, on_error, e, None)
+            return
+        self._dispatcher.post(self._finish, on_done, None, result)
+
+    # Tk side
+    def _finish(self, callback, error, result):
+        self._pending -= 1
+        if error is not None:
+            if callback:
+                callback(error)
+            else:
+                print(f"Error taking screenshot: {error}")
+            return
+        self.history.append(result)
+        if callback:
+            callback(result)
@@ -0,0 +1,594 @@
+import errno
+import hmac
+import itertools
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from controller import CommandError
+from dispatch import dispatcher_for
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# Only the user who runs the panel may reach the daemon: the socket lives in their own runtime directory,
+# and the loopback port, which any local user could connect to, takes a token kept in their home directory
+RUNTIME_DIR = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.path.expanduser("~"), ".control_screen")
+TOKEN_PATH = os.path.join(os.path.expanduser("~"), ".control_screen", "control.token")
+
+# A Unix socket where the platform has them, a loopback port otherwise
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = os.path.join(RUNTIME_DIR, "control_screen.sock")
+else:
+    DEFAULT_ADDRESS = ("127.0.0.1", 47831)
+
+# How long a panel that could not reach or start the daemon waits before trying again
+RECONNECT_DELAY = 5.0
+
+
+def _family(address):
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def _private_dir(path):
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid") and os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user")
+    os.chmod(path, 0o700)
+
+
+def write_token(path=TOKEN_PATH):
+    """A fresh shared secret for the loopback port, readable by this user only."""
+    token = secrets.token_hex(32)
+    _private_dir(os.path.dirname(path))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+
+def read_token(path=TOKEN_PATH):
+    with open(path) as f:
+        return f.read().strip()
+
+
+def _answers(address):
+    # Whether a daemon is listening there, as opposed to a socket file left by one that died
+    sock = socket.socket(_family(address), socket.SOCK_STREAM)
+    try:
+        sock.settimeout(1.0)
+        sock.connect(address)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class _StartLock:
+    """An exclusive lock on a file next to the daemon's address, held while finding or starting it.
+
+    The OS drops the lock if the holder dies, so a crashed panel never leaves it taken.
+    """
+
+    def __init__(self, address, token_path=TOKEN_PATH):
+        if isinstance(address, str):
+            self.path = address + ".lock"
+        else:
+            self.path = os.path.join(os.path.dirname(token_path), "control.lock")
+        self._file = None
+
+    def __enter__(self):
+        _private_dir(os.path.dirname(os.path.abspath(self.path)))
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _invalid(request):
+    # Why request is malformed, or None
+    if "batch" in request:
+        batch = request["batch"]
+        if not isinstance(batch, list):
+            return "batch must be a list"
+        for item in batch:
+            if not isinstance(item, dict) or not isinstance(item.get("cmd"), str):
+                return "each batch item needs a string cmd"
+            if not isinstance(item.get("args") or {}, dict):
+                return "args must be an object"
+        return None
+    if not isinstance(request.get("cmd"), str):
+        return "cmd must be a string"
+    if not isinstance(request.get("args") or {}, dict):
+        return "args must be an object"
+    return None
+
+
+# Server
+class _Connection:
+    def __init__(self, daemon, sock, number):
+        self.daemon = daemon
+        self.sock = sock
+        self.origin = f"client-{number}"
+        self.reader = sock.makefile("rb")
+        self.write_lock = threading.Lock()
+        self.subscribed = False
+        self.authorized = daemon.token is None
+
+    def send(self, message):
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        with self.write_lock:
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                pass
+
+    def close(self):
+        # Shut down first, the reader's file object would otherwise keep the socket open
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def on_event(self, event, value, origin):
+        # Clients never get their own changes echoed back
+        if origin != self.origin:
+            self.send({"event": event, "value": value})
+
+
+class ControlDaemon:
+    """Serves a Controller over a local socket with newline-delimited JSON.
+
+    A request is {"id": 1, "cmd": "brightness.set", "args": {"value": 40}} or
+    {"id": 2, "batch": [{"cmd": ..., "args": ...}, ...]}, and gets a reply
+    with the same id. Clients may pipeline requests without waiting. Each
+    connection's requests run in order on its own thread, except slow OS
+    commands which go to a pool and may answer out of order. {"cmd":
+    "subscribe"} makes the connection receive {"event", "value"} messages for
+    changes made by other clients.
+
+    On a loopback port the first line a client sends must be {"token": ...}
+    with the secret written to token_path, or the connection is closed.
+    """
+
+    def __init__(self, controller, address=DEFAULT_ADDRESS, workers=4, token_path=TOKEN_PATH):
+        self.controller = controller
+        self.address = address
+        self.token_path = token_path
+        self.token = None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="control")
+        self._sock = None
+        self._thread = None
+        self._connections = set()
+        self._numbers = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+
+    def start(self):
+        family = _family(self.address)
+        if family == socket.AF_UNIX:
+            _private_dir(os.path.dirname(os.path.abspath(self.address)))
+            if os.path.exists(self.address):
+                # Never take the address from a daemon that is still serving
+                if _answers(self.address):
+                    raise OSError(errno.EADDRINUSE, f"A control daemon is already listening on {self.address}")
+                os.unlink(self.address)
+        else:
+            self.token = write_token(self.token_path)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        if family == socket.AF_UNIX:
+            os.chmod(self.address, 0o600)
+        self._sock.listen()
+        self._thread = threading.Thread(target=self._accept, name="control-daemon", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            connection.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _accept(self):
+        while self._sock is not None:
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                return
+            connection = _Connection(self, sock, next(self._numbers))
+            with self._lock:
+                self._connections.add(connection)
+            threading.Thread(target=self._serve, args=(connection,), name=connection.origin, daemon=True).start()
+
+    def _serve(self, connection):
+        try:
+            for line in connection.reader:
+                if not line.strip():
+                    continue
+                if not connection.authorized:
+                    if not self._authorize(connection, line):
+                        break
+                    continue
+                try:
+                    self._handle(connection, line)
+                except Exception as e:
+                    # One bad request must not take the connection down
+                    print(f"Error handling control request: {e}")
+                    connection.send({"id": None, "ok": False, "error": f"Bad request: {e}"})
+        except OSError:
+            pass
+        finally:
+            if connection.subscribed:
+                self.controller.remove_listener(connection.on_event)
+            with self._lock:
+                self._connections.discard(connection)
+            connection.close()
+
+    def _authorize(self, connection, line):
+        try:
+            token = json.loads(line).get("token")
+        except (ValueError, AttributeError):
+            token = None
+        if isinstance(token, str) and hmac.compare_digest(token, self.token):
+            connection.authorized = True
+            return True
+        connection.send({"id": None, "ok": False, "error": "Not authorized"})
+        return False
+
+    def _handle(self, connection, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            connection.send({"id": None, "ok": False, "error": f"Bad request: {e}"})
+            return
+        self.requests += 1
+        if not isinstance(request, dict):
+            connection.send({"id": None, "ok": False, "error": "Bad request: expected an object"})
+            return
+        request_id = request.get("id")
+        error = _invalid(request)
+        if error:
+            connection.send({"id": request_id, "ok": False, "error": f"Bad request: {error}"})
+            return
+
+        if "batch" in request:
+            commands = [(item["cmd"], item.get("args")) for item in request["batch"]]
+            if any(command in self.controller.SLOW for command, _ in commands):
+                self._pool.submit(self._run_batch, connection, request_id, commands)
+            else:
+                self._run_batch(connection, request_id, commands)
+            return
+
+        command = request.get("cmd")
+        if command == "subscribe":
+            if not connection.subscribed:
+                connection.subscribed = True
+                self.controller.add_listener(connection.on_event)
+            connection.send({"id": request_id, "ok": True, "result": None})
+        elif command in self.controller.SLOW:
+            self._pool.submit(self._run, connection, request_id, command, request.get("args"))
+        else:
+            self._run(connection, request_id, command, request.get("args"))
+
+    def _run(self, connection, request_id, command, args):
+        try:
+            result = self.controller.execute(command, args, origin=connection.origin)
+        except Exception as e:
+            connection.send({"id": request_id, "ok": False, "error": str(e)})
+        else:
+            connection.send({"id": request_id, "ok": True, "result": result})
+
+    def _run_batch(self, connection, request_id, commands):
+        results = self.controller.execute_batch(commands, origin=connection.origin)
+        connection.send({"id": request_id, "ok": all(r["ok"] for r in results), "results": results})
+
+
+# Client
+class ControlClient:
+    """Talks to a ControlDaemon; every request returns a Future.
+
+    connected turns False once the daemon closes the connection or goes away.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=5.0, token_path=TOKEN_PATH):
+        self.address = address
+        # Read before connecting, so a missing token fails like a missing daemon
+        token = read_token(token_path) if _family(address) != socket.AF_UNIX else None
+        self.sock = socket.socket(_family(address), socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+        self.sock.settimeout(None)
+        if token is not None:
+            self.sock.sendall((json.dumps({"token": token}) + "\n").encode())
+
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Separate so a blocked send never stops the reader from taking replies off the socket
+        self._write_lock = threading.Lock()
+        self._subscribers = []
+        self.connected = True
+        self._reader = threading.Thread(target=self._read, name="control-client", daemon=True)
+        self._reader.start()
+
+    def send(self, command, **args):
+        return self._request({"cmd": command, "args": args})
+
+    def batch(self, commands):
+        # commands is a list of (command, args dict); the Future gets the list of per-command results
+        return self._request({"batch": [{"cmd": command, "args": args or {}} for command, args in commands]})
+
+    def call(self, command, timeout=10.0, **args):
+        return self.send(command, **args).result(timeout)
+
+    def subscribe(self, callback):
+        # callback(event, value) on the client's reader thread
+        self._subscribers.append(callback)
+        if len(self._subscribers) == 1:
+            return self._request({"cmd": "subscribe"})
+
+    def close(self):
+        self.connected = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _request(self, message):
+        future = Future()
+        with self._write_lock:
+            with self._lock:
+                message["id"] = request_id = next(self._ids)
+                self._pending[request_id] = future
+            data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+            try:
+                self.sock.sendall(data)
+            except OSError as e:
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                future.set_exception(e)
+        return future
+
+    def _read(self):
+        try:
+            for line in self.sock.makefile("rb"):
+                message = json.loads(line)
+                if "event" in message:
+                    for callback in self._subscribers:
+                        callback(message["event"], message["value"])
+                    continue
+                with self._lock:
+                    future = self._pending.pop(message.get("id"), None)
+                if future is None:
+                    continue
+                if "results" in message:
+                    future.set_result(message["results"])
+                elif message["ok"]:
+                    future.set_result(message.get("result"))
+                else:
+                    future.set_exception(CommandError(message.get("error")))
+        except (OSError, ValueError):
+            pass
+        self.connected = False
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError("Control daemon connection closed"))
+
+
+def connect(controller_factory, address=DEFAULT_ADDRESS):
+    """Connect to a running daemon, or start one in this process and connect to it.
+
+    Starting happens under a lock file, so panels that start together share one daemon.
+    """
+    try:
+        return ControlClient(address), None
+    except OSError:
+        pass
+    with _StartLock(address):
+        # Another panel may have started one while this one waited for the lock
+        try:
+            return ControlClient(address), None
+        except OSError:
+            daemon = ControlDaemon(controller_factory(), address).start()
+            return ControlClient(address), daemon
+
+
+# Tk side
+class ControlBridge:
+    """Delivers a ControlClient's replies and events on the Tk thread.
+
+    Replies come back through the root's TkDispatcher, which polls only while
+    requests are outstanding. Events ride along with replies; otherwise
+    drain_events should run from a periodic task. connect() finds or starts the daemon, in the
+    background unless wait is True, and commands sent meanwhile wait for it.
+
+    The daemon lives in whichever panel started it. When that panel closes,
+    the others notice on their next send or drain_events and connect again,
+    one of them starting a new daemon.
+    """
+
+    def __init__(self, root, client=None):
+        self.root = root
+        self.client = client
+        self.daemon = None
+        self.error = None
+        self.closed = False
+        self._dispatcher = dispatcher_for(root)
+        self._events = queue.Queue()
+        self._pending = 0
+        self._handlers = []
+        self._waiting = []
+        self._controller_factory = None
+        self._address = None
+        self._on_connected = None
+        self._connecting = False
+        self._retry_at = 0.0
+
+    def connect(self, controller_factory, address=DEFAULT_ADDRESS, on_connected=None, wait=False):
+        # on_connected(daemon) on the Tk thread after every (re)connection, daemon being None when another
+        # panel runs it
+        self._controller_factory = controller_factory
+        self._address = address
+        self._on_connected = on_connected
+        if wait:
+            self._attach(connect(controller_factory, address))
+        else:
+            self._connect()
+
+    def _connect(self):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(connect(self._controller_factory, self._address))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._connecting = True
+        self._expect(future, self._attach, self._connect_failed)
+        threading.Thread(target=run, name="control-connect", daemon=True).start()
+
+    def _attach(self, result):
+        self._connecting = False
+        self.client, self.daemon = result
+        if self.closed:
+            self.close()
+            return
+        if self._handlers:
+            self.client.subscribe(lambda event, value: self._events.put((event, value)))
+        waiting, self._waiting = self._waiting, []
+        for command, callback, on_error, args in waiting:
+            self.send(command, callback=callback, on_error=on_error, **args)
+        if self._on_connected:
+            self._on_connected(self.daemon)
+
+    def _connect_failed(self, error):
+        print(f"Could not reach the control daemon: {error}")
+        self._connecting = False
+        self.error = error
+        self._retry_at = time.monotonic() + RECONNECT_DELAY
+        waiting, self._waiting = self._waiting, []
+        for _, _, on_error, _ in waiting:
+            if on_error:
+                on_error(error)
+
+    def _check_connection(self):
+        # Connects again, starting a daemon if none answers, once the one in use has gone away
+        if self.closed or self._connecting or self._controller_factory is None:
+            return
+        if self.client is not None:
+            if self.client.connected:
+                return
+            print("Lost the control daemon, reconnecting")
+            self.client = None
+        elif self.error is None or time.monotonic() < self._retry_at:
+            return
+        self.error = None
+        self._connect()
+
+    def close(self):
+        # Stops the daemon too when this panel runs it, the other panels then start their own
+        self.closed = True
+        if self.client is not None:
+            self.client.close()
+        if self.daemon is not None:
+            self.daemon.stop()
+            self.daemon = None
+
+    def send(self, command, callback=None, on_error=None, **args):
+        self._check_connection()
+        if self.client is None:
+            if self.error is None:
+                self._waiting.append((command, callback, on_error, args))
+            elif on_error:
+                on_error(self.error)
+            return
+        future = self.client.send(command, **args)
+        if callback is None and on_error is None:
+            # Fire and forget, errors are only logged
+            future.add_done_callback(self._log_error)
+            return
+        self._expect(future, callback, on_error)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def on_event(self, handler):
+        # handler(event, value) on the Tk thread
+        self._handlers.append(handler)
+        if len(self._handlers) == 1 and self.client is not None:
+            self.client.subscribe(lambda event, value: self._events.put((event, value)))
+
+    def _log_error(self, future):
+        if future.exception() is not None:
+            print(f"Control command failed: {future.exception()}")
+
+    def _expect(self, future, callback, on_error):
+        self._pending += 1
+        future.add_done_callback(lambda f: self._dispatcher.post(self._deliver, f, callback, on_error))
+        self._dispatcher.watch(self)
+
+    def _deliver(self, future, callback, on_error):
+        self._pending -= 1
+        try:
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Control command failed: {error}")
+            elif callback:
+                callback(future.result())
+        finally:
+            self.drain_events()
+
+    def drain_events(self):
+        self._check_connection()
+        while True:
+            try:
+                event, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            for handler in self._handlers:
+                try:
+                    handler(event, value)
+                except Exception as e:
+                    print(f"Error handling control event {event}: {e}")
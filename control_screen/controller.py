@@ -0,0 +1,248 @@
+import ctypes
+import inspect
+import os
+import threading
+import time
+
+from actuator import Actuator, VolumeBackend
+from capture import PyAutoGuiSource, save_screenshot
+from displays import DisplayManager
+from runner import CommandRunner
+
+
+THEMES = ("light", "dark", "system")
+# How long a display command waits for the monitors to be enumerated; clients are never on the Tk thread here
+DISPLAY_WAIT = 5.0
+# The only place the screenshot command writes to
+SCREENSHOT_DIR = os.path.join(os.path.expanduser("~"), "Pictures", "Control Screen")
+
+
+class CommandError(Exception):
+    pass
+
+
+# System actions
+class WindowsSystem:
+    """Wi-Fi and session actions through netsh and user32."""
+
+    def __init__(self, runner=None):
+        self.runner = runner or CommandRunner(max_concurrent=2, default_timeout=30)
+
+    def set_wifi(self, enabled):
+        state = "enable" if enabled else "disable"
+        result = self.runner.run(["netsh", "interface", "set", "interface", "Wi-Fi", state]).wait()
+        if result["error"] or result["timed_out"] or result["returncode"]:
+            output = " ".join(line for _, line in result["output"]).strip()
+            raise CommandError(f"netsh failed: {result['error'] or output or result['returncode']}")
+
+    def lock(self):
+        ctypes.windll.user32.LockWorkStation()
+
+
+class FakeSystem:
+    def __init__(self):
+        self.wifi = True
+        self.locks = 0
+
+    def set_wifi(self, enabled):
+        self.wifi = enabled
+
+    def lock(self):
+        self.locks += 1
+
+
+# Controller
+class Controller:
+    """Headless core for the panels' actions, safe to call from any thread.
+
+    Every action is a named command ("brightness.set", "theme.set", ...) run
+    through execute(). Brightness goes through a DisplayManager and volume
+    through an actuator, so a burst of sets is coalesced. Listeners hear
+    about every state change together with the origin that caused it.
+    Screenshots are written under screenshot_dir only, whatever path a
+    client asks for.
+    """
+
+    # Commands that block on the OS and should not hold up a client's queue
+    SLOW = {"wifi.set", "lock", "screenshot"}
+
+    def __init__(self, displays=None, volume=None, system=None, source=None, themes=THEMES, theme="light",
+                 max_rate=20, screenshot_dir=SCREENSHOT_DIR):
+        if volume is None:
+            from audio_session import get_session
+            volume = VolumeBackend(get_session())
+        # Monitors are enumerated and read in the background while the panel builds
+        self.displays = (displays or DisplayManager(max_rate=max_rate)).start()
+        self.volume = Actuator(volume, max_rate=max_rate, tolerance=0.005, name="volume")
+        self.system = system or WindowsSystem()
+        self.source = source or PyAutoGuiSource()
+        self.screenshot_dir = screenshot_dir
+        self.themes = tuple(themes)
+        self.theme = theme
+        self.wifi = None
+
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._signatures = {}
+        self.executed = 0
+
+        self.commands = {
+            "ping": lambda origin: "pong",
+            "brightness.get": lambda origin: self._displays().level(),
+            "brightness.set": self.set_brightness,
+            "displays.list": lambda origin: self._displays().list(),
+            "display.get": lambda display, origin: self._displays().level(display),
+            "display.set": self.set_display_brightness,
+            "volume.get": lambda origin: self._read(self.volume),
+            "volume.set": self.set_volume,
+            "theme.get": lambda origin: self.theme,
+            "theme.set": self.set_theme,
+            "wifi.set": self.set_wifi,
+            "lock": lambda origin: self.system.lock(),
+            "screenshot": self.screenshot,
+        }
+
+    def add_listener(self, callback):
+        # callback(event, value, origin), called on whichever thread made the change
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def execute(self, command, args=None, origin=None):
+        handler = self.commands.get(command)
+        if handler is None:
+            raise CommandError(f"Unknown command: {command}")
+        args = args or {}
+        if not isinstance(args, dict):
+            raise CommandError(f"Bad arguments for {command}: expected an object")
+        # Checked against the signature first, so a TypeError raised inside the handler is not mistaken for one
+        signature = self._signatures.get(handler)
+        if signature is None:
+            signature = self._signatures[handler] = inspect.signature(handler)
+        try:
+            signature.bind(origin=origin, **args)
+        except TypeError as e:
+            raise CommandError(f"Bad arguments for {command}: {e}")
+        result = handler(origin=origin, **args)
+        with self._lock:
+            self.executed += 1
+        return result
+
+    def execute_batch(self, commands, origin=None):
+        # commands is a list of (command, args); one failure does not stop the rest
+        results = []
+        for command, args in commands:
+            try:
+                results.append({"ok": True, "result": self.execute(command, args, origin)})
+            except Exception as e:
+                results.append({"ok": False, "error": str(e)})
+        return results
+
+    def close(self):
+        self.displays.close()
+        self.volume.close()
+
+    # Commands
+    def set_brightness(self, value, wait=False, origin=None):
+        # Every display; with wait, returns once each has applied it or timed out
+        value = self._brightness(value)
+        changed = any(display["level"] != value for display in self._displays().list())
+        self.displays.set(value)
+        if wait:
+            self.displays.flush()
+        if changed:
+            self._emit("brightness", value, origin)
+        return value
+
+    def set_display_brightness(self, display, value, wait=False, origin=None):
+        value = self._brightness(value)
+        changed = self._displays().level(display) != value
+        try:
+            self.displays.set(value, display)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if wait:
+            self.displays.flush()
+        if changed:
+            self._emit("display", {"display": display, "value": value}, origin)
+        return value
+
+    def set_volume(self, value, wait=False, origin=None):
+        value = float(value)
+        if not 0.0 <= value <= 1.0:
+            raise CommandError("Volume must be between 0 and 1")
+        self._set(self.volume, "volume", value, wait, origin)
+        return value
+
+    def set_theme(self, value, origin=None):
+        if value not in self.themes:
+            raise CommandError(f"Unknown theme: {value}")
+        changed = value != self.theme
+        self.theme = value
+        if changed:
+            self._emit("theme", value, origin)
+        return value
+
+    def set_wifi(self, enabled, origin=None):
+        enabled = bool(enabled)
+        self.system.set_wifi(enabled)
+        changed = enabled != self.wifi
+        self.wifi = enabled
+        if changed:
+            self._emit("wifi", enabled, origin)
+        return enabled
+
+    def screenshot(self, path, region=None, fmt=None, compress_level=6, quality=90, delay=0.0, origin=None):
+        # path is relative to screenshot_dir, and may not lead out of it; delay gives a just-closed dialog time
+        # to leave the screen
+        path = self._screenshot_path(path)
+        if delay:
+            time.sleep(delay)
+        return save_screenshot(self.source, path, tuple(region) if region else None, fmt, compress_level, quality)
+
+    def _displays(self):
+        # Answers about displays only once they are known
+        self.displays.ready(DISPLAY_WAIT)
+        return self.displays
+
+    def _screenshot_path(self, path):
+        directory = os.path.realpath(self.screenshot_dir)
+        target = os.path.realpath(os.path.join(directory, str(path)))
+        if os.path.dirname(target) != directory:
+            raise CommandError(f"Screenshots can only be saved in {directory}")
+        os.makedirs(directory, exist_ok=True)
+        return target
+
+    def _brightness(self, value):
+        value = int(value)
+        if not 0 <= value <= 100:
+            raise CommandError("Brightness must be between 0 and 100")
+        return value
+
+    def _read(self, actuator):
+        value = actuator.value
+        if value is None:
+            value = actuator.backend.read()
+            actuator.seed(value)
+        return value
+
+    def _set(self, actuator, event, value, wait, origin):
+        changed = value != actuator.value
+        actuator.request(value)
+        if wait:
+            actuator.flush(timeout=5)
+        if changed:
+            self._emit(event, value, origin)
+
+    def _emit(self, event, value, origin):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(event, value, origin)
+            except Exception as e:
+                print(f"Error notifying {event} listener: {e}")
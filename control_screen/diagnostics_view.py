@@ -0,0 +1,55 @@
+import time
+from tkinter import ttk, filedialog, messagebox
+
+import instrumentation
+
+
+COLUMNS = [("count", "Calls"), ("mean_ms", "Mean ms"), ("p50_ms", "p50 ms"), ("p90_ms", "p90 ms"),
+           ("p99_ms", "p99 ms"), ("max_ms", "Max ms")]
+
+
+class DiagnosticsPanel:
+    """Latency table for every instrumented operation, recent stalls and JSON export.
+
+    refresh() only rewrites rows whose numbers changed.
+    """
+
+    def __init__(self, parent):
+        self.tree = ttk.Treeview(parent, columns=[key for key, _ in COLUMNS], height=15)
+        self.tree.heading("#0", text="Operation")
+        self.tree.column("#0", width=280)
+        for key, title in COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=90, anchor="e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.stalls_label = ttk.Label(parent, text="No event-loop stalls recorded", justify="left")
+        self.stalls_label.pack(anchor="w", padx=10)
+        ttk.Button(parent, text="Export JSON", command=self.export).pack(pady=10)
+
+        self._rows = {}
+        self._shown = {}
+
+    def refresh(self):
+        report = instrumentation.report()
+        for name, summary in report["operations"].items():
+            values = tuple(summary["count"] if key == "count" else f"{summary[key]:.2f}" for key, _ in COLUMNS)
+            if name not in self._rows:
+                self._rows[name] = self.tree.insert("", "end", text=name, values=values)
+            elif self._shown.get(name) != values:
+                self.tree.item(self._rows[name], values=values)
+            self._shown[name] = values
+
+        if report["stalls"]:
+            lines = []
+            for stall in report["stalls"][-3:]:
+                culprits = ", ".join(f"{call['op']} {call['ms']} ms ({call['thread']})" for call in stall["slow_calls"])
+                lines.append(f"{time.strftime('%H:%M:%S', time.localtime(stall['time']))} "
+                             f"stalled {stall['lag_ms']} ms: {culprits or 'no slow backend call'}")
+            self.stalls_label.config(text="\n".join(lines))
+
+    def export(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if path:
+            instrumentation.export_json(path)
+            messagebox.showinfo("Success", "Diagnostics exported")
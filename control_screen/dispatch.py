@@ -0,0 +1,62 @@
+import queue
+import weakref
+
+
+_dispatchers = weakref.WeakKeyDictionary()
+
+
+def dispatcher_for(root, poll_ms=20):
+    """The TkDispatcher shared by every service on root."""
+    dispatcher = _dispatchers.get(root)
+    if dispatcher is None:
+        dispatcher = _dispatchers[root] = TkDispatcher(root, poll_ms)
+    return dispatcher
+
+
+class TkDispatcher:
+    """Hands work finished on other threads to callbacks on the Tk thread.
+
+    Workers call post(callback, *args) from any thread. The Tk thread runs
+    posted callbacks in order from a root.after poll, which only runs while
+    a watched service is busy or posts are waiting. A service starting work
+    calls watch(self) on the Tk thread, and posts its last result before its
+    busy property turns false. A failing callback is logged and the rest
+    still run.
+    """
+
+    def __init__(self, root, poll_ms=20):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._posts = queue.Queue()
+        self._watched = []
+        self._after_id = None
+
+        self.delivered = 0
+
+    def post(self, callback, *args):
+        self._posts.put((callback, args))
+
+    def watch(self, service):
+        if not any(watched is service for watched in self._watched):
+            self._watched.append(service)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._drain)
+
+    def _drain(self):
+        try:
+            while True:
+                try:
+                    callback, args = self._posts.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"Error in {getattr(callback, '__qualname__', callback)}: {e}")
+                self.delivered += 1
+        finally:
+            self._watched = [service for service in self._watched if service.busy]
+            if self._watched or not self._posts.empty():
+                self._after_id = self.root.after(self.poll_ms, self._drain)
+            else:
+                self._after_id = None
@@ -0,0 +1,282 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from instrumentation import timed
+from lazy_imports import lazy
+
+
+# Sources
+class SbcDisplays:
+    """Monitors as screen_brightness_control sees them, addressed by their index."""
+
+    def __init__(self):
+        self.sbc = lazy("screen_brightness_control")
+
+    def list(self):
+        with timed("sbc.list_monitors_info"):
+            monitors = self.sbc.list_monitors_info()
+        return [{"id": index, "name": info.get("name") or f"Display {index + 1}"}
+                for index, info in enumerate(monitors)]
+
+    def read(self, display):
+        with timed("sbc.get_brightness"):
+            return self.sbc.get_brightness(display=display)[0]
+
+    def write(self, display, value):
+        with timed("sbc.set_brightness"):
+            self.sbc.set_brightness(int(value), display=display)
+
+
+class FakeDisplays:
+    """Displays given as (name, level, latency); latency is paid on every read and write."""
+
+    def __init__(self, displays=(("Built-in", 50, 0.0),)):
+        self.names = [name for name, _, _ in displays]
+        self.levels = [level for _, level, _ in displays]
+        self.latencies = [latency for _, _, latency in displays]
+        self.writes = [[] for _ in displays]
+        self.lists = 0
+        self.reads = 0
+
+    def list(self):
+        self.lists += 1
+        return [{"id": index, "name": name} for index, name in enumerate(self.names)]
+
+    def read(self, display):
+        self.reads += 1
+        if self.latencies[display]:
+            time.sleep(self.latencies[display])
+        return self.levels[display]
+
+    def write(self, display, value):
+        if self.latencies[display]:
+            time.sleep(self.latencies[display])
+        self.levels[display] = value
+        self.writes[display].append(value)
+
+
+# Manager
+class _Display:
+    def __init__(self, display_id, name):
+        self.id = display_id
+        self.name = name
+        self.level = None
+        self.applied = None
+        self.pending = None
+        self.busy = False
+        self.started = None
+        self.last_apply = 0.0
+        self.writes = 0
+        self.errors = 0
+        self.timeouts = 0
+
+
+class DisplayManager:
+    """Brightness for every monitor, enumerated once and set in parallel.
+
+    Each display's last known level is cached, so reads after startup never
+    touch the hardware. A set fans out to a small thread pool with at most
+    one write in flight per display; requests arriving meanwhile are
+    coalesced to the newest. A display whose write runs past timeout is
+    reported as stalled and only holds up itself. Nothing waits for the
+    enumeration: until it is done list() is empty, level() is None and sets
+    are held back and applied once the displays are known, so the Tk thread
+    can paint a default and update when ready() turns true.
+    """
+
+    def __init__(self, source=None, timeout=2.0, max_rate=20.0, workers=None, on_error=None):
+        self.source = source or SbcDisplays()
+        self.timeout = timeout
+        self.max_rate = max_rate
+        self.workers = workers
+        self.on_error = on_error
+
+        self._states = {}
+        self._pool = None
+        self._ready = threading.Event()
+        self._deferred = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+
+        self.error = None
+        self.requested = 0
+        self.skipped = 0
+
+    def start(self):
+        # Enumerate in the background so the first read is likely to find everything cached
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._enumerate, name="displays", daemon=True)
+                self._thread.start()
+        return self
+
+    def ready(self, timeout=None):
+        self.start()
+        return self._ready.wait(timeout)
+
+    def list(self):
+        self.start()
+        with self._lock:
+            return [{"id": state.id, "name": state.name, "level": state.level} for state in self._states.values()]
+
+    def level(self, display=None):
+        # The first display's level unless one is named
+        self.start()
+        with self._lock:
+            state = self._state(display)
+            return state.level if state is not None else None
+
+    def set(self, value, display=None):
+        # All displays unless one is named
+        self.start()
+        with self._lock:
+            if self._closed:
+                return
+            if not self._ready.is_set():
+                # Newest value per target, a set of every display replacing the ones before it
+                if display is None:
+                    self._deferred.clear()
+                self._deferred[display] = value
+                return
+            self._set(value, display)
+
+    def flush(self, timeout=None):
+        """Wait for every display to finish, giving up on each after timeout seconds of writing.
+
+        Returns the ids of the displays still writing.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        self.ready()
+        with self._idle:
+            while True:
+                now = time.perf_counter()
+                waiting = [state for state in self._states.values()
+                           if state.busy and (state.started is None or now - state.started < timeout)]
+                if not waiting:
+                    return [state.id for state in self._states.values() if state.busy]
+                deadline = min(state.started or now for state in waiting) + timeout
+                self._idle.wait(max(deadline - now, 0.001))
+
+    def stalled(self):
+        now = time.perf_counter()
+        with self._lock:
+            return [state.id for state in self._states.values()
+                    if state.started is not None and now - state.started >= self.timeout]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "displays": len(self._states),
+                "requested": self.requested,
+                "skipped": self.skipped,
+                "writes": {state.id: state.writes for state in self._states.values()},
+                "errors": sum(state.errors for state in self._states.values()),
+                "timeouts": sum(state.timeouts for state in self._states.values()),
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _set(self, value, display):
+        # With the lock held
+        targets = list(self._states.values()) if display is None else [self._state(display)]
+        for state in targets:
+            if state is None:
+                raise ValueError(f"Unknown display: {display}")
+            self.requested += 1
+            state.pending = value
+            state.level = value
+            if not state.busy:
+                state.busy = True
+                self._pool.submit(self._apply, state)
+
+    def _state(self, display):
+        if display is None:
+            return next(iter(self._states.values()), None)
+        return self._states.get(display)
+
+    def _enumerate(self):
+        displays = []
+        try:
+            displays = self.source.list()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers or min(max(len(displays), 1), 8),
+                                            thread_name_prefix="display")
+            with self._lock:
+                for display in displays:
+                    self._states[display["id"]] = _Display(display["id"], display["name"])
+
+            # Read every level at once; a display too slow to answer fills its cache entry later
+            reads = {self._pool.submit(self.source.read, state.id): state for state in self._states.values()}
+            wait(reads, timeout=self.timeout)
+            for future, state in reads.items():
+                future.add_done_callback(lambda f, state=state: self._read_done(state, f))
+        except Exception as e:
+            print(f"Error listing displays: {e}")
+            self.error = str(e)
+        finally:
+            # Whatever happened, nothing may wait on the enumeration for ever
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="display")
+            with self._lock:
+                self._ready.set()
+                deferred, self._deferred = self._deferred, {}
+                for display, value in (deferred.items() if not self._closed else ()):
+                    try:
+                        self._set(value, display)
+                    except ValueError as e:
+                        print(f"Error setting brightness: {e}")
+
+    def _read_done(self, state, future):
+        if future.exception() is not None:
+            print(f"Error reading brightness of {state.name}: {future.exception()}")
+            return
+        with self._lock:
+            if state.level is None:
+                state.level = future.result()
+            if state.applied is None:
+                state.applied = future.result()
+
+    def _apply(self, state):
+        interval = 1.0 / self.max_rate if self.max_rate else 0.0
+        while True:
+            # Rate limit write starts per display, letting newer requests replace the pending one meanwhile
+            delay = state.last_apply + interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                value, state.pending = state.pending, None
+                if value is None or self._closed:
+                    state.busy = False
+                    self._idle.notify_all()
+                    return
+                if value == state.applied:
+                    self.skipped += 1
+                    continue
+                state.started = state.last_apply = time.perf_counter()
+
+            try:
+                self.source.write(state.id, value)
+            except Exception as e:
+                error = e
+            else:
+                error = None
+            finished = time.perf_counter()
+            with self._lock:
+                if error is None:
+                    state.applied = value
+                    state.writes += 1
+                else:
+                    state.errors += 1
+                if finished - state.started >= self.timeout:
+                    state.timeouts += 1
+                state.started = None
+            if error is not None:
+                print(f"Error setting brightness of {state.name}: {error}")
+                if self.on_error:
+                    self.on_error(state.id, error)
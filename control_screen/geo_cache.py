@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".control_screen", "geo_cache.json")
+
+_finder = None
+_finder_lock = threading.Lock()
+
+
+def shared_timezone_finder():
+    # TimezoneFinder loads its polygon data on construction, build it once per process
+    global _finder
+    with _finder_lock:
+        if _finder is None:
+            from timezonefinder import TimezoneFinder
+            _finder = TimezoneFinder()
+        return _finder
+
+
+def find_timezone(lat, lon):
+    finder = shared_timezone_finder()
+    with _finder_lock:
+        return finder.timezone_at(lng=lon, lat=lat)
+
+
+class NominatimGeocoder:
+    def __init__(self, user_agent="screen_controller"):
+        from geopy.geocoders import Nominatim
+        self.geolocator = Nominatim(user_agent=user_agent)
+
+    def geocode(self, city):
+        location = self.geolocator.geocode(city)
+        if location is None:
+            raise LookupError(f"Unknown city: {city}")
+        return location.latitude, location.longitude
+
+
+class GeoResolver:
+    """Resolves a city to (lat, lon, timezone) through a persistent LRU cache.
+
+    Entries expire after ttl seconds and the least recently used ones are
+    evicted past max_entries. A path of None keeps the cache in memory only.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, geocoder=None, timezone_at=find_timezone,
+                 ttl=30 * 24 * 3600, max_entries=500):
+        self.path = path
+        self.geocoder = geocoder
+        self.timezone_at = timezone_at
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries = None
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def resolve(self, city):
+        key = " ".join(city.lower().split())
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is not None and now - entry[3] < self.ttl:
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1], entry[2]
+            if entry is not None:
+                self.expired += 1
+            self.misses += 1
+            if self.geocoder is None:
+                self.geocoder = NominatimGeocoder()
+
+        lat, lon = self.geocoder.geocode(city)
+        timezone_str = self.timezone_at(lat, lon)
+
+        with self._lock:
+            entries[key] = [lat, lon, timezone_str, now]
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.evicted += 1
+            self._save()
+        return lat, lon, timezone_str
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._save()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "entries": len(self._entries or ()),
+            }
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        for key, entry in json.load(f):
+                            self._entries[key] = entry
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable geo cache: {e}")
+        return self._entries
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # Stored oldest first so the LRU order survives a reload
+                json.dump(list(self._entries.items()), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save geo cache: {e}")
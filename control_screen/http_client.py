@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from instrumentation import timed
+
+
+# Seconds a response stays fresh, by URL prefix
+DEFAULT_TTLS = {
+    "http://api.openweathermap.org/": 600,
+    "https://newsapi.org/": 300,
+}
+
+
+class _Entry:
+    def __init__(self, data, etag, last_modified, stored_at, ttl):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    def fresh(self, now):
+        return now - self.stored_at < self.ttl
+
+
+class HttpClient:
+    """Pooled JSON client with TTL caching, revalidation and in-flight dedup.
+
+    Fresh cache entries are returned without touching the network, stale ones
+    are revalidated with If-None-Match/If-Modified-Since, and concurrent calls
+    for the same URL share a single request.
+    """
+
+    def __init__(self, timeout=10, pool_size=10, ttls=None, default_ttl=0, max_entries=256, session=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.timeout = timeout
+        self.ttls = sorted((ttls if ttls is not None else DEFAULT_TTLS).items(), key=lambda t: -len(t[0]))
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.pool_size = pool_size
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._prepare = lambda url, params: requests.Request("GET", url, params=params).prepare().url
+
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._batch_pool = None
+
+        self.requests = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.deduplicated = 0
+
+    def ttl_for(self, url):
+        for prefix, ttl in self.ttls:
+            if url.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get_json(self, url, params=None, ttl=None):
+        key = self._prepare(url, params)
+        ttl = self.ttl_for(key) if ttl is None else ttl
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry.fresh(now):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry.data
+            future = self._inflight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                owner = False
+            else:
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._fetch(key, entry, ttl)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_many(self, calls, workers=None):
+        # calls is a list of (url, params); each result is the data or the exception raised
+        with self._lock:
+            if self._batch_pool is None:
+                self._batch_pool = ThreadPoolExecutor(max_workers=workers or self.pool_size,
+                                                      thread_name_prefix="http-batch")
+        futures = [self._batch_pool.submit(self.get_json, url, params) for url, params in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "deduplicated": self.deduplicated,
+                "entries": len(self._cache),
+            }
+
+    def _fetch(self, key, entry, ttl):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        with self._lock:
+            self.requests += 1
+        with timed("requests.get"):
+            response = self.session.get(key, headers=headers, timeout=self.timeout)
+        now = time.time()
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+                entry.stored_at = now
+                entry.ttl = ttl
+            return entry.data
+
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if ttl > 0 or etag or last_modified:
+            with self._lock:
+                self._cache[key] = _Entry(data, etag, last_modified, now, ttl)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return data
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_client():
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
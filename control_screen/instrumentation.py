@@ -0,0 +1,175 @@
+import bisect
+import json
+import threading
+import time
+from collections import deque
+
+
+# Bucket upper bounds in seconds: four per doubling from 1 us to ~70 s
+BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(105)]
+SLOW_CALL = 0.05
+
+
+class Histogram:
+    """Log-bucketed latency histogram, cheap enough to record on every call."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        index = bisect.bisect_left(BOUNDS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th percentile, at most the true max
+        with self._lock:
+            counts, count, top = list(self.counts), self.count, self.max
+        if not count:
+            return 0.0
+        target = p / 100 * count
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if seen >= target:
+                return min(BOUNDS[index] if index < len(BOUNDS) else top, top)
+        return top
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+histograms = {}
+# Calls over SLOW_CALL seconds, and event-loop stalls, newest last
+slow_calls = deque(maxlen=200)
+stalls = deque(maxlen=100)
+_lock = threading.Lock()
+
+
+def histogram(name):
+    found = histograms.get(name)
+    if found is None:
+        with _lock:
+            found = histograms.setdefault(name, Histogram())
+    return found
+
+
+def record(name, seconds):
+    histogram(name).record(seconds)
+    if seconds >= SLOW_CALL:
+        slow_calls.append({"time": time.time(), "op": name, "ms": round(seconds * 1000, 1),
+                           "thread": threading.current_thread().name})
+
+
+class timed:
+    """with timed("sbc.set_brightness"): ... records the block's duration, even if it raises."""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def report():
+    with _lock:
+        names = sorted(histograms)
+    return {
+        "generated": time.time(),
+        "operations": {name: histograms[name].summary() for name in names},
+        "slow_calls": list(slow_calls),
+        "stalls": list(stalls),
+    }
+
+
+def export_json(path):
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
+
+
+def reset():
+    with _lock:
+        histograms.clear()
+    slow_calls.clear()
+    stalls.clear()
+
+
+class LagProbe:
+    """Measures how late root.after callbacks fire on the Tk thread.
+
+    Every interval_ms it records the drift into the "tk.after_lag"
+    histogram. A drift over stall_ms is kept as a stall along with the slow
+    calls that finished during it, which names the backend that froze the
+    UI. Given a TickScheduler it is one of its tasks and measures how late
+    the scheduler woke, so it adds no timer of its own and pauses while the
+    window is hidden; otherwise it schedules itself with root.after.
+    """
+
+    def __init__(self, root, interval_ms=500, stall_ms=200, scheduler=None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.scheduler = scheduler
+        self._after_id = None
+        self._due = None
+
+    def start(self):
+        if self.scheduler is not None:
+            self.scheduler.add("lag-probe", self._tick, self.interval_ms / 1000)
+        elif self._after_id is None:
+            self._schedule()
+
+    def stop(self):
+        if self.scheduler is not None:
+            self.scheduler.remove("lag-probe")
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def set_active(self, active):
+        # For scheduler visibility listeners: no probing while the window is hidden
+        if active:
+            self.start()
+        else:
+            self.stop()
+
+    def _schedule(self):
+        self._due = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._fire)
+
+    def _tick(self):
+        self._record(self.scheduler.late)
+
+    def _fire(self):
+        self._record(max(time.perf_counter() - self._due, 0.0))
+        self._schedule()
+
+    def _record(self, lag):
+        # Straight into the histogram, the lag itself is not a slow call
+        histogram("tk.after_lag").record(lag)
+        if lag * 1000 >= self.stall_ms:
+            began = time.time() - lag
+            culprits = [call for call in list(slow_calls) if call["time"] >= began - 0.05]
+            stalls.append({"time": time.time(), "lag_ms": round(lag * 1000, 1), "slow_calls": culprits})
@@ -0,0 +1,79 @@
+import importlib
+import importlib.util
+import threading
+import time
+
+
+# Seconds each lazily loaded module took to import, by module name
+import_times = {}
+_modules = {}
+_lock = threading.Lock()
+
+# Packages that set up COM for the thread importing them, left to load on the thread that first uses them
+THREAD_BOUND = {"comtypes", "pycaw", "pyautogui"}
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self._name)
+            import_times.setdefault(self._name, time.perf_counter() - started)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy(name):
+    with _lock:
+        module = _modules.get(name)
+        if module is None:
+            module = _modules[name] = LazyModule(name)
+        return module
+
+
+def optional(name):
+    # A lazy facade if the module is installed, None otherwise, without importing it
+    try:
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    return lazy(name) if found else None
+
+
+def prewarm(root, names=None, delay_ms=500):
+    """Import the given (default: all registered) lazy modules in the background.
+
+    Scheduled from the event loop so it only starts once the first frame
+    has been painted. THREAD_BOUND packages are never prewarmed, their COM
+    apartment would end up on the prewarm thread.
+    """
+    def run():
+        for name in names or list(_modules):
+            if name.split(".")[0] in THREAD_BOUND:
+                continue
+            try:
+                lazy(name).load()
+            except Exception as e:
+                print(f"Prewarm of {name} failed: {e}")
+
+    def start():
+        threading.Thread(target=run, name="prewarm", daemon=True).start()
+
+    root.after_idle(lambda: root.after(delay_ms, start))
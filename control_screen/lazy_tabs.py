@@ -0,0 +1,86 @@
+import time
+from collections import Counter
+from tkinter import ttk
+
+
+class LazyNotebook(ttk.Notebook):
+    """Notebook whose pages are built the first time they are shown.
+
+    Each page starts as an empty frame. Its builder runs on the first
+    <<NotebookTabChanged>> that selects it, and once the user is idle the
+    page most likely to be opened next is built ahead of time.
+    """
+
+    def __init__(self, master, prebuild_delay_ms=1500, **kw):
+        super().__init__(master, **kw)
+        self.prebuild_delay_ms = prebuild_delay_ms
+        self._builders = {}
+        self._built = set()
+        self._transitions = Counter()
+        self._current = None
+        self._prebuild_id = None
+        self.build_times = {}
+        self.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    def add_page(self, text, build, **kw):
+        # build(frame) fills the page's frame when it is first needed
+        frame = ttk.Frame(self)
+        self.add(frame, text=text, **kw)
+        self._builders[str(frame)] = (text, build)
+        return frame
+
+    def is_built(self, text):
+        return text in self._built
+
+    def build(self, tab):
+        name = str(tab)
+        if name not in self._builders:
+            return
+        text, build = self._builders[name]
+        if text in self._built:
+            return
+        self._built.add(text)
+        started = time.perf_counter()
+        build(self.nametowidget(name))
+        self.build_times[text] = time.perf_counter() - started
+
+    def build_all(self):
+        for name in list(self._builders):
+            self.build(name)
+
+    def _on_tab_changed(self, event):
+        selected = self.select()
+        if not selected:
+            return
+        self.build(selected)
+        if self._current is not None and self._current != selected:
+            self._transitions[(self._current, selected)] += 1
+        self._current = selected
+        self._schedule_prebuild()
+
+    def _schedule_prebuild(self):
+        if self._prebuild_id is not None:
+            self.after_cancel(self._prebuild_id)
+        self._prebuild_id = self.after(self.prebuild_delay_ms, lambda: self.after_idle(self._prebuild))
+
+    def _predict(self):
+        pending = [tab for tab in self.tabs() if self._builders.get(str(tab), ("",))[0] not in self._built]
+        if not pending:
+            return None
+        # Most frequent move from the current tab this session, else the next tab along
+        seen = [(count, to) for (source, to), count in self._transitions.items()
+                if source == self._current and to in pending]
+        if seen:
+            return max(seen)[1]
+        tabs = list(self.tabs())
+        index = tabs.index(self._current) if self._current in tabs else -1
+        for tab in tabs[index + 1:] + tabs[:index + 1]:
+            if tab in pending:
+                return tab
+        return None
+
+    def _prebuild(self):
+        self._prebuild_id = None
+        tab = self._predict()
+        if tab is not None:
+            self.build(tab)
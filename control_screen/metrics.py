@@ -0,0 +1,230 @@
+import threading
+import time
+from array import array
+
+from instrumentation import timed
+from scheduler import TickScheduler
+
+
+class RingBuffer:
+    """Fixed-size float history backed by an array, oldest sample overwritten first."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array('d', bytes(8 * capacity))
+        self.start = 0
+        self.count = 0
+
+    def append(self, value):
+        end = (self.start + self.count) % self.capacity
+        self.data[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def extend(self, values):
+        # Bulk append, oldest first, in at most two slice copies
+        values = array('d', values[-self.capacity:])
+        n = len(values)
+        end = (self.start + self.count) % self.capacity
+        first = min(n, self.capacity - end)
+        self.data[end:end + first] = values[:first]
+        self.data[:n - first] = values[first:]
+        overflow = max(self.count + n - self.capacity, 0)
+        self.count = min(self.count + n, self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+
+    def last(self, default=None):
+        if not self.count:
+            return default
+        return self.data[(self.start + self.count - 1) % self.capacity]
+
+    def values(self, n=None):
+        # Oldest to newest, optionally only the newest n
+        n = self.count if n is None else min(n, self.count)
+        first = (self.start + self.count - n) % self.capacity
+        end = first + n
+        if end <= self.capacity:
+            return self.data[first:end]
+        return self.data[first:] + self.data[:end - self.capacity]
+
+    def __len__(self):
+        return self.count
+
+
+class MetricsSampler:
+    """Samples system metrics on a background thread into ring buffers.
+
+    Subscribers are called on the Tk thread with only the values whose
+    displayed form changed since the last publish. Publishing runs as a
+    TickScheduler task, the panel's if given (only while page is shown) or
+    one of the sampler's own, and sampling pauses while the window is hidden.
+    """
+
+    def __init__(self, root, interval=1.0, history=3600, ps=None, precision=1, scheduler=None, page=None):
+        if ps is None:
+            import psutil as ps
+        self.root = root
+        self.ps = ps
+        self.interval = interval
+        self.history = history
+        self.precision = precision
+        self.scheduler = scheduler
+        self.page = page
+
+        self.cores = ps.cpu_count() or 1
+        names = ["cpu", "memory", "swap", "battery", "disk_read", "disk_write", "net_sent", "net_recv"]
+        names += [f"cpu{i}" for i in range(self.cores)]
+        self.buffers = {name: RingBuffer(history) for name in names}
+        self.timestamps = RingBuffer(history)
+
+        self._lock = threading.Lock()
+        self._published = {}
+        # Displayed values changed since the last publish, merged so a hidden page holds one entry per name
+        self._changes = {}
+        self._subscribers = []
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = None
+        self._last_io = None
+
+        self.samples = 0
+        self.sample_seconds = 0.0
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        with self._lock:
+            snapshot = dict(self._published)
+        if snapshot:
+            callback(snapshot)
+
+    def set_interval(self, interval):
+        self.interval = interval
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self.ps.cpu_percent(interval=None)
+            self.ps.cpu_percent(interval=None, percpu=True)
+            self._thread = threading.Thread(target=self._run, name="metrics", daemon=True)
+            self._thread.start()
+            if self.scheduler is None:
+                self.scheduler = TickScheduler(self.root)
+            self.scheduler.add("metrics", self.publish, self.interval, page=self.page)
+            self.scheduler.add_visibility_listener(lambda visible: self.resume() if visible else self.pause())
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+        self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._running.set()
+        self._wake.set()
+        if self.scheduler is not None:
+            self.scheduler.remove("metrics")
+
+    def restore(self, series, latest=None, gap=0.0):
+        """Append history from an earlier run, normally before start().
+
+        series maps buffer names to their samples, oldest first; buffers it
+        leaves out are padded with NaN to stay aligned. The gap seconds
+        since then are left empty, and a gap longer than the history drops
+        it altogether. latest values are published to subscribers until the
+        first live sample replaces them.
+        """
+        missed = int(gap / self.interval)
+        if missed >= self.history:
+            return False
+        length = max((len(values) for values in series.values()), default=0)
+        nans = array('d', [float("nan")]) * (length + missed)
+        with self._lock:
+            for name, buffer in self.buffers.items():
+                values = series.get(name)
+                if values is None:
+                    buffer.extend(nans)
+                else:
+                    buffer.extend(nans[:length - len(values)] + array('d', values) + nans[:missed])
+            self.timestamps.extend(nans)
+            if latest:
+                self._published.update(latest)
+        return True
+
+    def history_of(self, name, n=None):
+        with self._lock:
+            return self.buffers[name].values(n)
+
+    def latest(self):
+        with self._lock:
+            return dict(self._published)
+
+    def sample(self):
+        ps = self.ps
+        now = time.monotonic()
+        values = {
+            "cpu": ps.cpu_percent(interval=None),
+            "memory": ps.virtual_memory().percent,
+            "swap": ps.swap_memory().percent,
+        }
+        for i, percent in enumerate(ps.cpu_percent(interval=None, percpu=True)[:self.cores]):
+            values[f"cpu{i}"] = percent
+
+        # sensors_battery() is None on desktops and may be missing entirely
+        battery = ps.sensors_battery() if hasattr(ps, "sensors_battery") else None
+        values["battery"] = battery.percent if battery is not None else None
+        values["plugged"] = battery.power_plugged if battery is not None else None
+
+        disk = ps.disk_io_counters()
+        net = ps.net_io_counters()
+        io = (now,
+              disk.read_bytes if disk else 0, disk.write_bytes if disk else 0,
+              net.bytes_sent if net else 0, net.bytes_recv if net else 0)
+        if self._last_io is not None:
+            elapsed = max(now - self._last_io[0], 1e-6)
+            for name, current, previous in zip(("disk_read", "disk_write", "net_sent", "net_recv"),
+                                               io[1:], self._last_io[1:]):
+                values[name] = max(current - previous, 0) / elapsed
+        self._last_io = io
+        return now, values
+
+    def _record(self, now, values):
+        with self._lock:
+            self.timestamps.append(now)
+            for name, buffer in self.buffers.items():
+                value = values.get(name)
+                buffer.append(float("nan") if value is None else value)
+            for name, value in values.items():
+                shown = round(value, self.precision) if isinstance(value, float) else value
+                if name not in self._published or self._published[name] != shown:
+                    self._published[name] = shown
+                    self._changes[name] = shown
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._running.wait()
+            started = time.perf_counter()
+            try:
+                with timed("psutil.sample"):
+                    now, values = self.sample()
+            except Exception as e:
+                print(f"Error sampling metrics: {e}")
+            else:
+                self._record(now, values)
+                self.samples += 1
+            elapsed = time.perf_counter() - started
+            self.sample_seconds += elapsed
+            self._wake.wait(max(self.interval - elapsed, 0))
+            self._wake.clear()
+
+    def publish(self):
+        with self._lock:
+            changed, self._changes = self._changes, {}
+        if changed:
+            for callback in self._subscribers:
+                callback(changed)
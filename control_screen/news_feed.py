@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from news_view import article_key, dedupe
+from scheduler import TickScheduler
+
+
+NEWS_URL = "https://newsapi.org/v2/top-headlines"
+
+
+def newsapi_fetch(api_key, country="us"):
+    from http_client import get_client
+
+    def fetch():
+        # ttl=0 so every poll revalidates instead of reading a stale cached page
+        data = get_client().get_json(NEWS_URL, params={"country": country, "apiKey": api_key}, ttl=0)
+        return data.get('articles', [])
+    return fetch
+
+
+class NewsPoller:
+    """Polls a news source on a background thread and emits feed diffs.
+
+    New articles go on top of the retained feed, which is capped at
+    max_articles; the overflow is reported as removals. on_diff(inserted,
+    removed) runs on the Tk thread only when the feed actually changed and may
+    return how many widgets it touched for the refresh history. Diffs are
+    delivered by a TickScheduler task, so given the panel's scheduler they
+    wait while page is hidden; without one the poller runs its own.
+    """
+
+    def __init__(self, root, fetch, on_diff, interval=300, max_articles=200, poll_ms=250, on_error=None,
+                 scheduler=None, page=None):
+        self.root = root
+        self.fetch = fetch
+        self.on_diff = on_diff
+        self.on_error = on_error
+        self.interval = interval
+        self.max_articles = max_articles
+        self.poll_ms = poll_ms
+        self.scheduler = scheduler
+        self.page = page
+
+        self._keys = deque()
+        self._known = set()
+        self._results = queue.Queue()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.history = deque(maxlen=50)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="news-poller", daemon=True)
+            self._thread.start()
+            if self.scheduler is not None:
+                self.scheduler.add("news", self.publish, max(self.poll_ms / 1000, 1.0), page=self.page)
+            else:
+                self.scheduler = TickScheduler(self.root)
+                self.scheduler.add("news", self.publish, self.poll_ms / 1000)
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self.scheduler is not None:
+            self.scheduler.remove("news")
+
+    def seed(self, articles):
+        # A feed shown before the first fetch, newest first; the first diff is taken against it
+        for article in dedupe(articles):
+            key = article_key(article)
+            if key not in self._known:
+                self._keys.append(key)
+                self._known.add(key)
+
+    def refresh_now(self):
+        self._wake.set()
+
+    def diff(self, articles):
+        inserted = [article for article in dedupe(articles) if article_key(article) not in self._known]
+        for article in reversed(inserted):
+            key = article_key(article)
+            self._keys.appendleft(key)
+            self._known.add(key)
+        removed = []
+        while len(self._keys) > self.max_articles:
+            key = self._keys.pop()
+            self._known.discard(key)
+            removed.append(key)
+        # Articles pushed out straight away never need to reach the UI
+        dropped = {article_key(article) for article in inserted}.intersection(removed)
+        if dropped:
+            inserted = [article for article in inserted if article_key(article) not in dropped]
+            removed = [key for key in removed if key not in dropped]
+        return inserted, removed
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.thread_time()
+            try:
+                articles = self.fetch()
+            except Exception as e:
+                self._results.put((None, e, None))
+            else:
+                inserted, removed = self.diff(articles)
+                record = {
+                    "time": time.time(),
+                    "fetched": len(articles),
+                    "inserted": len(inserted),
+                    "removed": len(removed),
+                    "worker_cpu_ms": (time.thread_time() - started) * 1000,
+                }
+                self._results.put(((inserted, removed), None, record))
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def publish(self):
+        while True:
+            try:
+                diff, error, record = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # A failing callback is logged and the rest are still delivered
+            try:
+                if error is not None:
+                    if self.on_error:
+                        self.on_error(error)
+                    continue
+                inserted, removed = diff
+                started = time.thread_time()
+                touched = self.on_diff(inserted, removed) if inserted or removed else 0
+            except Exception as e:
+                print(f"Error delivering news: {e}")
+                continue
+            record["ui_cpu_ms"] = (time.thread_time() - started) * 1000
+            record["widgets_touched"] = touched
+            self.history.append(record)
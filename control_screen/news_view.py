@@ -0,0 +1,236 @@
+import bisect
+import math
+import tkinter.font as tkfont
+import webbrowser as wb
+from itertools import accumulate
+from tkinter import ttk
+
+
+TITLE_FONT = ('Segoe UI', 12, 'bold')
+BODY_FONT = ('Segoe UI', 12)
+
+
+def article_key(article):
+    return article.get('url') or article.get('title')
+
+
+def dedupe(articles):
+    seen = set()
+    unique = []
+    for article in articles:
+        key = article_key(article)
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+    return unique
+
+
+class _Row:
+    def __init__(self, canvas, wraplength, on_open):
+        self.on_open = on_open
+        self.url = None
+        self.index = None
+        self.y = None
+
+        self.frame = ttk.Frame(canvas, style='Card.TFrame')
+        self.title = ttk.Label(self.frame, font=TITLE_FONT, wraplength=wraplength)
+        self.title.pack(anchor='w')
+        self.description = ttk.Label(self.frame, wraplength=wraplength)
+        self.description.pack(anchor='w')
+        ttk.Button(self.frame, text="Read More", command=self.open).pack(anchor='e')
+        self.item = canvas.create_window(0, 0, window=self.frame, anchor='nw', state='hidden')
+
+    def show(self, article):
+        self.url = article.get('url')
+        self.title.configure(text=article.get('title') or '')
+        self.description.configure(text=article.get('description') or '')
+
+    def open(self):
+        if self.url:
+            self.on_open(self.url)
+
+
+class VirtualNewsList:
+    """News feed on a Canvas that only builds cards for the rows in view.
+
+    Rows outside the viewport plus overscan are hidden and reused for the rows
+    scrolled into view. Each article's height starts as an estimate from its
+    text length and is replaced by the measured height once it has been shown.
+    Cards stay bound to their article, so apply_diff only touches the cards of
+    inserted or removed articles.
+    """
+
+    def __init__(self, canvas, scrollbar, on_open=wb.open, wraplength=800, overscan=3, padx=10, pady=5):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.on_open = on_open
+        self.wraplength = wraplength
+        self.overscan = overscan
+        self.padx = padx
+        self.pady = pady
+
+        self.articles = []
+        self._keys = []
+        self._heights = []
+        self._offsets = [0]
+        self._height_cache = {}
+        self._rows = {}
+        self._free = []
+        self._measure_pending = False
+
+        self.rows_bound = 0
+        self.rows_released = 0
+
+        title_font = tkfont.Font(font=TITLE_FONT)
+        body_font = tkfont.Font(font=BODY_FONT)
+        sample = "the quick brown fox jumps over a lazy dog"
+        self._title_metrics = (title_font.metrics('linespace'), title_font.measure(sample) / len(sample))
+        self._body_metrics = (body_font.metrics('linespace'), body_font.measure(sample) / len(sample))
+        self._chrome = 36
+
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.configure(command=self.yview)
+        canvas.bind('<Configure>', self._on_configure)
+        canvas.bind('<MouseWheel>', lambda e: self.yview('scroll', int(-e.delta / 120), 'units'))
+        canvas.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        canvas.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+
+    @property
+    def widget_count(self):
+        return len(self._rows) + len(self._free)
+
+    def set_articles(self, articles):
+        self.articles = dedupe(articles)
+        self._keys = [article_key(article) for article in self.articles]
+        for row in self._rows.values():
+            self._release(row)
+        self._rows = {}
+        self._heights = [self._height_of(article) for article in self.articles]
+        self._update_offsets()
+        self.canvas.yview_moveto(0)
+        self.render()
+
+    def apply_diff(self, inserted, removed):
+        # inserted go on top of the feed, removed is a collection of article keys
+        removed = set(removed)
+        anchor = self._anchor()
+
+        kept = [i for i, key in enumerate(self._keys) if key not in removed]
+        self.articles = list(inserted) + [self.articles[i] for i in kept]
+        self._keys = [article_key(article) for article in inserted] + [self._keys[i] for i in kept]
+        self._heights = [self._height_of(article) for article in inserted] + [self._heights[i] for i in kept]
+        for key in removed:
+            self._height_cache.pop(key, None)
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._release(row)
+
+        self._update_offsets()
+        self._restore_anchor(anchor)
+        self.render()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def estimate(self, article):
+        title_line, title_char = self._title_metrics
+        body_line, body_char = self._body_metrics
+        title = article.get('title') or ''
+        description = article.get('description') or ''
+        title_lines = max(1, math.ceil(len(title) * title_char / self.wraplength))
+        body_lines = max(1, math.ceil(len(description) * body_char / self.wraplength))
+        return title_lines * title_line + body_lines * body_line + self._chrome + 2 * self.pady
+
+    def render(self):
+        count = len(self.articles)
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, bisect.bisect_right(self._offsets, top) - 1 - self.overscan)
+        last = min(count, bisect.bisect_left(self._offsets, bottom) + self.overscan)
+
+        visible = set(self._keys[first:last])
+        for key in [key for key in self._rows if key not in visible]:
+            self._release(self._rows.pop(key))
+
+        width = max(1, self.canvas.winfo_width() - 2 * self.padx)
+        for index in range(first, last):
+            key = self._keys[index]
+            row = self._rows.get(key)
+            if row is None:
+                row = self._free.pop() if self._free else _Row(self.canvas, self.wraplength, self.on_open)
+                row.show(self.articles[index])
+                self._rows[key] = row
+                self.rows_bound += 1
+                self.canvas.itemconfigure(row.item, state='normal', width=width)
+            if row.index != index or row.y != self._offsets[index]:
+                row.index = index
+                row.y = self._offsets[index]
+                self.canvas.coords(row.item, self.padx, row.y + self.pady)
+
+        if not self._measure_pending:
+            self._measure_pending = True
+            self.canvas.after_idle(self._measure)
+
+    def _anchor(self):
+        # First article in view and how far the viewport top sits into it
+        if not self._keys:
+            return None
+        top = self.canvas.canvasy(0)
+        index = min(len(self._keys) - 1, max(0, bisect.bisect_right(self._offsets, top) - 1))
+        return self._keys[index], top - self._offsets[index]
+
+    def _restore_anchor(self, anchor):
+        if anchor is None or self._offsets[-1] <= 0:
+            return
+        key, delta = anchor
+        try:
+            index = self._keys.index(key)
+        except ValueError:
+            return
+        top = self._offsets[index] + delta
+        if top > 0:
+            self.canvas.yview_moveto(top / self._offsets[-1])
+
+    def _on_configure(self, event):
+        width = max(1, event.width - 2 * self.padx)
+        for row in list(self._rows.values()) + self._free:
+            self.canvas.itemconfigure(row.item, width=width)
+        self.canvas.configure(scrollregion=(0, 0, event.width, self._offsets[-1]))
+        self.render()
+
+    def _release(self, row):
+        self.canvas.itemconfigure(row.item, state='hidden')
+        row.index = None
+        row.y = None
+        self.rows_released += 1
+        self._free.append(row)
+
+    def _height_of(self, article):
+        height = self._height_cache.get(article_key(article))
+        return height if height is not None else self.estimate(article)
+
+    def _update_offsets(self):
+        self._offsets = [0]
+        self._offsets.extend(accumulate(self._heights))
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, self._offsets[-1]))
+
+    def _measure(self):
+        # Swap estimates for real heights once Tk has laid the visible cards out
+        self._measure_pending = False
+        changed = False
+        for key, row in self._rows.items():
+            height = row.frame.winfo_reqheight() + 2 * self.pady
+            if height <= 2 * self.pady or row.index is None:
+                continue
+            if not self._height_cache:
+                # Calibrate the estimate's fixed part against the first real card
+                self._chrome += height - self.estimate(self.articles[row.index])
+            self._height_cache[key] = height
+            if self._heights[row.index] != height:
+                self._heights[row.index] = height
+                changed = True
+        if changed:
+            self._update_offsets()
+            self.render()
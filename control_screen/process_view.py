@@ -0,0 +1,71 @@
+from tkinter import ttk
+
+
+COLUMNS = [("pid", "PID", 70), ("name", "Name", 220), ("cpu", "CPU %", 80), ("memory", "Memory MB", 100),
+           ("io", "I/O KB/s", 100)]
+# Columns that reorder the table when their heading is clicked
+SORTABLE = {"cpu", "memory", "io"}
+
+
+def format_row(row):
+    return (row["pid"], row["name"],
+            f"{row['cpu']:.1f}" if row["cpu"] is not None else "--",
+            f"{row['memory'] / 2 ** 20:.1f}" if row["memory"] is not None else "--",
+            f"{row['io'] / 1024:.1f}" if row["io"] is not None else "--")
+
+
+class ProcessPanel:
+    """Table of the top processes, one row per pid.
+
+    show() moves, rewrites, inserts or deletes only the rows that changed,
+    so a selected process keeps its row as it moves up and down the table.
+    """
+
+    def __init__(self, parent, on_sort=None, height=10):
+        self.tree = ttk.Treeview(parent, columns=[key for key, _, _ in COLUMNS], show="headings", height=height)
+        for key, title, width in COLUMNS:
+            if key in SORTABLE and on_sort is not None:
+                self.tree.heading(key, text=title, command=lambda key=key: on_sort(key))
+            else:
+                self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="w" if key == "name" else "e")
+        self.tree.pack(fill="both", expand=True)
+
+        self._rows = {}
+        self._shown = {}
+        self._order = []
+        self.touched = 0
+
+    def show(self, rows):
+        """Bring the table in line with rows, returning how many rows were touched."""
+        touched = 0
+        keep = {row["pid"] for row in rows}
+        for pid in [pid for pid in self._order if pid not in keep]:
+            self.tree.delete(self._rows.pop(pid))
+            del self._shown[pid]
+            touched += 1
+        order = [pid for pid in self._order if pid in keep]
+
+        for index, row in enumerate(rows):
+            pid = row["pid"]
+            values = format_row(row)
+            if pid not in self._rows:
+                self._rows[pid] = self.tree.insert("", index, values=values)
+                order.insert(index, pid)
+                touched += 1
+            else:
+                changed = False
+                if order[index] != pid:
+                    self.tree.move(self._rows[pid], "", index)
+                    order.remove(pid)
+                    order.insert(index, pid)
+                    changed = True
+                if self._shown[pid] != values:
+                    self.tree.item(self._rows[pid], values=values)
+                    changed = True
+                touched += changed
+            self._shown[pid] = values
+
+        self._order = order
+        self.touched += touched
+        return touched
@@ -0,0 +1,199 @@
+import heapq
+import queue
+import threading
+import time
+
+from instrumentation import timed
+from scheduler import TickScheduler
+
+
+# The one attribute each ordering reads from every process
+KEYS = {"cpu": "cpu_percent", "memory": "memory_info", "io": "io_counters"}
+# The rest, read for the top rows only
+DETAILS = ["name", "cpu_percent", "memory_info", "io_counters"]
+
+
+class ProcessSampler:
+    """The top processes by CPU, memory or I/O, sampled on a background thread.
+
+    Every walk_every samples, process_iter is walked reading only the
+    attribute the table is ordered by, and a heap keeps the leading
+    candidates; the samples in between re-read just those cached Process
+    objects. The other columns are read for the top count rows alone.
+    Because the same Process objects are sampled each time, CPU percentages
+    and I/O rates are deltas against their previous reading. A sample is
+    taken only after the previous one has been published, which a
+    TickScheduler task does, the panel's if given (so the sampler idles while
+    page is hidden) or one of the sampler's own.
+    """
+
+    def __init__(self, root, on_sample, count=25, key="cpu", interval=2.0, walk_every=3, candidates=None, ps=None,
+                 scheduler=None, page=None):
+        if ps is None:
+            import psutil as ps
+        if key not in KEYS:
+            raise ValueError(f"Unknown process ordering: {key}")
+        self.root = root
+        self.on_sample = on_sample
+        self.count = count
+        self.key = key
+        self.interval = interval
+        self.walk_every = walk_every
+        self.candidates = candidates or count * 4
+        self.ps = ps
+        self.scheduler = scheduler
+        self.page = page
+
+        self._io = {}
+        self._candidates = []
+        self._walked_key = None
+        self._since_walk = 0
+        self._results = queue.Queue()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.samples = 0
+        self.sample_seconds = 0.0
+        self.sample_cpu = 0.0
+        self.walks = 0
+        self.scanned = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="processes", daemon=True)
+            self._thread.start()
+            self._wake.set()
+            if self.scheduler is None:
+                self.scheduler = TickScheduler(self.root)
+            self.scheduler.add("processes", self.publish, self.interval, page=self.page)
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self.scheduler is not None:
+            self.scheduler.remove("processes")
+
+    def set_key(self, key):
+        if key not in KEYS:
+            raise ValueError(f"Unknown process ordering: {key}")
+        self.key = key
+        self._wake.set()
+
+    def sample(self):
+        key = self.key
+        attr = KEYS[key]
+        now = time.monotonic()
+        walk = key != self._walked_key or self._since_walk + 1 >= self.walk_every
+        io = {}
+        if walk:
+            readings = self._walk(attr)
+            self._walked_key = key
+            self._since_walk = 0
+            self.walks += 1
+        else:
+            readings = self._recheck(attr)
+            self._since_walk += 1
+        scanned = 0
+
+        def scored():
+            nonlocal scanned
+            for proc, value in readings:
+                scanned += 1
+                if value is None:
+                    continue
+                if key == "cpu":
+                    score = value
+                elif key == "memory":
+                    score = value.rss
+                else:
+                    score = self._io_rate(io, proc, value, now) or 0.0
+                yield score, proc.pid, proc, value
+
+        ranked = heapq.nlargest(self.candidates, scored())
+        self._candidates = [proc for _, _, proc, _ in ranked]
+
+        rows = []
+        for _, pid, proc, value in ranked[:self.count]:
+            try:
+                info = proc.as_dict([name for name in DETAILS if name != attr], ad_value=None)
+            except self.ps.NoSuchProcess:
+                continue
+            info[attr] = value
+            memory = info["memory_info"]
+            counters = info["io_counters"]
+            rows.append({
+                "pid": pid,
+                "name": info["name"] or "",
+                "cpu": info["cpu_percent"],
+                "memory": memory.rss if memory is not None else None,
+                "io": io[pid][2] if pid in io else self._io_rate(io, proc, counters, now),
+            })
+        # I/O counters of processes that are gone or out of the running are dropped on every walk
+        self._io = io if walk else {**self._io, **io}
+        self.scanned = scanned
+        return rows
+
+    def _walk(self, attr):
+        # Every process, reading attr alone
+        for proc in self.ps.process_iter([attr], ad_value=None):
+            yield proc, proc.info[attr]
+
+    def _recheck(self, attr):
+        # Only the candidates kept from the last walk
+        for proc in self._candidates:
+            try:
+                yield proc, proc.as_dict([attr], ad_value=None)[attr]
+            except self.ps.NoSuchProcess:
+                continue
+
+    def _io_rate(self, io, proc, counters, now):
+        # Bytes a second since the previous sample of this same process, None on its first
+        if counters is None:
+            return None
+        total = counters.read_bytes + counters.write_bytes
+        previous = self._io.get(proc.pid)
+        rate = None
+        if previous is not None and previous[0] is proc:
+            rate = max(total - previous[1], 0) / max(now - previous[3], 1e-6)
+        io[proc.pid] = (proc, total, rate, now)
+        return rate
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            started, cpu = time.perf_counter(), time.thread_time()
+            try:
+                with timed("psutil.process_iter"):
+                    rows = self.sample()
+            except Exception as e:
+                print(f"Error sampling processes: {e}")
+                # Still published, so the next sample is asked for as usual
+                self._results.put(None)
+            else:
+                self._results.put(rows)
+                self.samples += 1
+            self.sample_seconds += time.perf_counter() - started
+            self.sample_cpu += time.thread_time() - cpu
+
+    def publish(self):
+        # None in the queue is a failed sample: nothing to show, but the sampler is due again all the same
+        taken = False
+        rows = None
+        while True:
+            try:
+                rows = self._results.get_nowait()
+            except queue.Empty:
+                break
+            taken = True
+        if not taken:
+            return
+        try:
+            if rows is not None:
+                self.on_sample(rows)
+        finally:
+            # The next sample is due a period from now, and only if this page is still shown then
+            self._wake.set()
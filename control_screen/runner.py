@@ -0,0 +1,142 @@
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from dispatch import dispatcher_for
+
+
+_DEFAULT = object()
+
+
+class _Run:
+    def __init__(self, args, name, timeout, on_output, on_exit):
+        self.args = args
+        self.name = name or (args[0] if isinstance(args, (list, tuple)) else str(args).split()[0])
+        self.timeout = timeout
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.future = Future()
+        self.process = None
+        self.cancelled = False
+        self.submitted = time.perf_counter()
+
+    def cancel(self):
+        # Kills the process if it is running, or stops it from starting
+        self.cancelled = True
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def wait(self, timeout=None):
+        return self.future.result(timeout)
+
+
+class CommandRunner:
+    """Runs external commands off the Tk thread, at most max_concurrent at once.
+
+    Each command gets a timeout (default_timeout unless given, None for none)
+    after which it is killed. stdout and stderr lines go to on_output(stream,
+    line) as they arrive and on_exit(result) gets the exit status, timings and
+    the tail of the output. With a root these callbacks run on the Tk thread
+    through its TkDispatcher; without one they run on the worker threads.
+    """
+
+    def __init__(self, root=None, max_concurrent=4, default_timeout=30.0, keep_lines=200):
+        self.root = root
+        self.max_concurrent = max_concurrent
+        self.default_timeout = default_timeout
+        self.keep_lines = keep_lines
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="runner")
+        self._dispatcher = dispatcher_for(root) if root is not None else None
+        self._lock = threading.Lock()
+        self._active = 0
+
+        self.history = deque(maxlen=100)
+        self.completed = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def run(self, args, timeout=_DEFAULT, name=None, on_output=None, on_exit=None):
+        run = _Run(args, name, self.default_timeout if timeout is _DEFAULT else timeout, on_output, on_exit)
+        with self._lock:
+            self._active += 1
+        self._pool.submit(self._supervise, run)
+        if self._dispatcher is not None:
+            self._dispatcher.watch(self)
+        return run
+
+    @property
+    def busy(self):
+        return self._active > 0
+
+    def stats(self):
+        return {
+            "active": self._active,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # Worker side
+    def _deliver(self, callback, *args):
+        if callback is None:
+            return
+        if self._dispatcher is None:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in command callback: {e}")
+        else:
+            self._dispatcher.post(callback, *args)
+
+    def _pump(self, run, stream, name, tail):
+        for line in stream:
+            line = line.rstrip("\r\n")
+            tail.append((name, line))
+            self._deliver(run.on_output, name, line)
+        stream.close()
+
+    def _supervise(self, run):
+        started = time.perf_counter()
+        result = {"name": run.name, "args": run.args, "returncode": None, "timed_out": False,
+                  "error": None, "queued_ms": (started - run.submitted) * 1000}
+        tail = deque(maxlen=self.keep_lines)
+        try:
+            if run.cancelled:
+                raise RuntimeError("Cancelled before it started")
+            run.process = subprocess.Popen(run.args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                           stdin=subprocess.DEVNULL, text=True, errors="replace")
+            pumps = [threading.Thread(target=self._pump, args=(run, stream, name, tail), daemon=True)
+                     for stream, name in ((run.process.stdout, "stdout"), (run.process.stderr, "stderr"))]
+            for pump in pumps:
+                pump.start()
+            try:
+                result["returncode"] = run.process.wait(run.timeout)
+            except subprocess.TimeoutExpired:
+                result["timed_out"] = True
+                run.process.kill()
+                result["returncode"] = run.process.wait()
+            for pump in pumps:
+                pump.join(1.0)
+        except Exception as e:
+            result["error"] = str(e)
+
+        result["latency_ms"] = (time.perf_counter() - started) * 1000
+        result["output"] = list(tail)
+        self.history.append(result)
+        # Posted before the command stops counting as active, so the Tk poll cannot miss it
+        self._deliver(run.on_exit, result)
+        with self._lock:
+            self._active -= 1
+            self.completed += 1
+            if result["timed_out"]:
+                self.timeouts += 1
+            if result["error"] is not None or result["returncode"]:
+                self.failures += 1
+        run.future.set_result(result)
@@ -2,24 +2,22 @@ import tkinter as tk
 from tkinter import *
 from tkinter import ttk, messagebox, filedialog
 import platform
-import psutil
-import screen_brightness_control as sbc
 import ctypes
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 from time import strftime
-import tkcalendar
-from tkcalendar import *
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
 from datetime import datetime
-import requests
-import pytz
-import pyautogui
-import subprocess
 import webbrowser as wb
 import random
+from actuator import Actuator, VolumeBackend
+from audio_session import get_session
+from capture import FILETYPES, ScreenshotService
+from displays import DisplayManager
+from http_client import get_client
+from lazy_imports import lazy, prewarm
+from runner import CommandRunner
+from scheduler import TickScheduler
+
+# Heavy dependencies load on first use
+psutil = lazy("psutil")
 
 # Initialize Tkinter Window
 root = Tk()
@@ -28,25 +26,40 @@ root.geometry("850x500+300+170")
 root.resizable(False, False)
 root.configure(bg="#292e2e")
 
-# Brightness Control
+# Brightness Control, every monitor is set in parallel
+displays = DisplayManager().start()
+
 def set_brightness(value):
-    sbc.set_brightness(int(value))
+    displays.set(int(float(value)))
 
 ttk.Label(root, text="Brightness:", background="#292e2e", foreground="white").place(x=30, y=20)
-brightness_slider = ttk.Scale(root, from_=0, to=100, orient=HORIZONTAL, command=set_brightness)
-brightness_slider.set(sbc.get_brightness()[0])
+# Shows the first display's cached level; a variable so showing it does not set every display
+brightness_level = IntVar(value=0)
+brightness_slider = ttk.Scale(root, from_=0, to=100, orient=HORIZONTAL, variable=brightness_level,
+                              command=set_brightness)
 brightness_slider.place(x=120, y=20)
 
+def show_brightness():
+    # 0 until the monitors have been enumerated in the background, then their level
+    if displays.ready(0):
+        brightness_level.set(displays.level() or 0)
+    else:
+        root.after(100, show_brightness)
+
+show_brightness()
+
 # Volume Control
+audio = get_session()
+volume_actuator = Actuator(VolumeBackend(audio, scale=0.01), max_rate=20, tolerance=0.5, name="volume")
+
 def set_volume(value):
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume = cast(interface, POINTER(IAudioEndpointVolume))
-    volume.SetMasterVolumeLevelScalar(float(value) / 100, None)
+    volume_actuator.request(float(value))
 
 ttk.Label(root, text="Volume:", background="#292e2e", foreground="white").place(x=30, y=60)
 volume_slider = ttk.Scale(root, from_=0, to=100, orient=HORIZONTAL, command=set_volume)
-volume_slider.set(50)
+current_volume = audio.get_level() * 100
+volume_actuator.seed(current_volume)
+volume_slider.set(current_volume)
 volume_slider.place(x=120, y=60)
 
 # System Info
@@ -56,33 +69,37 @@ def system_info():
 
 ttk.Button(root, text="System Info", command=system_info).place(x=30, y=100)
 
-# Date & Time
+# Date & Time, paused while the window is minimized
+scheduler = TickScheduler(root)
+
 def show_time():
     time_label.config(text=strftime('%H:%M:%S'))
-    root.after(1000, show_time)
 
 time_label = Label(root, font=('calibri', 12), background='#292e2e', foreground='white')
 time_label.place(x=30, y=150)
-show_time()
+scheduler.add("clock", show_time, 1.0)
 
 # Weather Functionality
 def get_weather():
     city = "London"  # You can modify this to get user input
     api_key = "your_api_key"  # Replace with your OpenWeatherMap API key
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-    response = requests.get(url).json()
+    url = "http://api.openweathermap.org/data/2.5/weather"
+    response = get_client().get_json(url, params={"q": city, "appid": api_key, "units": "metric"})
     weather_info = f"{city}\nTemp: {response['main']['temp']}°C\nWeather: {response['weather'][0]['description']}"
     messagebox.showinfo("Weather Info", weather_info)
 
 ttk.Button(root, text="Weather", command=get_weather).place(x=30, y=200)
 
-# Screenshot Function
+# Screenshot Function, captured and encoded off the Tk thread
+screenshots = ScreenshotService(root)
+
 def take_screenshot():
-    screenshot = pyautogui.screenshot()
-    filepath = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png")])
+    # Pick the file first and capture once the dialog is off the screen
+    filepath = filedialog.asksaveasfilename(defaultextension=".png", filetypes=FILETYPES)
     if filepath:
-        screenshot.save(filepath)
-        messagebox.showinfo("Success", "Screenshot saved successfully!")
+        screenshots.capture(filepath, delay=0.2,
+                            on_done=lambda result: messagebox.showinfo("Success", "Screenshot saved successfully!"),
+                            on_error=lambda e: messagebox.showerror("Error", f"Screenshot failed: {e}"))
 
 ttk.Button(root, text="Screenshot", command=take_screenshot).place(x=30, y=250)
 
@@ -92,11 +109,18 @@ def open_browser():
 
 ttk.Button(root, text="Open Browser", command=open_browser).place(x=30, y=300)
 
-# Open Calculator
+# Open Calculator, external commands run without blocking the window
+runner = CommandRunner(root)
+
+def calculator_exited(result):
+    if result["error"]:
+        messagebox.showerror("Error", f"Could not open the calculator: {result['error']}")
+
 def open_calculator():
-    subprocess.run("calc")
+    runner.run(["calc"], timeout=None, on_exit=calculator_exited)
 
 ttk.Button(root, text="Calculator", command=open_calculator).place(x=30, y=350)
 
 # Mainloop
+prewarm(root)
 root.mainloop()
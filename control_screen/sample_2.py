@@ -1,27 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import platform
-import psutil
-import screen_brightness_control as sbc
 import ctypes
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 from time import strftime
-from tkcalendar import Calendar
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
 from datetime import datetime
-import requests
-import pytz
-import pyautogui
-import subprocess
 import webbrowser as wb
 import random
+from capture import FILETYPES, ScreenshotService
+from control_daemon import DEFAULT_ADDRESS, ControlBridge
+from controller import Controller
+from diagnostics_view import DiagnosticsPanel
+from instrumentation import LagProbe
+from lazy_imports import lazy, prewarm
+from lazy_tabs import LazyNotebook
+from metrics import MetricsSampler
+from process_view import ProcessPanel
+from processes import ProcessSampler
+from runner import CommandRunner
+from scheduler import TickScheduler
+from timelapse import TimelapseRecorder
+from weather_service import WeatherService
+
+# Heavy dependencies load on first use
+tkcalendar = lazy("tkcalendar")
 
 
 class ScreenController:
-    def __init__(self, root):
+    def __init__(self, root, controller_factory=Controller, control_address=DEFAULT_ADDRESS, ps=None):
+        # The backends default to the real ones, the benchmarks pass fakes
         self.root = root
         self.root.title("Advanced Screen Controller")
         self.root.geometry("1200x800")
@@ -30,34 +36,49 @@ class ScreenController:
         self.style = ttk.Style()
         self.style.theme_use('clam')
 
-        self.setup_audio()
+        self.setup_control(controller_factory, control_address)
+        self.weather_service = WeatherService(self.root, api_key="YOUR_OPENWEATHER_API_KEY")
+        self.runner = CommandRunner(self.root)
+        # Screenshots of this screen are taken here, not through the daemon
+        self.screenshots = ScreenshotService(self.root)
         self.create_widgets()
-        self.update_clock()
-        self.update_system_info()
-
-    def setup_audio(self):
-        self.devices = AudioUtilities.GetSpeakers()
-        self.interface = self.devices.Activate(
-            IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        self.volume = cast(self.interface, POINTER(IAudioEndpointVolume))
+        self.setup_scheduler()
+        self.setup_metrics(ps)
+        self.setup_processes(ps)
+        prewarm(self.root)
+
+    def setup_control(self, controller_factory=Controller, address=DEFAULT_ADDRESS):
+        # The panel is one client of the control daemon, started here unless one is already running
+        self.control = ControlBridge(self.root)
+        self.control.on_event(self.on_control_event)
+        self.control.connect(controller_factory, address, wait=True)
+
+    def on_control_event(self, event, value):
+        # Changes made by other clients of the daemon
+        if event == "brightness" and hasattr(self, "brightness"):
+            self.show_brightness(value)
+        elif event == "display" and value["display"] in getattr(self, "display_levels", {}):
+            self.display_levels[value["display"]].set(value["value"])
+        elif event == "volume" and hasattr(self, "vol_level"):
+            self.vol_level.set(value)
 
     def create_widgets(self):
         self.create_notebook()
-        self.create_system_tab()
-        self.create_brightness_tab()
-        self.create_volume_tab()
-        self.create_calendar_tab()
-        self.create_weather_tab()
-        self.create_screen_tab()
+        # Pages are built on first view, only the visible one is built now
+        self.system_page = self.notebook.add_page("System Info", self.create_system_tab)
+        self.notebook.add_page("Brightness", self.create_brightness_tab)
+        self.notebook.add_page("Volume Control", self.create_volume_tab)
+        self.notebook.add_page("Calendar", self.create_calendar_tab)
+        self.notebook.add_page("Weather", self.create_weather_tab)
+        self.screen_page = self.notebook.add_page("Screen Control", self.create_screen_tab)
+        self.diagnostics_page = self.notebook.add_page("Diagnostics", self.create_diagnostics_tab)
+        self.notebook.build(self.notebook.select())
 
     def create_notebook(self):
-        self.notebook = ttk.Notebook(self.root)
+        self.notebook = LazyNotebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True)
 
-    def create_system_tab(self):
-        system_frame = ttk.Frame(self.notebook)
-        self.notebook.add(system_frame, text="System Info")
-
+    def create_system_tab(self, system_frame):
         # System information labels
         ttk.Label(system_frame, text="OS Version:").grid(row=0, column=0, padx=10, pady=5)
         self.os_label = ttk.Label(system_frame, text=platform.platform())
@@ -76,51 +97,61 @@ class ScreenController:
         self.clock_label.grid(row=3, column=0, columnspan=2, pady=20)
 
         # System controls
-        ttk.Button(system_frame, text="Shutdown", command=lambda: subprocess.call(["shutdown", "/s"])).grid(row=4,
-                                                                                                            column=0,
-                                                                                                            pady=10)
-        ttk.Button(system_frame, text="Restart", command=lambda: subprocess.call(["shutdown", "/r"])).grid(row=4,
-                                                                                                           column=1,
-                                                                                                           pady=10)
-
-    def create_brightness_tab(self):
-        brightness_frame = ttk.Frame(self.notebook)
-        self.notebook.add(brightness_frame, text="Brightness")
-
-        self.brightness = tk.IntVar(value=sbc.get_brightness()[0])
+        ttk.Button(system_frame, text="Shutdown",
+                   command=lambda: self.run_system_command(["shutdown", "/s"])).grid(row=4, column=0, pady=10)
+        ttk.Button(system_frame, text="Restart",
+                   command=lambda: self.run_system_command(["shutdown", "/r"])).grid(row=4, column=1, pady=10)
+        self.command_label = ttk.Label(system_frame, text="", wraplength=500)
+        self.command_label.grid(row=5, column=0, columnspan=2, pady=5)
+
+        # Top processes, ordered by the clicked column
+        ttk.Label(system_frame, text="Top Processes:").grid(row=6, column=0, columnspan=2, pady=5)
+        process_frame = ttk.Frame(system_frame)
+        process_frame.grid(row=7, column=0, columnspan=2, padx=10, pady=5, sticky="nsew")
+        self.process_panel = ProcessPanel(process_frame, on_sort=lambda key: self.processes.set_key(key))
+
+    def create_brightness_tab(self, brightness_frame):
+        self.brightness = tk.IntVar()
         ttk.Label(brightness_frame, text="Screen Brightness").pack(pady=10)
         ttk.Scale(brightness_frame, variable=self.brightness, from_=0, to=100,
-                  command=lambda e: sbc.set_brightness(self.brightness.get())).pack(pady=10)
+                  command=lambda e: self.set_brightness(self.brightness.get())).pack(pady=10)
+        self.control.send("brightness.get", callback=self.brightness.set)
 
         ttk.Button(brightness_frame, text="Random Brightness",
                    command=self.set_random_brightness).pack(pady=10)
 
-    def create_volume_tab(self):
-        volume_frame = ttk.Frame(self.notebook)
-        self.notebook.add(volume_frame, text="Volume Control")
-
+        # One slider per monitor, added once the daemon has listed them
+        self.display_frame = ttk.Frame(brightness_frame)
+        self.display_frame.pack(pady=10)
+        self.display_levels = {}
+        self.control.send("displays.list", callback=self.create_display_sliders)
+
+    def create_display_sliders(self, displays):
+        for row, display in enumerate(displays):
+            level = tk.IntVar(value=display["level"] or 0)
+            ttk.Label(self.display_frame, text=display["name"]).grid(row=row, column=0, padx=10, pady=5, sticky="w")
+            ttk.Scale(self.display_frame, variable=level, from_=0, to=100,
+                      command=lambda e, display=display["id"], level=level: self.control.send(
+                          "display.set", display=display, value=level.get())).grid(row=row, column=1, padx=10)
+            self.display_levels[display["id"]] = level
+
+    def create_volume_tab(self, volume_frame):
         self.vol_level = tk.DoubleVar()
         ttk.Label(volume_frame, text="Master Volume").pack(pady=10)
         ttk.Scale(volume_frame, variable=self.vol_level, from_=0, to=1,
                   command=self.set_volume).pack(pady=10)
-        self.vol_level.set(self.volume.GetMasterVolumeLevelScalar())
-
-    def create_calendar_tab(self):
-        calendar_frame = ttk.Frame(self.notebook)
-        self.notebook.add(calendar_frame, text="Calendar")
+        self.control.send("volume.get", callback=self.vol_level.set)
 
-        self.cal = Calendar(calendar_frame, selectmode='day',
-                            year=datetime.now().year, month=datetime.now().month,
-                            day=datetime.now().day)
+    def create_calendar_tab(self, calendar_frame):
+        self.cal = tkcalendar.Calendar(calendar_frame, selectmode='day',
+                                       year=datetime.now().year, month=datetime.now().month,
+                                       day=datetime.now().day)
         self.cal.pack(pady=20)
 
         ttk.Button(calendar_frame, text="Get Date",
                    command=lambda: messagebox.showinfo("Selected Date", self.cal.get_date())).pack()
 
-    def create_weather_tab(self):
-        weather_frame = ttk.Frame(self.notebook)
-        self.notebook.add(weather_frame, text="Weather")
-
+    def create_weather_tab(self, weather_frame):
         ttk.Label(weather_frame, text="Enter City:").pack(pady=5)
         self.city_entry = ttk.Entry(weather_frame)
         self.city_entry.pack(pady=5)
@@ -129,42 +160,106 @@ class ScreenController:
         self.weather_label = ttk.Label(weather_frame, text="")
         self.weather_label.pack(pady=10)
 
-    def create_screen_tab(self):
-        screen_frame = ttk.Frame(self.notebook)
-        self.notebook.add(screen_frame, text="Screen Control")
+        self.geo_cache_label = ttk.Label(weather_frame, text="")
+        self.geo_cache_label.pack(pady=5)
+
+        # Watchlist refreshed in one concurrent batch
+        ttk.Label(weather_frame, text="Watchlist (comma separated):").pack(pady=5)
+        self.watchlist_entry = ttk.Entry(weather_frame, width=40)
+        self.watchlist_entry.insert(0, "London, New York, Tokyo")
+        self.watchlist_entry.pack(pady=5)
+
+        ttk.Button(weather_frame, text="Refresh Watchlist", command=self.refresh_watchlist).pack(pady=10)
+        self.watchlist_label = ttk.Label(weather_frame, text="", justify=tk.LEFT)
+        self.watchlist_label.pack(pady=10)
 
+    def create_diagnostics_tab(self, diagnostics_frame):
+        # Backend call latencies and event-loop stalls, from the instrumentation layer
+        self.diagnostics = DiagnosticsPanel(diagnostics_frame)
+        self.diagnostics.refresh()
+
+    def create_screen_tab(self, screen_frame):
         ttk.Button(screen_frame, text="Take Screenshot",
                    command=self.take_screenshot).pack(pady=10)
 
+        # Timelapse, one frame every 5 seconds storing only the changed tiles
+        self.timelapse = None
+        self.timelapse_button = ttk.Button(screen_frame, text="Start Timelapse", command=self.toggle_timelapse)
+        self.timelapse_button.pack(pady=10)
+        self.timelapse_label = ttk.Label(screen_frame, text="")
+        self.timelapse_label.pack(pady=5)
+
         ttk.Button(screen_frame, text="Search Web",
                    command=self.search_web).pack(pady=10)
 
         self.search_entry = ttk.Entry(screen_frame)
         self.search_entry.pack(pady=10)
 
+    def run_system_command(self, args):
+        self.command_label.config(text=" ".join(args))
+        self.runner.run(args, timeout=15, on_output=self.show_command_output, on_exit=self.system_command_exited)
+
+    def show_command_output(self, stream, line):
+        if line:
+            self.command_label.config(text=line)
+
+    def system_command_exited(self, result):
+        if result["error"] or result["timed_out"] or result["returncode"]:
+            reason = result["error"] or ("timed out" if result["timed_out"] else f"exit code {result['returncode']}")
+            self.command_label.config(text=f"{result['name']} failed: {reason}")
+
     def set_volume(self, value):
-        self.volume.SetMasterVolumeLevelScalar(float(value), None)
+        self.control.send("volume.set", value=float(value))
+
+    def set_brightness(self, value):
+        self.control.send("brightness.set", value=value)
+        self.show_brightness(value)
+
+    def show_brightness(self, value):
+        # The master slider and every display's follow a change to all displays
+        self.brightness.set(value)
+        for level in self.display_levels.values():
+            level.set(value)
 
     def set_random_brightness(self):
-        random_brightness = random.randint(0, 100)
-        self.brightness.set(random_brightness)
-        sbc.set_brightness(random_brightness)
+        self.set_brightness(random.randint(0, 100))
+
+    def setup_scheduler(self):
+        # Every periodic task shares one timer and stops while its page or the window is hidden
+        self.scheduler = TickScheduler(self.root, self.notebook)
+        self.scheduler.add("control-events", self.control.drain_events, 1.0)
+        self.scheduler.add("clock", self.update_clock, 1.0, page=self.system_page)
+        self.scheduler.add("diagnostics", lambda: self.diagnostics.refresh(), 2.0, page=self.diagnostics_page)
+
+        # Measures root.after drift while the window is shown
+        self.lag_probe = LagProbe(self.root, scheduler=self.scheduler)
+        self.lag_probe.start()
 
     def update_clock(self):
         current_time = strftime('%H:%M:%S %p')
         self.clock_label.config(text=current_time)
-        self.root.after(1000, self.update_clock)
 
-    def update_system_info(self):
+    def setup_metrics(self, ps=None):
+        # Sampled on a background thread, only changed values reach the labels
+        self.metrics = MetricsSampler(self.root, interval=2.0, ps=ps, scheduler=self.scheduler, page=self.system_page)
+        self.metrics.subscribe(self.update_system_info)
+        self.metrics.start()
+
+    def setup_processes(self, ps=None):
+        # Sampled only while the System Info page is shown
+        self.processes = ProcessSampler(self.root, lambda rows: self.process_panel.show(rows), count=15,
+                                        interval=2.0, ps=ps, scheduler=self.scheduler, page=self.system_page)
+        self.processes.start()
+
+    def update_system_info(self, changed):
         # Update battery information
-        battery = psutil.sensors_battery()
-        self.battery_label.config(text=f"{battery.percent}%")
+        if "battery" in changed:
+            battery = changed["battery"]
+            self.battery_label.config(text=f"{battery}%" if battery is not None else "No battery")
 
         # Update CPU usage
-        cpu_usage = psutil.cpu_percent()
-        self.cpu_label.config(text=f"{cpu_usage}%")
-
-        self.root.after(2000, self.update_system_info)
+        if "cpu" in changed:
+            self.cpu_label.config(text=f"{changed['cpu']}%")
 
     def get_weather(self):
         city = self.city_entry.get()
@@ -172,38 +267,87 @@ class ScreenController:
             messagebox.showerror("Error", "Please enter a city name")
             return
 
-        try:
-            geolocator = Nominatim(user_agent="screen_controller")
-            location = geolocator.geocode(city)
-
-            tf = TimezoneFinder()
-            timezone_str = tf.timezone_at(lng=location.longitude, lat=location.latitude)
-
-            timezone = pytz.timezone(timezone_str)
-            local_time = datetime.now(timezone).strftime("%H:%M:%S")
-
-            api_key = "YOUR_OPENWEATHER_API_KEY"
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-            response = requests.get(url)
-            data = response.json()
-
-            weather_info = (
-                f"Temperature: {data['main']['temp']}°C\n"
-                f"Weather: {data['weather'][0]['description']}\n"
-                f"Humidity: {data['main']['humidity']}%\n"
-                f"Local Time: {local_time}"
-            )
-            self.weather_label.config(text=weather_info)
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not retrieve data: {str(e)}")
+        # Runs off the Tk thread, a newer city supersedes any lookup still in flight
+        self.weather_service.request(city, on_result=self.show_weather, on_error=self.weather_failed,
+                                     on_start=lambda c: self.weather_label.config(
+                                         text=f"Fetching weather for {c}..."))
+
+    def show_weather(self, data):
+        weather_info = (
+            f"Temperature: {data['temp']}°C\n"
+            f"Weather: {data['description']}\n"
+            f"Humidity: {data['humidity']}%\n"
+            f"Local Time: {data['local_time']}"
+        )
+        self.weather_label.config(text=weather_info)
+        self.update_geo_cache_stats()
+
+    def weather_failed(self, error):
+        self.weather_label.config(text="")
+        self.update_geo_cache_stats()
+        messagebox.showerror("Error", f"Could not retrieve data: {str(error)}")
+
+    def refresh_watchlist(self):
+        cities = [city.strip() for city in self.watchlist_entry.get().split(",") if city.strip()]
+        if not cities:
+            return
+        self.watchlist_label.config(text="Refreshing watchlist...")
+        self.weather_service.refresh_watchlist(cities, self.show_watchlist)
+
+    def show_watchlist(self, results):
+        lines = []
+        for city, data in results.items():
+            if isinstance(data, Exception):
+                lines.append(f"{city}: unavailable ({data})")
+            else:
+                lines.append(f"{city}: {data['temp']}°C, {data['description']}")
+        self.watchlist_label.config(text="\n".join(lines))
+
+    def update_geo_cache_stats(self):
+        stats = self.weather_service.resolver.stats()
+        self.geo_cache_label.config(
+            text=f"Location cache: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} cities)")
 
     def take_screenshot(self):
-        file_path = filedialog.asksaveasfilename(defaultextension=".png",
-                                                 filetypes=[("PNG files", "*.png")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=FILETYPES)
         if file_path:
-            screenshot = pyautogui.screenshot()
-            screenshot.save(file_path)
-            messagebox.showinfo("Success", "Screenshot saved successfully")
+            self.screenshots.capture(file_path, delay=0.2, on_done=self.screenshot_saved,
+                                     on_error=lambda e: messagebox.showerror("Error", f"Screenshot failed: {e}"))
+
+    def screenshot_saved(self, result):
+        messagebox.showinfo("Success", "Screenshot saved successfully")
+
+    def toggle_timelapse(self):
+        if self.timelapse is not None and self.timelapse.running:
+            self.timelapse.stop(wait=False)
+            self.scheduler.remove("timelapse")
+            # The recorder closes its file after the frame in progress, no new recording may open one until then
+            self.timelapse_button.config(text="Stopping...", state="disabled")
+            self.wait_for_timelapse()
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".timelapse",
+                                                 filetypes=[("Timelapse files", "*.timelapse")])
+        if file_path:
+            # The dialog has already asked before replacing an existing file
+            self.timelapse = TimelapseRecorder(file_path, source=self.screenshots.source, interval=5.0, append=False)
+            self.timelapse.start()
+            self.timelapse_button.config(text="Stop Timelapse")
+            self.scheduler.add("timelapse", self.update_timelapse_status, 5.0, page=self.screen_page)
+
+    def wait_for_timelapse(self):
+        if self.timelapse.running:
+            self.root.after(100, self.wait_for_timelapse)
+            return
+        self.timelapse_button.config(text="Start Timelapse", state="normal")
+        self.update_timelapse_status()
+
+    def update_timelapse_status(self):
+        stats = self.timelapse.stats()
+        text = (f"{stats['frames']} frames, {stats['mb_written']:.1f} MB, "
+                f"{stats['tiles_per_frame']:.0f} tiles/frame, {stats['store_ms']:.0f} ms/frame")
+        if stats["errors"]:
+            text += f"\n{stats['errors']} frames failed, last: {stats['last_error']}"
+        self.timelapse_label.config(text=text)
 
     def search_web(self):
         query = self.search_entry.get()
@@ -214,4 +358,4 @@ class ScreenController:
 if __name__ == "__main__":
     root = tk.Tk()
     app = ScreenController(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
\ No newline at end of file
@@ -1,39 +1,56 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import platform
-import psutil
-import screen_brightness_control as sbc
-import ctypes
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from datetime import datetime
-import requests
-import pytz
-import pyautogui
-import subprocess
 import webbrowser as wb
 import random
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
-from PIL import Image, ImageTk
-import json
+from capture import FILETYPES, ScreenshotService
+from control_daemon import DEFAULT_ADDRESS, ControlBridge
+from controller import Controller
+from diagnostics_view import DiagnosticsPanel
+from instrumentation import LagProbe
+from lazy_imports import prewarm
+from lazy_tabs import LazyNotebook
+from metrics import MetricsSampler
+from news_feed import NewsPoller, newsapi_fetch
+from news_view import VirtualNewsList, article_key
+from process_view import ProcessPanel
+from processes import ProcessSampler
+from runner import CommandRunner
+from scheduler import TickScheduler
+from snapshot import DEFAULT_SNAPSHOT_PATH, Snapshot
+from sparkline import Sparkline
+from theme_engine import ThemeEngine
+
+
+# What the warm-start snapshot keeps of the metrics: the charted series' last hour and the card values
+SNAPSHOT_SERIES = ("cpu", "memory", "net_recv", "net_sent")
+SNAPSHOT_SAMPLES = 3600
+SNAPSHOT_CARDS = ("cpu", "memory", "battery")
 
 
 class AdvancedScreenController:
-    def __init__(self, root):
+    def __init__(self, root, controller_factory=None, control_address=DEFAULT_ADDRESS, ps=None, news_fetch=None,
+                 snapshot_path=DEFAULT_SNAPSHOT_PATH):
+        # The backends default to the real ones, the benchmarks pass fakes
         self.root = root
         self.root.title("Nexus Control Panel")
         self.root.geometry("1400x900")
         self.root.minsize(1200, 800)
 
+        # Last session's state, painted first and reconciled once the backends answer
+        self.snapshot_path = snapshot_path
+        self.snapshot = Snapshot.load(snapshot_path) if snapshot_path else None
+        restored = self.snapshot or Snapshot()
+
         # Theme Management
-        self.theme_mode = tk.StringVar(value="light")
         self.themes = {
             "light": {"bg": "#ffffff", "fg": "#2c3e50", "accent": "#3498db"},
             "dark": {"bg": "#2c3e50", "fg": "#ecf0f1", "accent": "#3498db"},
             "system": {"bg": "SystemButtonFace", "fg": "SystemWindowText", "accent": "SystemHighlight"}
         }
+        theme = restored.values.get("theme")
+        self.theme_mode = tk.StringVar(value=theme if theme in self.themes else "light")
+        self.chart_windows = {"5 min": 300, "1 hour": 3600, "24 hours": 24 * 3600}
 
         # Style Configuration
         self.style = ttk.Style()
@@ -41,28 +58,44 @@ class AdvancedScreenController:
         self.create_theme_switcher()
 
         # Application Setup
-        self.setup_audio()
+        self.setup_control(controller_factory, control_address)
+        self.runner = CommandRunner(self.root)
+        # Screenshots of this screen are taken here, not through the daemon
+        self.screenshots = ScreenshotService(self.root)
         self.create_widgets()
-        self.update_clock()
-        self.update_system_info()
-        self.setup_news()
+        self.setup_scheduler()
+        self.setup_metrics(ps)
+        self.setup_processes(ps)
+        self.setup_news(news_fetch)
+        self.setup_snapshots()
+        prewarm(self.root)
 
     def configure_styles(self):
-        theme = self.themes[self.theme_mode.get()]
-        self.style.theme_use('clam')
-
-        self.style.configure('.', font=('Segoe UI', 12), background=theme['bg'])
-        self.style.configure('TNotebook', background=theme['bg'])
-        self.style.configure('TNotebook.Tab', font=('Segoe UI', 12, 'bold'), padding=[20, 5])
-        self.style.configure('TFrame', background=theme['bg'])
-        self.style.configure('TLabel', background=theme['bg'], foreground=theme['fg'])
-        self.style.configure('TButton', background=theme['accent'], foreground='white',
-                             borderwidth=0, font=('Segoe UI', 12, 'bold'))
-        self.style.map('TButton', background=[('active', theme['accent'])])
+        # Every theme is compiled to style options once, switching applies only the differences
+        self.theme_engine = ThemeEngine(self.style, self.themes, self.stylesheet)
+        self.theme_engine.apply(self.theme_mode.get())
+
+    def stylesheet(self, theme):
+        return {
+            "configure": {
+                '.': {'font': ('Segoe UI', 12), 'background': theme['bg']},
+                'TNotebook': {'background': theme['bg']},
+                'TNotebook.Tab': {'font': ('Segoe UI', 12, 'bold'), 'padding': [20, 5]},
+                'TFrame': {'background': theme['bg']},
+                'TLabel': {'background': theme['bg'], 'foreground': theme['fg']},
+                'TButton': {'background': theme['accent'], 'foreground': 'white',
+                            'borderwidth': 0, 'font': ('Segoe UI', 12, 'bold')},
+            },
+            "map": {
+                'TButton': {'background': [('active', theme['accent'])]},
+            },
+        }
 
     def create_theme_switcher(self):
         self.theme_btn = tk.Canvas(self.root, width=40, height=40, bd=0, highlightthickness=0)
         self.theme_btn.place(relx=0.98, rely=0.02, anchor='ne')
+        self.theme_engine.register(self.theme_btn, bg="bg")
+        self.theme_engine.on_change(lambda theme: self.draw_theme_icon(), keys=("bg", "fg"))
         self.draw_theme_icon()
         self.theme_btn.bind('<Button-1>', self.show_theme_menu)
 
@@ -83,44 +116,107 @@ class AdvancedScreenController:
 
     def change_theme(self, mode):
         self.theme_mode.set(mode)
-        self.configure_styles()
-        self.draw_theme_icon()
-        self.update_all_widgets()
-
-    def update_all_widgets(self):
-        for widget in self.root.winfo_children():
-            if isinstance(widget, ttk.Notebook):
-                for tab in widget.tabs():
-                    widget.nametowidget(tab).configure(style='TFrame')
-
-    def setup_audio(self):
-        devices = AudioUtilities.GetSpeakers()
-        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+        self.theme_engine.apply(mode)
+        self.control.send("theme.set", value=mode)
+
+    def setup_control(self, controller_factory=None, address=DEFAULT_ADDRESS):
+        # The panel is one client of the control daemon, started here unless one is already running.
+        # Connecting (audio and monitor setup) happens in the background, commands sent meanwhile wait for it
+        self.control = ControlBridge(self.root)
+        self.control.on_event(self.on_control_event)
+        self.control.connect(controller_factory or (lambda: Controller(themes=list(self.themes))), address,
+                             on_connected=self.on_control_connected)
+        # Monitors and their cached levels, read once for the dashboard card and the media sliders
+        restored = self.snapshot or Snapshot()
+        self.displays = [{"id": int(display["id"]), "name": display["name"],
+                          "level": int(float(display["level"])) if display["level"] is not None else None}
+                         for display in restored.records.get("displays", [])]
+        self.display_levels = {}
+        self.volume_level = restored.values.get("volume")
+        self.control.send("displays.list", callback=self.on_displays)
+
+    def on_control_connected(self, daemon):
+        if daemon is not None:
+            # A daemon started just now takes the restored theme, a running one keeps its own
+            self.control.send("theme.set", value=self.theme_mode.get())
+        else:
+            self.control.send("theme.get", callback=lambda theme: self.on_control_event("theme", theme))
+
+    def on_control_event(self, event, value):
+        # Changes made by other clients of the daemon
+        if event == "theme" and value != self.theme_mode.get():
+            self.theme_mode.set(value)
+            self.theme_engine.apply(value)
+        elif event == "volume":
+            self.show_volume(value)
+        elif event == "brightness":
+            self.show_brightness(value)
+        elif event == "display":
+            for display in self.displays:
+                if display["id"] == value["display"]:
+                    display["level"] = value["value"]
+                    if display["id"] in self.display_levels:
+                        self.display_levels[display["id"]].set(value["value"])
+            self.show_brightness()
+        elif event == "wifi" and hasattr(self, "wifi_status"):
+            self.wifi_status.set(value)
 
     def create_widgets(self):
         self.create_notebook()
-        self.create_dashboard_tab()
-        self.create_media_tab()
-        self.create_network_tab()
-        self.create_news_tab()
+        # Pages are built on first view, only the visible one is built now
+        self.dashboard_page = self.notebook.add_page("Dashboard", self.create_dashboard_tab)
+        self.notebook.add_page("Media Control", self.create_media_tab)
+        self.notebook.add_page("Network Settings", self.create_network_tab)
+        self.news_page = self.notebook.add_page("Live News", self.create_news_tab)
+        self.diagnostics_page = self.notebook.add_page("Diagnostics", self.create_diagnostics_tab)
+        self.notebook.build(self.notebook.select())
 
     def create_notebook(self):
-        self.notebook = ttk.Notebook(self.root)
+        self.notebook = LazyNotebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-    def create_dashboard_tab(self):
-        dash_frame = ttk.Frame(self.notebook)
-        self.notebook.add(dash_frame, text="Dashboard")
-
+    def create_dashboard_tab(self, dash_frame):
         # System Info Cards
         info_frame = ttk.Frame(dash_frame)
         info_frame.pack(pady=20, fill=tk.X)
 
-        self.create_info_card(info_frame, "CPU Usage", psutil.cpu_percent(), "%")
-        self.create_info_card(info_frame, "Memory", psutil.virtual_memory().percent, "%")
-        self.create_info_card(info_frame, "Battery", psutil.sensors_battery().percent, "%")
-        self.create_info_card(info_frame, "Brightness", sbc.get_brightness()[0], "%")
+        # Filled in by the metrics sampler once its first sample is in
+        self.info_labels = {
+            "cpu": self.create_info_card(info_frame, "CPU Usage", "--", ""),
+            "memory": self.create_info_card(info_frame, "Memory", "--", ""),
+            "battery": self.create_info_card(info_frame, "Battery", "--", ""),
+        }
+        self.brightness_card = self.create_info_card(info_frame, "Brightness", "--", "")
+        self.show_brightness()
+
+        # History Charts
+        chart_frame = ttk.Frame(dash_frame)
+        chart_frame.pack(pady=10, fill=tk.X)
+
+        self.chart_window = tk.StringVar(value="5 min")
+        ttk.Combobox(chart_frame, textvariable=self.chart_window, state="readonly", width=10,
+                     values=list(self.chart_windows)).pack(anchor='e', padx=10)
+        self.chart_window.trace_add("write", lambda *args: self.draw_charts())
+
+        theme = self.themes[self.theme_mode.get()]
+        self.charts = {
+            "cpu": Sparkline(chart_frame, [("cpu", theme['accent'])], title="CPU", max_value=100, bg=theme['bg']),
+            "memory": Sparkline(chart_frame, [("memory", "#27ae60")], title="Memory", max_value=100,
+                                bg=theme['bg']),
+            "network": Sparkline(chart_frame, [("net_recv", theme['accent']), ("net_sent", "#e67e22")],
+                                 title="Network in/out", unit="B/s", bg=theme['bg']),
+        }
+        for chart in self.charts.values():
+            chart.set_colors(theme['bg'], theme['fg'])
+            self.theme_engine.on_change(lambda theme, chart=chart: chart.set_colors(theme['bg'], theme['fg']),
+                                        keys=("bg", "fg"))
+            chart.canvas.pack(side=tk.LEFT, padx=10, expand=True)
+
+        # Top Processes
+        process_frame = ttk.Frame(dash_frame)
+        process_frame.pack(pady=10, fill=tk.X, padx=10)
+        ttk.Label(process_frame, text="Top Processes", font=('Segoe UI', 14, 'bold')).pack(anchor='w')
+        self.process_panel = ProcessPanel(process_frame, on_sort=lambda key: self.processes.set_key(key), height=8)
 
         # Quick Actions
         action_frame = ttk.Frame(dash_frame)
@@ -131,18 +227,17 @@ class AdvancedScreenController:
         ttk.Button(action_frame, text="Emergency Restart", command=self.emergency_restart).grid(row=0, column=2,
                                                                                                 padx=10)
 
-    def create_media_tab(self):
-        media_frame = ttk.Frame(self.notebook)
-        self.notebook.add(media_frame, text="Media Control")
-
+    def create_media_tab(self, media_frame):
         # Volume Control
         vol_frame = ttk.Frame(media_frame)
         vol_frame.pack(pady=20, fill=tk.X)
 
         ttk.Label(vol_frame, text="Master Volume", font=('Segoe UI', 14, 'bold')).pack()
-        self.vol_slider = ttk.Scale(vol_frame, from_=0, to=1,
-                                    command=lambda v: self.volume.SetMasterVolumeLevelScalar(float(v), None))
-        self.vol_slider.set(self.volume.GetMasterVolumeLevelScalar())
+        # Restored and live levels go through the variable, which paints without running the command
+        self.vol_level = tk.DoubleVar(value=self.volume_level or 0.0)
+        self.vol_slider = ttk.Scale(vol_frame, from_=0, to=1, variable=self.vol_level,
+                                    command=lambda v: self.set_volume(float(v)))
+        self.control.send("volume.get", callback=self.show_volume)
         self.vol_slider.pack(pady=10, fill=tk.X, padx=50)
 
         # Brightness Control
@@ -150,15 +245,32 @@ class AdvancedScreenController:
         bright_frame.pack(pady=20, fill=tk.X)
 
         ttk.Label(bright_frame, text="Display Brightness", font=('Segoe UI', 14, 'bold')).pack()
-        self.bright_slider = ttk.Scale(bright_frame, from_=0, to=100,
-                                       command=lambda v: sbc.set_brightness(int(float(v))))
-        self.bright_slider.set(sbc.get_brightness()[0])
+        # Sets every display; starts at the first display's cached level
+        self.brightness_level = tk.IntVar(value=self.first_level())
+        self.bright_slider = ttk.Scale(bright_frame, from_=0, to=100, variable=self.brightness_level,
+                                       command=lambda v: self.set_brightness(int(float(v))))
         self.bright_slider.pack(pady=10, fill=tk.X, padx=50)
 
-    def create_network_tab(self):
-        net_frame = ttk.Frame(self.notebook)
-        self.notebook.add(net_frame, text="Network Settings")
-
+        # One slider per monitor
+        self.display_frame = ttk.Frame(bright_frame)
+        self.display_frame.pack(fill=tk.X)
+        self.create_display_sliders()
+
+    def create_display_sliders(self):
+        for row in self.display_frame.winfo_children():
+            row.destroy()
+        self.display_levels = {}
+        for display in self.displays:
+            row = ttk.Frame(self.display_frame)
+            row.pack(fill=tk.X, padx=50, pady=5)
+            ttk.Label(row, text=display["name"], width=24).pack(side=tk.LEFT)
+            level = tk.IntVar(value=display["level"] or 0)
+            ttk.Scale(row, from_=0, to=100, variable=level,
+                      command=lambda v, display=display: self.set_display_brightness(display, int(float(v)))
+                      ).pack(side=tk.LEFT, fill=tk.X, expand=True)
+            self.display_levels[display["id"]] = level
+
+    def create_network_tab(self, net_frame):
         # WiFi Controls
         wifi_frame = ttk.Frame(net_frame)
         wifi_frame.pack(pady=20, fill=tk.X)
@@ -177,81 +289,206 @@ class AdvancedScreenController:
         ttk.Checkbutton(bt_frame, text="Enable Bluetooth", variable=self.bt_status,
                         command=self.toggle_bluetooth).pack(pady=10, anchor='w')
 
-    def create_news_tab(self):
-        news_frame = ttk.Frame(self.notebook)
-        self.notebook.add(news_frame, text="Live News")
-
-        self.news_canvas = tk.Canvas(news_frame, bg=self.themes[self.theme_mode.get()]['bg'])
-        scrollbar = ttk.Scrollbar(news_frame, orient="vertical", command=self.news_canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.news_canvas)
+    def create_news_tab(self, news_frame):
+        self.news_canvas = tk.Canvas(news_frame)
+        self.theme_engine.register(self.news_canvas, bg="bg")
+        scrollbar = ttk.Scrollbar(news_frame, orient="vertical")
 
-        self.scrollable_frame.bind("<Configure>", lambda e: self.news_canvas.configure(
-            scrollregion=self.news_canvas.bbox("all")))
-
-        self.news_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.news_canvas.configure(yscrollcommand=scrollbar.set)
+        # Only the cards in view exist, they are recycled as the feed scrolls
+        self.news_list = VirtualNewsList(self.news_canvas, scrollbar, on_open=wb.open)
+        self.news_list.set_articles(self.news_articles)
 
         self.news_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def setup_news(self):
-        try:
-            api_key = "YOUR_NEWSAPI_KEY"
-            url = f"https://newsapi.org/v2/top-headlines?country=us&apiKey={api_key}"
-            response = requests.get(url)
-            news_data = response.json()
-
-            for idx, article in enumerate(news_data.get('articles', [])):
-                self.create_news_card(article, idx)
-
-        except Exception as e:
-            print(f"Error fetching news: {e}")
-
-    def create_news_card(self, article, idx):
-        card = ttk.Frame(self.scrollable_frame, style='Card.TFrame')
-        card.grid(row=idx, column=0, sticky='ew', padx=10, pady=5)
-
-        ttk.Label(card, text=article['title'], font=('Segoe UI', 12, 'bold'), wraplength=800).pack(anchor='w')
-        ttk.Label(card, text=article['description'], wraplength=800).pack(anchor='w')
-        ttk.Button(card, text="Read More", command=lambda: wb.open(article['url'])).pack(anchor='e')
+    def create_diagnostics_tab(self, diagnostics_frame):
+        # Backend call latencies and event-loop stalls, from the instrumentation layer
+        self.diagnostics = DiagnosticsPanel(diagnostics_frame)
+        self.diagnostics.refresh()
+
+    def setup_news(self, fetch=None):
+        # Fetched in the background, each refresh only adds and removes the changed cards
+        self.news_articles = self.snapshot.records.get("articles", []) if self.snapshot else []
+        self.news_list = None
+        api_key = "YOUR_NEWSAPI_KEY"
+        self.news_poller = NewsPoller(self.root, fetch or newsapi_fetch(api_key), self.apply_news_diff,
+                                      interval=300, max_articles=200,
+                                      on_error=lambda e: print(f"Error fetching news: {e}"),
+                                      scheduler=self.scheduler, page=self.news_page)
+        self.news_poller.seed(self.news_articles)
+        self.news_poller.start()
+
+    def apply_news_diff(self, inserted, removed):
+        # Kept up to date even before the Live News page has been built
+        removed_keys = set(removed)
+        self.news_articles = list(inserted) + [a for a in self.news_articles
+                                               if article_key(a) not in removed_keys]
+        if self.news_list is None:
+            return 0
+        touched = self.news_list.rows_bound + self.news_list.rows_released
+        self.news_list.apply_diff(inserted, removed)
+        return self.news_list.rows_bound + self.news_list.rows_released - touched
 
     def create_info_card(self, parent, title, value, unit):
         card = ttk.Frame(parent, style='Card.TFrame')
         card.pack(side=tk.LEFT, padx=10, ipadx=20, ipady=10)
 
         ttk.Label(card, text=title, font=('Segoe UI', 12, 'bold')).pack()
-        ttk.Label(card, text=f"{value}{unit}", font=('Segoe UI', 24, 'bold')).pack()
-
-    def update_clock(self):
-        current_time = datetime.now().strftime('%H:%M:%S')
-        self.root.after(1000, self.update_clock)
-
-    def update_system_info(self):
-        self.root.after(2000, self.update_system_info)
+        value_label = ttk.Label(card, text=f"{value}{unit}", font=('Segoe UI', 24, 'bold'))
+        value_label.pack()
+        return value_label
+
+    def setup_scheduler(self):
+        # Every periodic task shares one timer and stops while its page or the window is hidden
+        self.scheduler = TickScheduler(self.root, self.notebook)
+        self.scheduler.add("control-events", self.control.drain_events, 1.0)
+        self.scheduler.add("diagnostics", lambda: self.diagnostics.refresh(), 2.0, page=self.diagnostics_page)
+
+        # Measures root.after drift while the window is shown
+        self.lag_probe = LagProbe(self.root, scheduler=self.scheduler)
+        self.lag_probe.start()
+
+    def setup_metrics(self, ps=None):
+        # One sample a second, a day of history for the dashboard charts
+        self.metrics = MetricsSampler(self.root, interval=1.0, history=24 * 3600, ps=ps,
+                                      scheduler=self.scheduler, page=self.dashboard_page)
+        if self.snapshot is not None:
+            latest = {name: self.snapshot.values["metric." + name] for name in SNAPSHOT_CARDS
+                      if "metric." + name in self.snapshot.values}
+            self.metrics.restore(self.snapshot.series, latest=latest, gap=self.snapshot.age() or 0.0)
+        self.metrics.subscribe(self.update_system_info)
+        self.metrics.start()
+
+    def setup_processes(self, ps=None):
+        # Sampled only while the dashboard is shown
+        self.processes = ProcessSampler(self.root, lambda rows: self.process_panel.show(rows), count=20,
+                                        interval=2.0, ps=ps, scheduler=self.scheduler, page=self.dashboard_page)
+        self.processes.start()
+
+    def update_system_info(self, changed):
+        for name, label in self.info_labels.items():
+            if name in changed:
+                value = changed[name]
+                label.config(text=f"{value}%" if value is not None else "N/A")
+        self.draw_charts()
+
+    def draw_charts(self):
+        samples = int(self.chart_windows[self.chart_window.get()] / self.metrics.interval)
+        for chart in self.charts.values():
+            chart.draw({name: self.metrics.history_of(name, samples) for name in chart.lines})
+
+    def setup_snapshots(self):
+        # Saved every minute, even while hidden, and on close
+        if self.snapshot_path:
+            self.scheduler.add("snapshot", self.save_snapshot, 60.0, run_hidden=True)
+            self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def save_snapshot(self):
+        values = {"theme": self.theme_mode.get(), "volume": self.volume_level}
+        latest = self.metrics.latest()
+        for name in SNAPSHOT_CARDS:
+            values["metric." + name] = latest.get(name)
+        snapshot = Snapshot(
+            values=values,
+            series={name: self.metrics.history_of(name, SNAPSHOT_SAMPLES) for name in SNAPSHOT_SERIES},
+            records={"displays": self.displays, "articles": self.news_articles},
+        )
+        return snapshot.save(self.snapshot_path)
+
+    def on_close(self):
+        # The window closes even if the snapshot cannot be taken
+        try:
+            self.save_snapshot()
+        except Exception as e:
+            print(f"Could not save snapshot: {e}")
+        finally:
+            # Other panels using this one's daemon start their own
+            self.control.close()
+            self.root.destroy()
+
+    def on_displays(self, displays):
+        # Live levels replace the restored ones; a display that could not be read keeps its restored level
+        restored = {display["id"]: display["level"] for display in self.displays}
+        for display in displays:
+            if display["level"] is None:
+                display["level"] = restored.get(display["id"])
+        same = ([(display["id"], display["name"]) for display in displays] ==
+                [(display["id"], display["name"]) for display in self.displays])
+        self.displays = displays
+        if hasattr(self, "display_frame"):
+            self.brightness_level.set(self.first_level())
+            if same and self.display_levels:
+                for display in displays:
+                    self.display_levels[display["id"]].set(display["level"] or 0)
+            else:
+                self.create_display_sliders()
+        self.show_brightness()
+
+    def first_level(self):
+        return (self.displays[0]["level"] or 0) if self.displays else 0
+
+    def set_brightness(self, value):
+        self.control.send("brightness.set", value=value)
+        self.show_brightness(value)
+
+    def set_display_brightness(self, display, value):
+        self.control.send("display.set", display=display["id"], value=value)
+        display["level"] = value
+        self.show_brightness()
+
+    def show_brightness(self, value=None):
+        # value is a change to every display; without one the card is just redrawn
+        if value is not None:
+            for display in self.displays:
+                display["level"] = value
+            for level in self.display_levels.values():
+                level.set(value)
+            if hasattr(self, "brightness_level"):
+                self.brightness_level.set(value)
+        if hasattr(self, "brightness_card"):
+            levels = [f"{display['level']}%" for display in self.displays if display["level"] is not None]
+            self.brightness_card.config(text=" / ".join(levels) or "--")
+
+    def set_volume(self, value):
+        self.control.send("volume.set", value=value)
+        self.volume_level = value
+
+    def show_volume(self, value):
+        self.volume_level = value
+        if hasattr(self, "vol_level"):
+            self.vol_level.set(value)
 
     def toggle_wifi(self):
-        state = "enable" if self.wifi_status.get() else "disable"
-        subprocess.run(f"netsh interface set interface 'Wi-Fi' {state}", shell=True)
+        self.control.send("wifi.set", enabled=self.wifi_status.get(),
+                          on_error=lambda e: messagebox.showerror("Error", f"Wi-Fi toggle failed: {e}"))
 
     def toggle_bluetooth(self):
         # Platform-specific implementation required
         messagebox.showinfo("Info", "Bluetooth control requires platform-specific implementation")
 
     def take_screenshot(self):
-        file_path = filedialog.asksaveasfilename(defaultextension=".png")
+        file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=FILETYPES)
         if file_path:
-            pyautogui.screenshot().save(file_path)
-            messagebox.showinfo("Success", "Screenshot saved successfully")
+            self.screenshots.capture(file_path, delay=0.2, on_done=self.screenshot_saved,
+                                     on_error=lambda e: messagebox.showerror("Error", f"Screenshot failed: {e}"))
+
+    def screenshot_saved(self, result):
+        messagebox.showinfo("Success", "Screenshot saved successfully")
 
     def lock_system(self):
-        ctypes.windll.user32.LockWorkStation()
+        self.control.send("lock")
 
     def emergency_restart(self):
         if messagebox.askyesno("Confirm", "Are you sure you want to emergency restart?"):
-            subprocess.call(["shutdown", "/r", "/t", "0"])
+            self.runner.run(["shutdown", "/r", "/t", "0"], timeout=15, on_exit=self.restart_exited)
+
+    def restart_exited(self, result):
+        if result["error"] or result["timed_out"] or result["returncode"]:
+            output = "\n".join(line for _, line in result["output"][-5:])
+            messagebox.showerror("Error", f"Restart failed: {result['error'] or output or result['returncode']}")
 
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = AdvancedScreenController(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
\ No newline at end of file
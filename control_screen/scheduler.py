@@ -0,0 +1,150 @@
+import math
+import time
+from collections import deque
+
+from instrumentation import record
+
+
+class _Task:
+    def __init__(self, name, callback, period, page, run_hidden):
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.page = str(page) if page is not None else None
+        self.run_hidden = run_hidden
+        self.next_due = 0.0
+
+        self.runs = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+
+class TickScheduler:
+    """Runs every periodic UI task from a single root.after chain.
+
+    Task periods are aligned to a shared epoch so tasks with related periods
+    fire on the same wakeup. A task is suspended while the window is
+    iconified or unmapped (unless run_hidden) and, when it belongs to a
+    notebook page, while that page is not selected. With nothing active the
+    chain stops completely until the window or tab changes.
+    """
+
+    def __init__(self, root, notebook=None):
+        self.root = root
+        self.notebook = notebook
+        self.tasks = {}
+        self.epoch = time.monotonic()
+        self.lag = deque(maxlen=300)
+        # How late the current wakeup is, 0 when woken early by a visibility or tab change
+        self.late = 0.0
+        self.wakeups = 0
+
+        self._listeners = []
+        self._mapped = True
+        self._visible = True
+        self._after_id = None
+        self._expected = None
+
+        root.bind("<Map>", self._on_map, add="+")
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        if notebook is not None:
+            notebook.bind("<<NotebookTabChanged>>", lambda e: self.wake(), add="+")
+
+    def add(self, name, callback, period, page=None, run_hidden=False):
+        # period in seconds, page is the notebook page the task draws on
+        self.tasks[name] = _Task(name, callback, period, page, run_hidden)
+        self.wake()
+
+    def remove(self, name):
+        self.tasks.pop(name, None)
+
+    def add_visibility_listener(self, callback):
+        # callback(visible) when the window is iconified/unmapped or shown again
+        self._listeners.append(callback)
+
+    @property
+    def visible(self):
+        return self._visible
+
+    def wake(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._expected = None
+        self._tick()
+
+    def stats(self):
+        lags = list(self.lag)
+        return {
+            "wakeups": self.wakeups,
+            "lag_avg_ms": sum(lags) / len(lags) * 1000 if lags else 0.0,
+            "lag_max_ms": max(lags) * 1000 if lags else 0.0,
+            "tasks": {task.name: {
+                "runs": task.runs,
+                "avg_ms": task.total / task.runs * 1000 if task.runs else 0.0,
+                "max_ms": task.max * 1000,
+                "last_ms": task.last * 1000,
+                "active": self._active(task),
+            } for task in self.tasks.values()},
+        }
+
+    def _active(self, task):
+        if not self._visible and not task.run_hidden:
+            return False
+        if task.page is not None and self.notebook is not None:
+            return self.notebook.select() == task.page
+        return True
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        self.late = 0.0
+        if self._expected is not None:
+            self.late = max(now - self._expected, 0.0)
+            self.lag.append(self.late)
+            self.wakeups += 1
+
+        for task in list(self.tasks.values()):
+            if not self._active(task) or now + 0.002 < task.next_due:
+                continue
+            started = time.perf_counter()
+            try:
+                task.callback()
+            except Exception as e:
+                print(f"Scheduled task {task.name} failed: {e}")
+            elapsed = time.perf_counter() - started
+            record("task." + task.name, elapsed)
+            task.runs += 1
+            task.total += elapsed
+            task.last = elapsed
+            task.max = max(task.max, elapsed)
+            # Next multiple of the period from the shared epoch
+            task.next_due = self.epoch + (math.floor((now - self.epoch) / task.period) + 1) * task.period
+
+        active = [task for task in self.tasks.values() if self._active(task)]
+        if not active:
+            self._expected = None
+            return
+        due = min(task.next_due for task in active)
+        self._expected = due
+        delay = max(due - time.monotonic(), 0.0)
+        self._after_id = self.root.after(int(math.ceil(delay * 1000)), self._tick)
+
+    def _set_visible(self):
+        visible = self._mapped and self.root.state() not in ("iconic", "withdrawn")
+        if visible != self._visible:
+            self._visible = visible
+            for callback in self._listeners:
+                callback(visible)
+            self.wake()
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self._mapped = True
+            self._set_visible()
+
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self._mapped = False
+            self._set_visible()
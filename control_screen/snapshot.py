@@ -0,0 +1,152 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".control_screen", "snapshot.bin")
+
+# File header, then one section per value: section header, name, payload
+MAGIC = b"CSSN"
+VERSION = 1
+HEADER = struct.Struct("<4sHdI")
+SECTION = struct.Struct("<BHI")
+LENGTH = struct.Struct("<I")
+NONE = 0xFFFFFFFF
+
+# Section kinds: a double, UTF-8 text, float32 samples, or records of text fields
+NUMBER, TEXT, SERIES, RECORDS = 1, 2, 3, 4
+
+
+def _text(value):
+    if value is None:
+        return LENGTH.pack(NONE)
+    data = str(value).encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+
+def _encode_records(records):
+    # Field names once, then each record's fields in that order
+    fields = sorted({field for record in records for field in record})
+    parts = [LENGTH.pack(len(fields))] + [_text(field) for field in fields] + [LENGTH.pack(len(records))]
+    for record in records:
+        parts.extend(_text(record.get(field)) for field in fields)
+    return b"".join(parts)
+
+
+def _decode_records(data):
+    offset = 0
+
+    def length():
+        nonlocal offset
+        (value,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        return value
+
+    def text():
+        nonlocal offset
+        size = length()
+        if size == NONE:
+            return None
+        offset += size
+        return str(data[offset - size:offset], "utf-8")
+
+    fields = [text() for _ in range(length())]
+    return [{field: text() for field in fields} for _ in range(length())]
+
+
+class Snapshot:
+    """The panel's last known state, for painting the next launch before any backend answers.
+
+    values maps names to numbers or text, series to sample histories stored
+    as float32, and records to lists of dicts of text fields (articles,
+    displays). The file is written whole and swapped in, and read back
+    through mmap.
+    """
+
+    def __init__(self, values=None, series=None, records=None, saved_at=None):
+        self.values = values or {}
+        self.series = series or {}
+        self.records = records or {}
+        self.saved_at = saved_at
+
+    def age(self):
+        return max(time.time() - self.saved_at, 0.0) if self.saved_at else None
+
+    def encode(self):
+        sections = []
+        for name, value in self.values.items():
+            if value is None:
+                continue
+            if isinstance(value, str):
+                sections.append((TEXT, name, value.encode("utf-8")))
+            else:
+                sections.append((NUMBER, name, struct.pack("<d", value)))
+        for name, values in self.series.items():
+            sections.append((SERIES, name, array("f", values).tobytes()))
+        for name, records in self.records.items():
+            sections.append((RECORDS, name, _encode_records(records)))
+
+        parts = [HEADER.pack(MAGIC, VERSION, self.saved_at or time.time(), len(sections))]
+        for kind, name, payload in sections:
+            name = name.encode("utf-8")
+            parts.append(SECTION.pack(kind, len(name), len(payload)))
+            parts.append(name)
+            parts.append(payload)
+        return b"".join(parts)
+
+    def save(self, path=DEFAULT_SNAPSHOT_PATH):
+        """Write the snapshot, returning its size in bytes or None if it could not be written."""
+        self.saved_at = time.time()
+        data = self.encode()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not save snapshot: {e}")
+            return None
+        return len(data)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SNAPSHOT_PATH):
+        """The snapshot at path, or None if there is none or it is unreadable."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return cls.decode(data)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+            print(f"Ignoring unreadable snapshot: {e}")
+            return None
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, saved_at, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a snapshot file")
+        snapshot = cls(saved_at=saved_at)
+        offset = HEADER.size
+        for _ in range(count):
+            kind, name_length, length = SECTION.unpack_from(data, offset)
+            offset += SECTION.size
+            name = str(data[offset:offset + name_length], "utf-8")
+            offset += name_length
+            payload = data[offset:offset + length]
+            if len(payload) != length:
+                raise ValueError("snapshot is truncated")
+            offset += length
+            if kind == NUMBER:
+                snapshot.values[name] = struct.unpack("<d", payload)[0]
+            elif kind == TEXT:
+                snapshot.values[name] = str(payload, "utf-8")
+            elif kind == SERIES:
+                values = array("f")
+                values.frombytes(payload)
+                snapshot.series[name] = values
+            elif kind == RECORDS:
+                snapshot.records[name] = _decode_records(payload)
+        return snapshot
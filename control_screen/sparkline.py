@@ -0,0 +1,131 @@
+import math
+import time
+import tkinter as tk
+
+from lazy_imports import optional
+
+# Imported on the first long series rather than at startup
+np = optional("numpy")
+
+
+def _extremes_numpy(values, buckets):
+    # Keep each bucket's min and max so spikes survive before the LTTB pass
+    y = np.nan_to_num(np.asarray(values, dtype=float))
+    n = len(y)
+    size = n // buckets
+    block = y[:size * buckets].reshape(buckets, size)
+    base = np.arange(buckets) * size
+    indexes = np.concatenate((base + block.argmin(axis=1), base + block.argmax(axis=1),
+                              np.arange(size * buckets, n), [0, n - 1]))
+    indexes = np.unique(indexes)
+    return indexes.tolist(), y[indexes].tolist()
+
+
+def _lttb(xs, ys, threshold):
+    n = len(ys)
+    every = (n - 2) / (threshold - 2)
+    edges = [int(i * every) + 1 for i in range(threshold - 1)]
+    edges[-1] = n - 1
+
+    picked = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        count = next_end - end
+        avg_x = sum(xs[end:next_end]) / count
+        avg_y = sum(ys[end:next_end]) / count
+        ax, ay = xs[a], ys[a]
+        best = -1.0
+        chosen = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                chosen = j
+        a = chosen
+        picked.append(a)
+    picked.append(n - 1)
+    return [xs[i] for i in picked], [ys[i] for i in picked]
+
+
+def downsample(values, threshold):
+    """Largest-Triangle-Three-Buckets: (sample indexes, values) of at most threshold points.
+
+    With NumPy, long series are first cut to per-bucket extremes so the
+    Python LTTB pass only sees a few points per pixel.
+    """
+    n = len(values)
+    if threshold < 3 or n <= threshold:
+        return list(range(n)), [v if v == v else 0.0 for v in values]
+    if np is not None and n > 8 * threshold:
+        xs, ys = _extremes_numpy(values, 2 * threshold)
+    else:
+        xs, ys = list(range(n)), [v if v == v else 0.0 for v in values]
+    if len(ys) <= threshold:
+        return xs, ys
+    return _lttb(xs, ys, threshold)
+
+
+class Sparkline:
+    """History chart on a Canvas whose line items are moved, never recreated."""
+
+    def __init__(self, parent, series, title="", unit="%", width=300, height=80, max_value=None, bg="#ffffff"):
+        # series is a list of (name, color)
+        self.title = title
+        self.unit = unit
+        self.width = width
+        self.height = height
+        self.max_value = max_value
+        self.last_draw_ms = 0.0
+
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0)
+        self.lines = {}
+        for name, color in series:
+            self.lines[name] = self.canvas.create_line(0, height - 1, width, height - 1, fill=color, width=1.5)
+        self.label = self.canvas.create_text(4, 2, anchor='nw', text=title, font=('Segoe UI', 9, 'bold'))
+
+    def set_colors(self, bg, fg):
+        self.canvas.configure(bg=bg)
+        self.canvas.itemconfigure(self.label, fill=fg)
+
+    def draw(self, histories):
+        # histories maps series name to its samples, oldest first
+        started = time.perf_counter()
+        reduced = {}
+        top = self.max_value or 0.0
+        for name, values in histories.items():
+            indexes, points = downsample(values, self.width)
+            reduced[name] = (len(values), indexes, points)
+            if self.max_value is None and len(points):
+                top = max(top, float(max(points)))
+        top = top or 1.0
+
+        usable = self.height - 14
+        for name, (count, indexes, points) in reduced.items():
+            if count < 2:
+                continue
+            x_scale = (self.width - 1) / (count - 1)
+            y_scale = usable / top
+            coords = []
+            for index, value in zip(indexes, points):
+                coords.append(index * x_scale)
+                coords.append(self.height - 1 - min(value, top) * y_scale)
+            self.canvas.coords(self.lines[name], *coords)
+
+        latest = [values[-1] for values in histories.values() if len(values)]
+        if latest:
+            shown = " / ".join(self._format(value) for value in latest)
+            self.canvas.itemconfigure(self.label, text=f"{self.title}  {shown}")
+        self.last_draw_ms = (time.perf_counter() - started) * 1000
+
+    def _format(self, value):
+        if math.isnan(value):
+            return "--"
+        if self.unit == "B/s":
+            for unit in ("B/s", "KB/s", "MB/s"):
+                if value < 1024:
+                    return f"{value:.0f} {unit}"
+                value /= 1024
+            return f"{value:.1f} GB/s"
+        return f"{value:.1f}{self.unit}"
@@ -0,0 +1,94 @@
+import time
+from collections import defaultdict
+
+
+_UNSET = object()
+
+
+def compile_theme(sheet):
+    # {"configure": {style: {option: value}}, "map": {...}} -> {(kind, style, option): value}
+    compiled = {}
+    for kind in ("configure", "map"):
+        for style, options in sheet.get(kind, {}).items():
+            for option, value in options.items():
+                compiled[(kind, style, option)] = value
+    return compiled
+
+
+class ThemeEngine:
+    """Switches between precompiled themes, touching only what differs.
+
+    stylesheet(palette) is run once per entry of themes. Applying a theme
+    configures only the style options whose values differ from the current
+    theme, with one call per style. Classic Tk widgets and other colored
+    things are registered once and recolored only when a palette key they use
+    has changed, so no widget tree is walked.
+    """
+
+    def __init__(self, style, themes, stylesheet, base='clam'):
+        self.style = style
+        self.themes = themes
+        self.base = base
+        self.compiled = {name: compile_theme(stylesheet(palette)) for name, palette in themes.items()}
+        self.current = None
+
+        self._applied = {}
+        self._widgets = {}
+        self._callbacks = []
+
+        self.last_apply_ms = 0.0
+        self.last_style_calls = 0
+        self.last_recolored = 0
+
+    def register(self, widget, **options):
+        # register(canvas, bg="bg") keeps canvas's bg option on the palette's "bg"
+        self._widgets[str(widget)] = (widget, options)
+        widget.bind("<Destroy>", lambda e, name=str(widget): self._forget(e, name), add="+")
+        if self.current is not None:
+            palette = self.themes[self.current]
+            widget.configure(**{option: palette[key] for option, key in options.items()})
+
+    def on_change(self, callback, keys=None):
+        # callback(palette) after a switch that changed any of keys (default: any key)
+        self._callbacks.append((callback, keys))
+
+    def apply(self, name):
+        started = time.perf_counter()
+        if self.current is None:
+            self.style.theme_use(self.base)
+        previous = self.themes.get(self.current, {})
+        palette = self.themes[name]
+
+        # Group the changed options by style so each style is configured once
+        batches = defaultdict(dict)
+        for (kind, style, option), value in self.compiled[name].items():
+            if self._applied.get((kind, style, option), _UNSET) != value:
+                batches[(kind, style)][option] = value
+                self._applied[(kind, style, option)] = value
+        for (kind, style), options in batches.items():
+            if kind == "configure":
+                self.style.configure(style, **options)
+            else:
+                self.style.map(style, **options)
+
+        changed = {key for key in palette if previous.get(key) != palette[key]}
+        recolored = 0
+        for widget, options in list(self._widgets.values()):
+            updates = {option: palette[key] for option, key in options.items() if key in changed}
+            if updates:
+                widget.configure(**updates)
+                recolored += 1
+        for callback, keys in self._callbacks:
+            if changed and (keys is None or changed.intersection(keys)):
+                callback(palette)
+                recolored += 1
+
+        self.current = name
+        self.last_apply_ms = (time.perf_counter() - started) * 1000
+        self.last_style_calls = len(batches)
+        self.last_recolored = recolored
+        return len(batches)
+
+    def _forget(self, event, name):
+        if str(event.widget) == name:
+            self._widgets.pop(name, None)
@@ -0,0 +1,266 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+from capture import PyAutoGuiSource
+from lazy_imports import lazy
+
+
+np = lazy("numpy")
+
+# File header, then one record per frame: record header, changed tile indexes, zlib'd tile pixels
+MAGIC = b"CSTL"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIH")
+RECORD_MAGIC = b"TLFR"
+RECORD = struct.Struct("<4sIdBII")
+
+
+class TimelapseWriter:
+    """Appends frames to a timelapse file, storing only tiles that changed.
+
+    Frames are padded to whole tiles. Every keyframe_every frames all tiles
+    are stored so playback can start near any point without replaying the
+    whole file. Reopening an existing file drops a torn last record and
+    continues it with a keyframe, unless append is False, which replaces it.
+    """
+
+    def __init__(self, path, width, height, tile=64, keyframe_every=720, compress_level=1, append=True):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.tile = tile
+        self.keyframe_every = keyframe_every
+        self.compress_level = compress_level
+        self.rows = -(-height // tile)
+        self.cols = -(-width // tile)
+
+        self.frames = 0
+        if append and os.path.exists(path) and os.path.getsize(path) > HEADER.size:
+            with TimelapseReader(path) as reader:
+                if (reader.width, reader.height, reader.tile) != (width, height, tile):
+                    raise ValueError(f"{path} was recorded at {reader.width}x{reader.height}/{reader.tile}")
+                self.frames = len(reader)
+                end = reader.end
+            self.file = open(path, "r+b")
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(path, "wb")
+            self.file.write(HEADER.pack(MAGIC, VERSION, width, height, tile))
+        self._previous = None
+
+    def pad(self, frame):
+        # HxWx3 uint8 padded with black to whole tiles
+        frame = np.asarray(frame, dtype=np.uint8)[:, :, :3]
+        padded = np.zeros((self.rows * self.tile, self.cols * self.tile, 3), dtype=np.uint8)
+        padded[:frame.shape[0], :frame.shape[1]] = frame[:self.height, :self.width]
+        return padded
+
+    def changed_tiles(self, frame):
+        # One vectorized compare, then reduce each tile's block of pixels to a flag
+        tile = self.tile
+        if self._previous is None:
+            return np.ones(self.rows * self.cols, dtype=bool)
+        diff = frame != self._previous
+        return diff.reshape(self.rows, tile, self.cols, tile * 3).any(axis=(1, 3)).ravel()
+
+    def append(self, frame, timestamp=None):
+        frame = self.pad(frame)
+        keyframe = self._previous is None or self.frames % self.keyframe_every == 0
+        mask = np.ones(self.rows * self.cols, dtype=bool) if keyframe else self.changed_tiles(frame)
+        indexes = np.flatnonzero(mask).astype("<u4")
+
+        tile = self.tile
+        tiles = frame.reshape(self.rows, tile, self.cols, tile, 3).swapaxes(1, 2).reshape(-1, tile, tile, 3)
+        payload = zlib.compress(tiles[indexes].tobytes(), self.compress_level) if len(indexes) else b""
+
+        self.file.write(RECORD.pack(RECORD_MAGIC, self.frames, timestamp or time.time(), keyframe,
+                                    len(indexes), len(payload)))
+        self.file.write(indexes.tobytes())
+        self.file.write(payload)
+        self.file.flush()
+        self.frames += 1
+        self._previous = frame
+        return len(indexes), RECORD.size + indexes.nbytes + len(payload)
+
+    def close(self):
+        self.file.close()
+
+
+class TimelapseReader:
+    """Memory-maps a timelapse file for playback and export."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.tile = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a timelapse file")
+        self.rows = -(-self.height // self.tile)
+        self.cols = -(-self.width // self.tile)
+
+        # (offset, timestamp, keyframe, tile count, payload size) per complete record
+        self.records = []
+        offset = HEADER.size
+        size = len(self.map)
+        while offset + RECORD.size <= size:
+            magic, index, timestamp, keyframe, count, length = RECORD.unpack_from(self.map, offset)
+            end = offset + RECORD.size + 4 * count + length
+            if magic != RECORD_MAGIC or end > size:
+                break
+            self.records.append((offset, timestamp, bool(keyframe), count, length))
+            offset = end
+        self.end = offset
+        self._cached = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def timestamps(self):
+        return [record[1] for record in self.records]
+
+    def frame(self, n):
+        # Rebuilt from the nearest keyframe, or from the last frame when playing forward
+        tile = self.tile
+        if self._cached is not None and self._cached[0] <= n:
+            start, tiles = self._cached[0] + 1, self._cached[1]
+        else:
+            start = n
+            while start > 0 and not self.records[start][2]:
+                start -= 1
+            tiles = np.zeros((self.rows * self.cols, tile, tile, 3), dtype=np.uint8)
+        for i in range(start, n + 1):
+            offset, _, _, count, length = self.records[i]
+            if not count:
+                continue
+            offset += RECORD.size
+            indexes = np.frombuffer(self.map, dtype="<u4", count=count, offset=offset)
+            pixels = zlib.decompress(self.map[offset + 4 * count:offset + 4 * count + length])
+            tiles[indexes] = np.frombuffer(pixels, dtype=np.uint8).reshape(count, tile, tile, 3)
+        self._cached = (n, tiles)
+        frame = tiles.reshape(self.rows, self.cols, tile, tile, 3).swapaxes(1, 2)
+        frame = frame.reshape(self.rows * tile, self.cols * tile, 3)
+        # The reshape copies unless the recording is one tile wide; the caller must never get a view of the cache
+        if np.may_share_memory(frame, tiles):
+            frame = frame.copy()
+        return frame[:self.height, :self.width]
+
+    def frames(self, step=1):
+        for n in range(0, len(self), step):
+            yield n, self.frame(n)
+
+    def export(self, directory, step=1, fmt="PNG"):
+        from PIL import Image
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for n, frame in self.frames(step):
+            path = os.path.join(directory, f"frame_{n:06d}.{fmt.lower()}")
+            Image.fromarray(frame).save(path, format=fmt)
+            paths.append(path)
+        return paths
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TimelapseRecorder:
+    """Captures a frame every interval seconds on a background thread.
+
+    With append False an existing file at path is replaced rather than continued.
+    """
+
+    def __init__(self, path, source=None, interval=5.0, region=None, tile=64, keyframe_every=720, append=True):
+        self.path = path
+        self.append = append
+        self.source = source or PyAutoGuiSource()
+        self.interval = interval
+        self.region = region
+        self.tile = tile
+        self.keyframe_every = keyframe_every
+
+        self._writer = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.frames = 0
+        self.tiles_written = 0
+        self.bytes_written = 0
+        self.capture_seconds = 0.0
+        self.store_seconds = 0.0
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="timelapse", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=True):
+        # wait=False returns at once, the thread closes the file after its current frame
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "tiles_per_frame": self.tiles_written / frames,
+            "mb_written": self.bytes_written / 2 ** 20,
+            "capture_ms": self.capture_seconds / frames * 1000,
+            "store_ms": self.store_seconds / frames * 1000,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    def capture_once(self):
+        started = time.perf_counter()
+        image = self.source.grab(self.region)
+        captured = time.perf_counter()
+        if self._writer is None:
+            self._writer = TimelapseWriter(self.path, image.width, image.height, self.tile, self.keyframe_every,
+                                           append=self.append)
+        tiles, size = self._writer.append(np.asarray(image.convert("RGB")))
+        self.capture_seconds += captured - started
+        self.store_seconds += time.perf_counter() - captured
+        self.frames += 1
+        self.tiles_written += tiles
+        self.bytes_written += size
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                started = time.perf_counter()
+                try:
+                    self.capture_once()
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = str(e)
+                    print(f"Error capturing timelapse frame: {e}")
+                self._wake.wait(max(self.interval - (time.perf_counter() - started), 0))
+                self._wake.clear()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
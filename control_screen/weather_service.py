@@ -0,0 +1,176 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from dispatch import dispatcher_for
+from geo_cache import GeoResolver
+from http_client import get_client
+
+
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+
+
+class Cancelled(Exception):
+    pass
+
+
+def local_time_in(timezone_str):
+    import pytz
+    return datetime.now(pytz.timezone(timezone_str)).strftime("%H:%M:%S")
+
+
+def summarize(data):
+    return {
+        "temp": data["main"]["temp"],
+        "description": data["weather"][0]["description"],
+        "humidity": data["main"]["humidity"],
+    }
+
+
+# Service
+class _Job:
+    def __init__(self, token, city, on_result, on_error):
+        self.token = token
+        self.city = city
+        self.on_result = on_result
+        self.on_error = on_error
+        self.futures = []
+        self.parts = {}
+        self.lock = threading.Lock()
+
+
+class WeatherService:
+    """Runs geocoding, timezone and weather lookups on a worker pool.
+
+    Results are posted by the workers and handed to the callbacks on the Tk
+    thread by the root's TkDispatcher. Submitting a new city supersedes the
+    previous request, whose results are discarded.
+    """
+
+    def __init__(self, root, api_key, transport=None, resolver=None, local_time=local_time_in,
+                 url=WEATHER_URL, workers=4):
+        self.root = root
+        self.api_key = api_key
+        self._transport = transport
+        self.resolver = resolver or GeoResolver()
+        self.local_time = local_time
+        self.url = url
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather")
+        self._dispatcher = dispatcher_for(root)
+        self._token = 0
+        self._job = None
+        self._batches = 0
+
+    def request(self, city, on_result, on_error=None, on_start=None):
+        self.cancel()
+        self._token += 1
+        job = _Job(self._token, city, on_result, on_error)
+        self._job = job
+
+        # Geocode/timezone and the weather fetch are independent, run them side by side
+        job.futures.append(self._pool.submit(self._run_stage, job, "location", self._locate, city))
+        job.futures.append(self._pool.submit(self._run_stage, job, "weather", self._fetch, city))
+
+        if on_start:
+            on_start(city)
+        self._dispatcher.watch(self)
+        return job.token
+
+    def refresh_watchlist(self, cities, on_result):
+        # on_result gets {city: summary or exception} once every city is back
+        self._batches += 1
+        self._pool.submit(self._run_watchlist, list(cities), on_result)
+        self._dispatcher.watch(self)
+
+    def cancel(self):
+        job = self._job
+        self._job = None
+        if job is not None:
+            for future in job.futures:
+                future.cancel()
+
+    @property
+    def transport(self):
+        # The shared client (and requests) is only loaded by the first lookup
+        if self._transport is None:
+            self._transport = get_client()
+        return self._transport
+
+    @property
+    def busy(self):
+        return self._job is not None or self._batches > 0
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # Worker side
+    def _current(self, job):
+        if self._job is not job:
+            raise Cancelled()
+
+    def _params(self, city):
+        return {"q": city, "appid": self.api_key, "units": "metric"}
+
+    def _locate(self, job, city):
+        lat, lon, timezone_str = self.resolver.resolve(city)
+        self._current(job)
+        return {"lat": lat, "lon": lon, "timezone": timezone_str, "local_time": self.local_time(timezone_str)}
+
+    def _fetch(self, job, city):
+        return self.transport.get_json(self.url, params=self._params(city))
+
+    def _run_stage(self, job, name, stage, city):
+        try:
+            self._current(job)
+            value = stage(job, city)
+        except Cancelled:
+            return
+        except Exception as e:
+            self._dispatcher.post(self._finish_job, job, None, e)
+            return
+        with job.lock:
+            job.parts[name] = value
+            done = len(job.parts) == 2
+        if done:
+            self._dispatcher.post(self._finish_job, job, job.parts, None)
+
+    def _run_watchlist(self, cities, on_result):
+        responses = self.transport.get_many([(self.url, self._params(city)) for city in cities])
+        results = {}
+        for city, data in zip(cities, responses):
+            if isinstance(data, Exception):
+                results[city] = data
+            else:
+                try:
+                    results[city] = summarize(data)
+                except (KeyError, IndexError, TypeError) as e:
+                    results[city] = e
+        self._dispatcher.post(self._finish_watchlist, on_result, results)
+
+    # Tk side
+    def _finish_job(self, job, parts, error):
+        if job is not self._job:
+            return
+        self._job = None
+        if error is None:
+            try:
+                result = self._combine(job.city, parts)
+            except (KeyError, IndexError, TypeError) as e:
+                error = ValueError(f"Unexpected weather response: {e!r}")
+        if error is not None:
+            if job.on_error:
+                job.on_error(error)
+        else:
+            job.on_result(result)
+
+    def _finish_watchlist(self, on_result, results):
+        self._batches -= 1
+        on_result(results)
+
+    def _combine(self, city, parts):
+        location = parts["location"]
+        result = summarize(parts["weather"])
+        result.update(city=city, timezone=location["timezone"], local_time=location["local_time"])
+        return result